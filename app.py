@@ -1,718 +1,1310 @@
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect
-from flask_cors import CORS
-import os
-import sys
-import json
-import threading
-import time
-import logging
-import io
-import sqlite3
-from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-
-# Add imports for ZIP file creation
-import zipfile
-from io import BytesIO
-
-# Import GoogleTranslator for text translation
-from deep_translator import GoogleTranslator
-
-# Import Hugging Face pipeline for sentiment analysis
-from transformers import pipeline
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
-# Initialize Flask app
-app = Flask(__name__, static_folder=None)
-app.secret_key = 'audiofy-secret-key-super-secure'
-CORS(app, supports_credentials=True)
-
-# Database setup
-DATABASE = os.path.join(os.path.dirname(__file__), 'audiofy.db')
-
-def get_db():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def init_db():
-    try:
-        with get_db() as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.commit()
-            logger.info("Database initialized successfully.")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-
-init_db()
-
-@app.before_request
-def protect_files():
-    path = request.path.lower()
-    # Block access to database, python source files, and configuration files
-    if any(path.endswith(ext) for ext in ['.db', '.py', '.git', '.gitignore', 'readme.md']):
-        return "Access Denied", 403
-        
-    # Redirect direct HTML file accesses to their respective authenticated routes
-    if path in ['/dashboard.html', '/about.html', '/services.html', '/contact.html', '/index.html']:
-        if path == '/index.html':
-            return redirect('/')
-        route = path.rsplit('.', 1)[0]
-        return redirect(route)
-
-# Initialize the sentiment analysis pipeline
-tone_analyzer = pipeline("sentiment-analysis")
-
-# Import the speech recognition module
-try:
-    from speech_translator import SpeechTranslator
-    translator = SpeechTranslator()
-    speech_module_available = True
-    logger.info("Speech translator module loaded successfully")
-except ImportError as e:
-    logger.error(f"Error importing speech translator: {e}")
-    speech_module_available = False
-    translator = None
-
-# Try to import document generation libraries
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    reportlab_available = True
-    logger.info("ReportLab (PDF generation) loaded successfully")
-except ImportError as e:
-    logger.error(f"Error importing ReportLab: {e}")
-    reportlab_available = False
-
-try:
-    import docx
-    from docx.shared import Pt, RGBColor, Inches
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    docx_available = True
-    logger.info("python-docx (DOCX generation) loaded successfully")
-except ImportError as e:
-    logger.error(f"Error importing python-docx: {e}")
-    docx_available = False
-
-# Store recognition results
-recognition_results = {}
-
-# Define the upload folder
-UPLOAD_FOLDER = 'uploads'
-
-@app.route('/')
-def index():
-    if session.get('user'):
-        return redirect('/dashboard')
-    return send_file(os.path.join(os.path.dirname(__file__), 'index.html'))
-
-@app.route('/dashboard')
-def dashboard():
-    if not session.get('user'):
-        return redirect('/')
-    return send_file(os.path.join(os.path.dirname(__file__), 'frontend', 'dist', 'index.html'))
-
-@app.route('/about')
-def about():
-    return send_file(os.path.join(os.path.dirname(__file__), 'about.html'))
-
-@app.route('/services')
-def services():
-    return send_file(os.path.join(os.path.dirname(__file__), 'services.html'))
-
-@app.route('/contact')
-def contact():
-    return send_file(os.path.join(os.path.dirname(__file__), 'contact.html'))
-
-@app.route('/<path:filename>')
-def serve_static(filename):
-    if filename.startswith('api/'):
-        return "Not Found", 404
-    # Prevent directory traversal
-    if '..' in filename or filename.startswith('/'):
-        return "Access Denied", 403
-        
-    # Check in frontend/dist first
-    dist_path = os.path.join(os.path.dirname(__file__), 'frontend', 'dist', filename)
-    if os.path.exists(dist_path) and os.path.isfile(dist_path):
-        return send_file(dist_path)
-        
-    # Check in root folder
-    root_path = os.path.join(os.path.dirname(__file__), filename)
-    if os.path.exists(root_path) and os.path.isfile(root_path):
-        return send_file(root_path)
-        
-    return "Not Found", 404
-
-# Authentication APIs
-@app.route('/api/signup', methods=['POST'])
-def signup():
-    try:
-        data = request.json or {}
-        username = data.get('username', '').strip()
-        email = data.get('email', '').strip()
-        password = data.get('password', '')
-
-        if not username or not email or not password:
-            return jsonify({'success': False, 'error': 'All fields (username, email, password) are required.'}), 400
-
-        if len(password) < 6:
-            return jsonify({'success': False, 'error': 'Password must be at least 6 characters long.'}), 400
-
-        db = get_db()
-        # Check existing user
-        cursor = db.cursor()
-        cursor.execute('SELECT id FROM users WHERE email = ? OR username = ?', (email, username))
-        existing_user = cursor.fetchone()
-        if existing_user:
-            return jsonify({'success': False, 'error': 'User with this email or username already exists.'}), 400
-
-        hashed_pw = generate_password_hash(password)
-        cursor.execute('INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)',
-                       (username, email, hashed_pw))
-        db.commit()
-
-        user_id = cursor.lastrowid
-        user_data = {'id': user_id, 'username': username, 'email': email}
-        session['user'] = user_data
-
-        return jsonify({'success': True, 'user': user_data, 'message': 'Account created successfully!'})
-    except Exception as e:
-        logger.error(f"Signup error: {e}")
-        return jsonify({'success': False, 'error': 'Failed to create account.'}), 500
-
-@app.route('/api/login', methods=['POST'])
-def login():
-    try:
-        data = request.json or {}
-        email = data.get('email', '').strip()
-        password = data.get('password', '')
-
-        if not email or not password:
-            return jsonify({'success': False, 'error': 'Email and password are required.'}), 400
-
-        db = get_db()
-        cursor = db.cursor()
-        cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
-        user = cursor.fetchone()
-
-        if not user or not check_password_hash(user['password_hash'], password):
-            return jsonify({'success': False, 'error': 'Invalid email or password.'}), 401
-
-        user_data = {'id': user['id'], 'username': user['username'], 'email': user['email']}
-        session['user'] = user_data
-
-        return jsonify({'success': True, 'user': user_data, 'message': 'Logged in successfully!'})
-    except Exception as e:
-        logger.error(f"Login error: {e}")
-        return jsonify({'success': False, 'error': 'Login failed.'}), 500
-
-@app.route('/api/logout', methods=['POST'])
-def logout():
-    session.pop('user', None)
-    return jsonify({'success': True, 'message': 'Logged out successfully!'})
-
-@app.route('/api/me', methods=['GET'])
-def get_me():
-    user = session.get('user')
-    if user:
-        return jsonify({'success': True, 'authenticated': True, 'user': user})
-    return jsonify({'success': True, 'authenticated': False, 'user': None})
-
-# Add a route to handle audio file uploads
-@app.route('/api/upload-audio', methods=['POST'])
-def upload_audio():
-    audio_file = request.files.get('audio')
-    language = request.form.get('language', 'en')
-
-    if not audio_file:
-        return jsonify({'success': False, 'error': 'No audio file provided'}), 400
-
-    # Validate file type
-    if not audio_file.filename.lower().endswith(('.wav', '.mp3')):
-        return jsonify({'success': False, 'error': 'Unsupported file format. Please upload a .wav or .mp3 file.'}), 400
-
-    # Save the uploaded file
-    file_path = os.path.join(UPLOAD_FOLDER, audio_file.filename)
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-    audio_file.save(file_path)
-
-    try:
-        # Transcribe the audio
-        original_text = translator.transcribe_audio_file(file_path, language=language)
-        if not original_text:
-            return jsonify({'success': False, 'error': 'Could not transcribe audio'}), 500
-
-        return jsonify({'success': True, 'transcription': original_text})
-    except Exception as e:
-        logger.error(f"Error uploading audio: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/recognize', methods=['POST'])
-def recognize_speech():
-    if not speech_module_available:
-        return jsonify({
-            'success': False,
-            'error': 'Speech recognition module not available'
-        }), 500
-
-    try:
-        # Get language from request JSON body (default to en-US)
-        data = request.json or {}
-        language = data.get('language', 'en-US')
-
-        # Recognize speech
-        text = translator.recognize_speech(language=language)
-        if text:
-            return jsonify({
-                'success': True,
-                'transcription': text
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Could not recognize speech'
-            })
-    except Exception as e:
-        logger.error(f"Error recognizing speech: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-# Update the get_results route to include tone and summary
-@app.route('/api/results/<session_id>', methods=['GET'])
-def get_results(session_id):
-    if session_id in recognition_results:
-        result = recognition_results[session_id]
-        
-        if 'error' in result:
-            return jsonify({
-                'success': False,
-                'error': result['error']
-            })
-        
-        return jsonify({
-            'success': True,
-            'original': result['original'],
-            'translated': result['translated'],
-            'src_lang': result['src_lang'],
-            'dest_lang': result['dest_lang'],
-            'src_lang_name': result.get('src_lang_name', 'Unknown'),
-            'dest_lang_name': result.get('dest_lang_name', 'Unknown'),
-            'timestamp': result.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-            'tone': result.get('tone', 'Neutral'),
-            'summary': result.get('summary', '')
-        })
-    
-    return jsonify({
-        'success': False,
-        'error': 'Results not found or recognition still in progress'
-    })
-
-@app.route('/api/speak', methods=['POST'])
-def speak_text():
-    if not speech_module_available:
-        return jsonify({
-            'success': False,
-            'error': 'Speech module not available'
-        }), 500
-
-    data = request.json
-    text = data.get('text', '')
-    language = data.get('language', 'en')
-
-    if not text:
-        return jsonify({
-            'success': False,
-            'error': 'No text provided'
-        }), 400
-
-    try:
-        # Use the SpeechTranslator module to speak the text
-        translator.speak_text(text, language=language)
-
-        return jsonify({
-            'success': True,
-            'message': 'Text spoken successfully'
-        })
-    except Exception as e:
-        logger.error(f"Error speaking text: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-@app.route('/api/languages', methods=['GET'])
-def get_languages():
-    if not speech_module_available:
-        return jsonify({
-            'success': False,
-            'error': 'Speech module not available'
-        }), 500
-    
-    return jsonify({
-        'success': True,
-        'languages': translator.languages
-    })
-
-@app.route('/api/generate-pdf', methods=['POST'])
-def generate_pdf():
-    if not reportlab_available:
-        return jsonify({
-            'success': False,
-            'error': 'PDF generation module not available'
-        }), 500
-    
-    data = request.json
-    text = data.get('text', '')
-    filename = data.get('filename', 'document')
-    
-    if not text:
-        return jsonify({
-            'success': False,
-            'error': 'No text provided'
-        }), 400
-    
-    try:
-        # Create a PDF in memory
-        buffer = io.BytesIO()
-        
-        # Create the PDF document
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Heading1'],
-            alignment=TA_CENTER,
-            spaceAfter=12
-        )
-        
-        normal_style = styles['Normal']
-        normal_style.fontSize = 10
-        normal_style.leading = 14
-        
-        # Create the content
-        content = []
-        
-        # Add title
-        content.append(Paragraph(f"Speech Recognition Results", title_style))
-        content.append(Spacer(1, 12))
-        
-        # Add timestamp
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        content.append(Paragraph(f"Generated on: {timestamp}", styles['Italic']))
-        content.append(Spacer(1, 12))
-        
-        # Add the text content
-        paragraphs = text.split('\n')
-        for para in paragraphs:
-            if para.strip():
-                content.append(Paragraph(para, normal_style))
-                content.append(Spacer(1, 6))
-        
-        # Build the PDF
-        doc.build(content)
-        
-        # Get the value from the buffer
-        pdf_value = buffer.getvalue()
-        buffer.close()
-        
-        # Create a response
-        response_buffer = io.BytesIO(pdf_value)
-        
-        return send_file(
-            response_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=f"{filename}.pdf"
-        )
-        
-    except Exception as e:
-        logger.error(f"Error generating PDF: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-@app.route('/api/generate-docx', methods=['POST'])
-def generate_docx():
-    if not docx_available:
-        return jsonify({
-            'success': False,
-            'error': 'DOCX generation module not available'
-        }), 500
-    
-    data = request.json
-    text = data.get('text', '')
-    filename = data.get('filename', 'document')
-    
-    if not text:
-        return jsonify({
-            'success': False,
-            'error': 'No text provided'
-        }), 400
-    
-    try:
-        # Create a DOCX document
-        document = docx.Document()
-        
-        # Add title
-        title = document.add_heading('Speech Recognition Results', level=1)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Add timestamp
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        timestamp_para = document.add_paragraph(f"Generated on: {timestamp}")
-        timestamp_para.style = 'Italic'
-        
-        # Add the text content
-        paragraphs = text.split('\n')
-        for para in paragraphs:
-            if para.strip():
-                document.add_paragraph(para)
-        
-        # Save the document to a BytesIO object
-        buffer = io.BytesIO()
-        document.save(buffer)
-        buffer.seek(0)
-        
-        return send_file(
-            buffer,
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            as_attachment=True,
-            download_name=f"{filename}.docx"
-        )
-        
-    except Exception as e:
-        logger.error(f"Error generating DOCX: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-# Add a route to download both PDF and DOCX as a ZIP file
-@app.route('/api/download-all', methods=['POST'])
-def download_all():
-    data = request.json
-    text = data.get('text', '')
-    filename = data.get('filename', 'document')
-    audio_file_path = data.get('audio_file_path', '')  # Path to the uploaded audio file
-
-    if not text:
-        return jsonify({
-            'success': False,
-            'error': 'No text provided'
-        }), 400
-
-    try:
-        # Create a ZIP file in memory
-        memory_file = BytesIO()
-        with zipfile.ZipFile(memory_file, 'w') as zf:
-            # Add PDF file
-            if reportlab_available:
-                pdf_buffer = BytesIO()
-                doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
-                styles = getSampleStyleSheet()
-
-                title_style = ParagraphStyle(
-                    'Title',
-                    parent=styles['Heading1'],
-                    alignment=TA_CENTER,
-                    spaceAfter=12
-                )
-
-                normal_style = styles['Normal']
-                normal_style.fontSize = 10
-                normal_style.leading = 14
-
-                content = []
-                content.append(Paragraph(f"Speech Recognition Results", title_style))
-                content.append(Spacer(1, 12))
-
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                content.append(Paragraph(f"Generated on: {timestamp}", styles['Italic']))
-                content.append(Spacer(1, 12))
-
-                paragraphs = text.split('\n')
-                for para in paragraphs:
-                    if para.strip():
-                        content.append(Paragraph(para, normal_style))
-                        content.append(Spacer(1, 6))
-
-                doc.build(content)
-                pdf_value = pdf_buffer.getvalue()
-                zf.writestr(f"{filename}.pdf", pdf_value)
-
-            # Add DOCX file
-            if docx_available:
-                docx_buffer = BytesIO()
-                document = docx.Document()
-
-                title = document.add_heading('Speech Recognition Results', level=1)
-                title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                timestamp_para = document.add_paragraph(f"Generated on: {timestamp}")
-                timestamp_para.style = 'Italic'
-
-                paragraphs = text.split('\n')
-                for para in paragraphs:
-                    if para.strip():
-                        document.add_paragraph(para)
-
-                document.save(docx_buffer)
-                docx_value = docx_buffer.getvalue()
-                zf.writestr(f"{filename}.docx", docx_value)
-
-            # Add audio file
-            if os.path.exists(audio_file_path):
-                with open(audio_file_path, 'rb') as audio_file:
-                    zf.writestr(os.path.basename(audio_file_path), audio_file.read())
-
-        # Prepare the ZIP file for download
-        memory_file.seek(0)
-
-        return send_file(
-            memory_file,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=f"{filename}_files.zip"
-        )
-
-    except Exception as e:
-        logger.error(f"Error creating ZIP file: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-# Add a new route to process audio directly
-@app.route('/api/process-audio', methods=['POST'])
-def process_audio():
-    try:
-        logger.info("Processing audio file...")
-        if not speech_module_available:
-            logger.error("Speech module not available")
-            return jsonify({'success': False, 'error': 'Speech module not available'}), 500
-
-        audio_file = request.files.get('audio')
-        if not audio_file:
-            logger.error("No audio file provided")
-            return jsonify({'success': False, 'error': 'No audio file provided'}), 400
-
-        file_path = os.path.join(UPLOAD_FOLDER, audio_file.filename)
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        audio_file.save(file_path)
-        logger.info(f"Audio file saved to {file_path}")
-
-        speech_lang = request.form.get('language', 'en-US')
-        original_text = translator.transcribe_audio_file(file_path, language=speech_lang)
-        if not original_text:
-            logger.error("Could not transcribe audio")
-            return jsonify({'success': False, 'error': 'Could not transcribe audio'}), 500
-
-        logger.info("Audio transcription successful")
-        return jsonify({'success': True, 'transcription': original_text})
-    except Exception as e:
-        logger.error(f"Error processing audio: {e}")
-        # Add a proper return statement for the exception case
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-# Add a route for summarization
-@app.route('/api/summarize', methods=['POST'])
-def summarize_text():
-    data = request.json
-    text = data.get('text', '')
-
-    if not text.strip():
-        return jsonify({'success': False, 'error': 'No text provided'}), 400
-
-    try:
-        if speech_module_available and hasattr(translator, 'generate_summary'):
-            summary = translator.generate_summary(text)
-            return jsonify({'success': True, 'summary': summary})
-        else:
-            # Fallback summarization logic
-            sentences = text.split('.')
-            if len(sentences) <= 3:
-                summary = text
-            else:
-                # Summarization logic
-                summary = '. '.join(sentences[:3]) + '.'
-            return jsonify({'success': True, 'summary': summary})
-    except Exception as e:
-        logger.error(f"Error generating summary: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/translate', methods=['POST'])
-def translate():
-    data = request.json
-    text = data.get('text', '')
-    src_lang = data.get('src_lang', 'auto')
-    dest_lang = data.get('dest_lang', 'en')
-
-    if not text:
-        return jsonify({'success': False, 'error': 'No text provided'}), 400
-
-    try:
-        translated_text = translator.translate_text(text, src=src_lang, dest=dest_lang)
-        if not translated_text:
-            return jsonify({'success': False, 'error': 'Translation failed'}), 500
-
-        return jsonify({'success': True, 'translated_text': translated_text})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/analyze-tone', methods=['POST'])
-def analyze_tone():
-    try:
-        data = request.json
-        text = data.get('text', '')
-
-        if not text:
-            return jsonify({'success': False, 'error': 'No text provided'}), 400
-
-        # Analyze the tone using the Hugging Face pipeline
-        result = tone_analyzer(text)
-
-        # Extract the label (e.g., POSITIVE, NEGATIVE, NEUTRAL)
-        tone = result[0]['label']
-
-        return jsonify({'success': True, 'tone': tone})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-if __name__ == '__main__':
-    # Check if the speech recognition module is available
-    if not speech_module_available:
-        print("WARNING: Speech recognition module not available. Some features will be disabled.")
-    
-    # Check if document generation modules are available
-    if not reportlab_available:
-        print("WARNING: PDF generation module not available. PDF export will be disabled.")
-    
-    if not docx_available:
-        print("WARNING: DOCX generation module not available. DOCX export will be disabled.")
-    
-    # Get port from environment variable or use default
-    port = int(os.environ.get('PORT', 5000))
-    
-    # Run the Flask app
+from flask import Flask, render_template, request, jsonify, send_file, session, redirect, Response, stream_with_context, g
+from flask_cors import CORS
+import os
+import sys
+import json
+import threading
+import time
+import logging
+import io
+import functools
+import unicodedata
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import quote
+from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.utils import secure_filename
+from werkzeug.wsgi import ClosingIterator
+
+# Add imports for ZIP file creation
+import zipfile
+
+# Import GoogleTranslator for text translation
+from deep_translator import GoogleTranslator
+
+import database
+import metrics
+from profiling import ProfileStore, RequestProfiler, ID_HEADER as PROFILE_ID_HEADER
+from batching import MicroBatcher
+from caching import LRUCache
+from components import ComponentRegistry
+from audio_pipeline import AudioDecodeError, PCM_SAMPLE_RATE
+from zip_stream import stream_zip
+from summarizer import summarize
+from static_assets import AssetManifest
+from stream_recognition import StreamingRecognitionSession, json_sender
+import tone_lexicon
+
+_import_started = time.perf_counter()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Initialize Flask app
+app = Flask(__name__, static_folder=None)
+app.secret_key = 'audiofy-secret-key-super-secure'
+CORS(app, supports_credentials=True)
+
+# Database setup
+DATABASE = os.path.join(os.path.dirname(__file__), 'audiofy.db')
+TRANSCRIPTION_CACHE_DB = os.path.join(os.path.dirname(__file__), 'transcription_cache.db')
+TTS_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'tts_cache')
+
+# Rendered speech is synthesized on a pool of worker processes (0 = render in-process)
+TTS_WORKERS = int(os.environ.get('AUDIOFY_TTS_WORKERS', min(4, os.cpu_count() or 1)))
+TTS_MAX_PENDING = int(os.environ.get('AUDIOFY_TTS_MAX_PENDING', 16))
+
+# Auth queries share a pool of WAL-mode connections instead of opening one per request
+DB_POOL_SIZE = int(os.environ.get('AUDIOFY_DB_POOL_SIZE', 8))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('AUDIOFY_DB_BUSY_TIMEOUT_MS', 5000))
+db_pool = database.ConnectionPool(DATABASE, size=DB_POOL_SIZE, busy_timeout_ms=DB_BUSY_TIMEOUT_MS)
+
+def get_db():
+    """Pooled connection for the current request, returned to the pool on teardown."""
+    if 'db' not in g:
+        g.db = db_pool.acquire()
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exception):
+    conn = g.pop('db', None)
+    if conn is not None:
+        db_pool.release(conn)
+
+def init_db():
+    try:
+        with db_pool.connection() as conn:
+            database.init_schema(conn)
+            logger.info("Database initialized successfully.")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+
+init_db()
+
+def current_user_id():
+    return (session.get('user') or {}).get('id')
+
+def record_history(user_id, kind, **fields):
+    """Save a processed item to the user's history. Never fails the request it belongs to."""
+    if not user_id:
+        return
+    try:
+        with db_pool.connection() as conn:
+            database.add_history(conn, user_id, kind, **fields)
+    except Exception as e:
+        logger.error(f"Failed to save history: {e}")
+
+# Request counts, latency and in-flight gauges for /metrics, labelled by Flask endpoint
+# (registered before protect_files so blocked requests are counted too)
+@app.before_request
+def start_request_metrics():
+    g.metrics_endpoint = request.endpoint or 'unmatched'
+    g.metrics_started = metrics.request_started(g.metrics_endpoint)
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('metrics_started', None)
+    if started is not None:
+        metrics.request_finished(g.metrics_endpoint, request.method, response.status_code, started)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exception):
+    # after_request is skipped when a view raises; those are counted as 500s
+    started = g.pop('metrics_started', None)
+    if started is not None:
+        metrics.request_finished(g.metrics_endpoint, request.method, 500, started)
+
+@app.before_request
+def protect_files():
+    path = request.path.lower()
+    # Block access to database, python source files, and configuration files
+    if any(path.endswith(ext) for ext in ['.db', '.db-wal', '.db-shm', '.py', '.git', '.gitignore', 'readme.md']):
+        return "Access Denied", 403
+        
+    # Redirect direct HTML file accesses to their respective authenticated routes
+    if path in ['/dashboard.html', '/about.html', '/services.html', '/contact.html', '/index.html']:
+        if path == '/index.html':
+            return redirect('/')
+        route = path.rsplit('.', 1)[0]
+        return redirect(route)
+
+# Opt-in profiling of single requests: an admin header or a sampled fraction (see profiling.py)
+PROFILE_ENDPOINTS = 'process_audio,upload_audio,download_all,analyze_tone,translate,generate_pdf,generate_docx'
+request_profiler = RequestProfiler(
+    ProfileStore(os.environ.get('AUDIOFY_PROFILE_DIR', 'profiles'), keep=int(os.environ.get('AUDIOFY_PROFILE_KEEP', 50))),
+    token=os.environ.get('AUDIOFY_PROFILE_TOKEN') or None,
+    sample_rate=float(os.environ.get('AUDIOFY_PROFILE_SAMPLE_RATE', 0)),
+    endpoints=[name for name in os.environ.get('AUDIOFY_PROFILE_ENDPOINTS', PROFILE_ENDPOINTS).split(',') if name],
+    default_mode=os.environ.get('AUDIOFY_PROFILE_MODE', 'sample')
+)
+# The admin endpoints carry the admin header themselves
+UNPROFILED_ENDPOINTS = {'list_profiles', 'download_profile', 'warmup', 'prometheus_metrics'}
+
+@app.before_request
+def start_profile():
+    if not request_profiler.enabled or request.endpoint is None or request.endpoint in UNPROFILED_ENDPOINTS:
+        return
+    profile = request_profiler.begin(request.endpoint, request.method, request.path, request.headers)
+    if profile is not None:
+        g.profile = profile
+        g.profile_stages, g.profile_stages_token = metrics.collect_stages()
+
+def save_profile(profile, status, stages, stages_token):
+    if not profile.stop():
+        return
+    metrics.stop_collecting(stages_token)
+    try:
+        request_profiler.store.save(profile, status, stages)
+        logger.info(f"Saved {profile.mode} profile {profile.id} of {profile.endpoint} ({profile.seconds:.3f}s)")
+    except Exception as e:
+        logger.error(f"Failed to save profile {profile.id}: {e}")
+
+@app.after_request
+def tag_profile(response):
+    profile = g.get('profile')
+    if profile is not None:
+        response.headers[PROFILE_ID_HEADER] = profile.id
+        if response.is_streamed:
+            # The body (e.g. the download-all ZIP) is produced after the view returns, so the
+            # profile is finished when the server closes it, even if it was never iterated
+            g.pop('profile')
+            finish = functools.partial(save_profile, profile, response.status_code, g.pop('profile_stages'),
+                                       g.pop('profile_stages_token'))
+            response.response = ClosingIterator(response.response, finish)
+        else:
+            g.profile_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_profile(exception):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        save_profile(profile, g.pop('profile_status', 500), g.pop('profile_stages'), g.pop('profile_stages_token'))
+
+# Heavy dependencies are loaded on first use (or by /api/warmup, or `python app.py --warmup`)
+components = ComponentRegistry()
+
+def load_tone_model():
+    # Import Hugging Face pipeline for sentiment analysis
+    from transformers import pipeline
+    return pipeline("sentiment-analysis")
+
+components.register('tone_model', load_tone_model, 'Hugging Face sentiment-analysis pipeline')
+
+# Concurrent /api/analyze-tone requests are grouped into one batched forward pass
+TONE_BATCH_SIZE = int(os.environ.get('AUDIOFY_TONE_BATCH_SIZE', 16))
+TONE_BATCH_WAIT_MS = float(os.environ.get('AUDIOFY_TONE_BATCH_WAIT_MS', 10))
+
+def run_tone_batch(texts):
+    tone_analyzer = components.get('tone_model')
+    with metrics.stage('tone', 'model'):
+        return tone_analyzer(texts, batch_size=len(texts), truncation=True)
+
+tone_batcher = MicroBatcher(run_tone_batch, max_batch_size=TONE_BATCH_SIZE,
+                            max_wait_ms=TONE_BATCH_WAIT_MS, name='tone-batcher')
+
+# Import the speech recognition module
+try:
+    from speech_translator import SpeechTranslator, ensure_ffmpeg
+    from caching import TranscriptionCache, DiskLRUCache
+    from tts_pool import TTSWorkerPool, TTSQueueFull
+    transcription_cache = TranscriptionCache(
+        TRANSCRIPTION_CACHE_DB,
+        max_entries=int(os.environ.get('AUDIOFY_TRANSCRIPT_CACHE_ENTRIES', 5000)),
+        max_bytes=int(os.environ.get('AUDIOFY_TRANSCRIPT_CACHE_BYTES', 50 * 1024 * 1024)),
+        name='transcription'
+    )
+    components.register('ffmpeg', lambda: ensure_ffmpeg() or True, 'static-ffmpeg binaries on PATH')
+    tts_cache = DiskLRUCache(TTS_CACHE_DIR, max_bytes=int(os.environ.get('AUDIOFY_TTS_CACHE_BYTES', 200 * 1024 * 1024)),
+                             name='tts')
+    # Voice activity detection trims silence before audio is sent to the recognizer
+    voice_activity_detector = None
+    if os.environ.get('AUDIOFY_VAD', '1').lower() in ('1', 'true', 'yes'):
+        from vad import VoiceActivityDetector, PADDING_MS, ENERGY_RATIO
+        voice_activity_detector = VoiceActivityDetector(
+            padding_ms=int(os.environ.get('AUDIOFY_VAD_PADDING_MS', PADDING_MS)),
+            energy_ratio=float(os.environ.get('AUDIOFY_VAD_ENERGY_RATIO', ENERGY_RATIO))
+        )
+    # Recognition engines besides Google, each enabled by its setting: a local stand-in
+    # for the Google API (offline testing and load tests) and CPU-only offline models
+    from recognition_backends import GoogleBackend, VoskBackend, WhisperBackend, parse_model_paths
+    RECOGNITION_BACKEND = os.environ.get('AUDIOFY_RECOGNITION_BACKEND') or None
+
+    def build_recognition_backends():
+        backends = []
+        if os.environ.get('AUDIOFY_STANDIN_URL'):
+            backends.append(GoogleBackend(endpoint=os.environ['AUDIOFY_STANDIN_URL'], name='standin'))
+        if os.environ.get('AUDIOFY_VOSK_MODEL'):
+            backends.append(VoskBackend(parse_model_paths(os.environ['AUDIOFY_VOSK_MODEL'])))
+        if os.environ.get('AUDIOFY_WHISPER_MODEL'):
+            backends.append(WhisperBackend(os.environ['AUDIOFY_WHISPER_MODEL'],
+                                           compute_type=os.environ.get('AUDIOFY_WHISPER_COMPUTE_TYPE', 'int8')))
+        return backends
+
+    components.register('recognizer', lambda: SpeechTranslator(transcription_cache=transcription_cache, tts_cache=tts_cache,
+                                                               vad=voice_activity_detector,
+                                                               backends=build_recognition_backends(),
+                                                               default_backend=RECOGNITION_BACKEND),
+                        'SpeechTranslator (recognizer, translation clients and caches)')
+    components.register('tts_engine', lambda: components.get('recognizer').engine, 'pyttsx3 text-to-speech engine')
+    components.register('tts_pool', lambda: TTSWorkerPool(workers=TTS_WORKERS, max_pending=TTS_MAX_PENDING),
+                        'text-to-speech worker processes')
+    speech_module_available = True
+    logger.info("Speech translator module loaded successfully")
+except ImportError as e:
+    logger.error(f"Error importing speech translator: {e}")
+    speech_module_available = False
+    transcription_cache = None
+    tts_cache = None
+
+def get_translator():
+    """Return the shared SpeechTranslator, creating it on first use."""
+    return components.get('recognizer')
+
+# Document generation (ReportLab / python-docx are optional)
+from document_renderer import DocumentRenderer, reportlab_available, docx_available, MIMETYPES as DOCUMENT_MIMETYPES
+document_renderer = DocumentRenderer(cache_bytes=int(os.environ.get('AUDIOFY_RENDER_CACHE_BYTES', 64 * 1024 * 1024)))
+
+# Store recognition results, keyed by job/session id
+recognition_results = {}
+results_lock = threading.Lock()
+
+# Define the upload folder
+UPLOAD_FOLDER = 'uploads'
+
+# 'memory' pipes uploads through ffmpeg straight to PCM without temp files;
+# 'disk' keeps the save-and-convert path (also used when in-memory decoding fails)
+DECODE_MODE = os.environ.get('AUDIOFY_DECODE_MODE', 'memory')
+
+# Uploads decoded in memory are kept here, not on disk, for /api/download-all to attach.
+# Each worker process has its own store; an upload it no longer holds is simply left out.
+RECENT_UPLOAD_BYTES = int(os.environ.get('AUDIOFY_RECENT_UPLOAD_BYTES', 128 * 1024 * 1024))
+recent_uploads = LRUCache(max_entries=256, max_bytes=RECENT_UPLOAD_BYTES, sizeof=len, name='uploads')
+
+def upload_name(filename):
+    """The name an upload is stored under, in UPLOAD_FOLDER or recent_uploads."""
+    return secure_filename(os.path.basename(filename or '')) or 'upload.wav'
+
+def save_upload(data, filename):
+    """Write uploaded audio bytes to UPLOAD_FOLDER and return the path."""
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    file_path = os.path.join(UPLOAD_FOLDER, upload_name(filename))
+    with metrics.stage('save_upload'), open(file_path, 'wb') as f:
+        f.write(data)
+    return file_path
+
+def transcribe_upload(data, filename, speech_lang, long_audio=None, details=None, decode_mode=None, backend=None):
+    """Transcribe uploaded audio bytes, decoding in memory unless the disk path is requested."""
+    if details is None:
+        details = {}
+    translator = get_translator()
+    if (decode_mode or DECODE_MODE) == 'memory':
+        try:
+            text = translator.transcribe_audio_bytes(data, language=speech_lang, long_audio=long_audio,
+                                                     details=details, backend=backend)
+        except AudioDecodeError as e:
+            logger.warning(f"In-memory decode failed ({e}), falling back to disk")
+        else:
+            # Decoding needed no files; keep the upload in memory for /api/download-all
+            recent_uploads.put(upload_name(filename), data)
+            return text
+
+    file_path = save_upload(data, filename)
+    logger.info(f"Audio file saved to {file_path}")
+    details['stats'] = {'decode_mode': 'disk', 'bytes_written': len(data), 'input_bytes': len(data)}
+    return translator.transcribe_audio_file(file_path, language=speech_lang, long_audio=long_audio,
+                                            details=details, backend=backend)
+
+def unknown_backend_error(backend):
+    """400 response for a recognition backend that isn't configured, else None."""
+    if backend and backend not in get_translator().backends:
+        return jsonify({'success': False, 'error': f"Unknown recognition backend: {backend}"}), 400
+    return None
+
+# Background recognition workers. Submitted jobs beyond MAX_PENDING_JOBS are
+# rejected so a burst of uploads cannot grow the queue without bound.
+JOB_WORKERS = int(os.environ.get('AUDIOFY_JOB_WORKERS', 2))
+MAX_PENDING_JOBS = int(os.environ.get('AUDIOFY_MAX_PENDING_JOBS', 32))
+RESULT_TTL_SECONDS = int(os.environ.get('AUDIOFY_RESULT_TTL', 3600))
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='audiofy-job')
+
+def prune_results():
+    """Drop finished jobs older than RESULT_TTL_SECONDS. Caller holds results_lock."""
+    cutoff = time.time() - RESULT_TTL_SECONDS
+    expired = [job_id for job_id, result in recognition_results.items()
+               if result.get('status') in ('done', 'error') and result.get('finished_at', cutoff) < cutoff]
+    for job_id in expired:
+        del recognition_results[job_id]
+
+def update_result(job_id, **fields):
+    with results_lock:
+        recognition_results.setdefault(job_id, {}).update(fields)
+
+def parse_long_audio(value):
+    """Map the optional long_audio form field to True/False, or None for automatic."""
+    if value is None or value == '' or value.lower() == 'auto':
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+def run_recognition_job(job_id, data, filename, speech_lang, dest_lang=None, long_audio=None, decode_mode=None,
+                        user_id=None, backend=None):
+    """Transcribe (and optionally translate) an uploaded file on a worker thread."""
+    update_result(job_id, status='running', started_at=time.time())
+    try:
+        details = {}
+        translator = get_translator()
+        original_text = transcribe_upload(data, filename, speech_lang, long_audio, details, decode_mode, backend)
+        if not original_text:
+            update_result(job_id, status='error', error='Could not transcribe audio', finished_at=time.time())
+            return
+
+        src_lang = speech_lang.split('-')[0]
+        translated_text = ''
+        if dest_lang:
+            translated_text = translator.translate_text(original_text, src='auto', dest=dest_lang) or ''
+
+        update_result(
+            job_id,
+            status='done',
+            original=original_text,
+            translated=translated_text,
+            src_lang=src_lang,
+            dest_lang=dest_lang or src_lang,
+            src_lang_name=translator.languages.get(src_lang, 'Unknown'),
+            dest_lang_name=translator.languages.get(dest_lang or src_lang, 'Unknown'),
+            segments=details.get('segments', []),
+            partial=details.get('partial', False),
+            failed_segments=details.get('failed_segments', 0),
+            stats=details.get('stats', {}),
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            finished_at=time.time()
+        )
+        record_history(user_id, 'transcription', src_lang=src_lang, dest_lang=dest_lang, filename=filename,
+                       transcript=original_text, translation=translated_text, stats=details.get('stats'))
+        logger.info(f"Recognition job {job_id} finished")
+    except Exception as e:
+        logger.error(f"Recognition job {job_id} failed: {e}")
+        update_result(job_id, status='error', error=str(e), finished_at=time.time())
+
+def submit_recognition_job(data, filename, speech_lang, dest_lang=None, long_audio=None, decode_mode=None,
+                           user_id=None, backend=None):
+    """Queue a recognition job and return its id, or None when the queue is full."""
+    with results_lock:
+        prune_results()
+        pending = sum(1 for result in recognition_results.values()
+                      if result.get('status') in ('queued', 'running'))
+        if pending >= MAX_PENDING_JOBS:
+            return None
+        job_id = uuid.uuid4().hex
+        recognition_results[job_id] = {'status': 'queued', 'submitted_at': time.time()}
+    job_executor.submit(run_recognition_job, job_id, data, filename, speech_lang, dest_lang, long_audio, decode_mode,
+                        user_id, backend)
+    return job_id
+
+@app.route('/')
+def index():
+    if session.get('user'):
+        return redirect('/dashboard')
+    return send_file(os.path.join(os.path.dirname(__file__), 'index.html'))
+
+@app.route('/dashboard')
+def dashboard():
+    if not session.get('user'):
+        return redirect('/')
+    return send_file(os.path.join(os.path.dirname(__file__), 'frontend', 'dist', 'index.html'))
+
+@app.route('/about')
+def about():
+    return send_file(os.path.join(os.path.dirname(__file__), 'about.html'))
+
+@app.route('/services')
+def services():
+    return send_file(os.path.join(os.path.dirname(__file__), 'services.html'))
+
+@app.route('/contact')
+def contact():
+    return send_file(os.path.join(os.path.dirname(__file__), 'contact.html'))
+
+# Static files are indexed once at startup (frontend/dist first, then the repo root),
+# with gzip/brotli variants and content-hash ETags precomputed
+static_assets = AssetManifest(
+    [os.path.join(os.path.dirname(__file__), 'frontend', 'dist'), os.path.dirname(os.path.abspath(__file__))],
+    check_mtime=os.environ.get('AUDIOFY_STATIC_RELOAD', '0').lower() in ('1', 'true', 'yes')
+).build()
+
+@app.route('/<path:filename>')
+def serve_static(filename):
+    if filename.startswith('api/'):
+        return "Not Found", 404
+    # Prevent directory traversal
+    if '..' in filename or filename.startswith('/'):
+        return "Access Denied", 403
+
+    asset = static_assets.get(filename)
+    if asset is None:
+        return "Not Found", 404
+
+    headers = {'Cache-Control': asset.cache_control}
+    if asset.variants:
+        headers['Vary'] = 'Accept-Encoding'
+
+    if asset.body is None:
+        # Too large to keep in memory: stream it from disk
+        response = send_file(asset.file_path, mimetype=asset.mimetype, etag=asset.etag, conditional=True)
+        response.headers.update(headers)
+        return response
+
+    body, encoding, etag = asset.select(request.accept_encodings)
+    headers['ETag'] = f'"{etag}"'
+    # If-None-Match uses weak comparison (RFC 7232), so W/ ETags from a proxy still match
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, mimetype=asset.mimetype, headers=headers)
+
+# Authentication APIs
+@app.route('/api/signup', methods=['POST'])
+def signup():
+    try:
+        data = request.json or {}
+        username = data.get('username', '').strip()
+        email = data.get('email', '').strip()
+        password = data.get('password', '')
+
+        if not username or not email or not password:
+            return jsonify({'success': False, 'error': 'All fields (username, email, password) are required.'}), 400
+
+        if len(password) < 6:
+            return jsonify({'success': False, 'error': 'Password must be at least 6 characters long.'}), 400
+
+        db = get_db()
+        # Check existing user
+        existing_user = database.find_existing_user(db, email, username)
+        if existing_user:
+            return jsonify({'success': False, 'error': 'User with this email or username already exists.'}), 400
+
+        hashed_pw = generate_password_hash(password)
+        user_id = database.create_user(db, username, email, hashed_pw)
+        user_data = {'id': user_id, 'username': username, 'email': email}
+        session['user'] = user_data
+
+        return jsonify({'success': True, 'user': user_data, 'message': 'Account created successfully!'})
+    except Exception as e:
+        logger.error(f"Signup error: {e}")
+        return jsonify({'success': False, 'error': 'Failed to create account.'}), 500
+
+@app.route('/api/login', methods=['POST'])
+def login():
+    try:
+        data = request.json or {}
+        email = data.get('email', '').strip()
+        password = data.get('password', '')
+
+        if not email or not password:
+            return jsonify({'success': False, 'error': 'Email and password are required.'}), 400
+
+        user = database.find_user_by_email(get_db(), email)
+
+        if not user or not check_password_hash(user['password_hash'], password):
+            return jsonify({'success': False, 'error': 'Invalid email or password.'}), 401
+
+        user_data = {'id': user['id'], 'username': user['username'], 'email': user['email']}
+        session['user'] = user_data
+
+        return jsonify({'success': True, 'user': user_data, 'message': 'Logged in successfully!'})
+    except Exception as e:
+        logger.error(f"Login error: {e}")
+        return jsonify({'success': False, 'error': 'Login failed.'}), 500
+
+@app.route('/api/logout', methods=['POST'])
+def logout():
+    session.pop('user', None)
+    return jsonify({'success': True, 'message': 'Logged out successfully!'})
+
+@app.route('/api/me', methods=['GET'])
+def get_me():
+    user = session.get('user')
+    if user:
+        return jsonify({'success': True, 'authenticated': True, 'user': user})
+    return jsonify({'success': True, 'authenticated': False, 'user': None})
+
+# Per-user history of processed items, newest first. Pages are fetched with the
+# 'cursor' returned by the previous page (keyset pagination).
+def parse_history_limit():
+    """Page size from the 'limit' query arg (1-100, default 20), or None if invalid."""
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return None
+    return limit if 1 <= limit <= 100 else None
+
+@app.route('/api/history', methods=['GET'])
+def list_history():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({'success': False, 'error': 'Login required.'}), 401
+    limit = parse_history_limit()
+    if limit is None:
+        return jsonify({'success': False, 'error': "'limit' must be between 1 and 100"}), 400
+    try:
+        items, next_cursor = database.list_history(get_db(), user_id, limit, request.args.get('cursor') or None)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+    return jsonify({'success': True, 'items': items, 'next_cursor': next_cursor})
+
+@app.route('/api/history/search', methods=['GET'])
+def search_history():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({'success': False, 'error': 'Login required.'}), 401
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'No search query provided'}), 400
+    limit = parse_history_limit()
+    if limit is None:
+        return jsonify({'success': False, 'error': "'limit' must be between 1 and 100"}), 400
+    try:
+        items, next_cursor = database.search_history(get_db(), user_id, query, limit,
+                                                     request.args.get('cursor') or None)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+    return jsonify({'success': True, 'items': items, 'next_cursor': next_cursor})
+
+@app.route('/api/history/<int:item_id>', methods=['DELETE'])
+def delete_history(item_id):
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({'success': False, 'error': 'Login required.'}), 401
+    if not database.delete_history(get_db(), user_id, item_id):
+        return jsonify({'success': False, 'error': 'History item not found'}), 404
+    return jsonify({'success': True})
+
+# Add a route to handle audio file uploads
+@app.route('/api/upload-audio', methods=['POST'])
+def upload_audio():
+    audio_file = request.files.get('audio')
+    language = request.form.get('language', 'en')
+
+    if not audio_file:
+        return jsonify({'success': False, 'error': 'No audio file provided'}), 400
+
+    # Validate file type
+    if not audio_file.filename.lower().endswith(('.wav', '.mp3')):
+        return jsonify({'success': False, 'error': 'Unsupported file format. Please upload a .wav or .mp3 file.'}), 400
+
+    try:
+        backend = request.form.get('backend') or None
+        error = unknown_backend_error(backend)
+        if error:
+            return error
+
+        # Transcribe the audio (decoded in memory unless decode=disk is requested)
+        details = {}
+        original_text = transcribe_upload(audio_file.read(), audio_file.filename, language,
+                                          details=details, decode_mode=request.form.get('decode'), backend=backend)
+        if not original_text:
+            return jsonify({'success': False, 'error': 'Could not transcribe audio'}), 500
+
+        response = {'success': True, 'transcription': original_text, 'stats': details.get('stats', {})}
+        if details.get('partial'):
+            response.update(partial=True, failed_segments=details['failed_segments'])
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"Error uploading audio: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/recognize', methods=['POST'])
+def recognize_speech():
+    if not speech_module_available:
+        return jsonify({
+            'success': False,
+            'error': 'Speech recognition module not available'
+        }), 500
+
+    try:
+        # Get language from request JSON body (default to en-US)
+        data = request.json or {}
+        language = data.get('language', 'en-US')
+        backend = data.get('backend') or None
+        error = unknown_backend_error(backend)
+        if error:
+            return error
+
+        # Recognize speech
+        text = get_translator().recognize_speech(language=language, backend=backend)
+        if text:
+            return jsonify({
+                'success': True,
+                'transcription': text
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Could not recognize speech'
+            })
+    except Exception as e:
+        logger.error(f"Error recognizing speech: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Live recognition: the browser streams microphone PCM over a WebSocket and gets
+# partial and final transcripts back per utterance (needs flask-sock)
+try:
+    from flask_sock import Sock, ConnectionClosed
+    sock = Sock(app)
+    websocket_available = True
+except ImportError as e:
+    logger.warning(f"flask-sock not available, streaming recognition disabled: {e}")
+    websocket_available = False
+
+STREAM_IDLE_SECONDS = float(os.environ.get('AUDIOFY_STREAM_IDLE_SECONDS', 30))
+MAX_STREAMS = int(os.environ.get('AUDIOFY_MAX_STREAMS', 16))
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+def stream_recognize(ws):
+    """
+    Protocol: connect to /api/stream-recognize?language=en-US&sample_rate=48000, send
+    binary frames of mono 16-bit little-endian PCM, then a text frame {"type": "stop"}.
+    The server replies with JSON text frames: 'ready', then 'partial'/'final' results
+    per utterance, and 'done' with the session stats after the stop.
+    """
+    send = json_sender(ws)
+    if not speech_module_available:
+        send({'type': 'error', 'error': 'Speech recognition module not available'})
+        return
+    if not stream_slots.acquire(blocking=False):
+        send({'type': 'error', 'error': 'Server is busy, please retry shortly'})
+        return
+    session = None
+    try:
+        try:
+            sample_rate = int(request.args.get('sample_rate', PCM_SAMPLE_RATE))
+            translator = get_translator()
+            backend = translator.get_backend(request.args.get('backend') or None).name
+            recognize = functools.partial(translator.recognize_utterance, backend=backend)
+            session = StreamingRecognitionSession(recognize, send, language=request.args.get('language', 'en-US'),
+                                                  sample_rate=sample_rate)
+        except ValueError as e:
+            send({'type': 'error', 'error': str(e)})
+            return
+        send({'type': 'ready', 'sample_rate': sample_rate})
+
+        while True:
+            message = ws.receive(timeout=STREAM_IDLE_SECONDS)
+            if message is None:
+                send({'type': 'error', 'error': 'No audio received, closing stream'})
+                break
+            if isinstance(message, bytes):
+                session.feed(message)
+                continue
+            try:
+                control = json.loads(message)
+            except ValueError:
+                control = {}
+            if control.get('type') == 'stop':
+                stats = session.finish()
+                session = None
+                send({'type': 'done', 'stats': stats})
+                break
+    except ConnectionClosed:
+        logger.info("Streaming client disconnected")
+    finally:
+        if session is not None:
+            session.close()
+        stream_slots.release()
+
+if websocket_available:
+    sock.route('/api/stream-recognize')(stream_recognize)
+else:
+    @app.route('/api/stream-recognize')
+    def stream_recognize_unavailable():
+        return jsonify({'success': False, 'error': 'Streaming recognition requires flask-sock'}), 501
+
+# Report the status of a queued recognition job and its stored results
+@app.route('/api/results/<session_id>', methods=['GET'])
+def get_results(session_id):
+    with results_lock:
+        result = dict(recognition_results.get(session_id, {}))
+
+    if not result:
+        return jsonify({
+            'success': False,
+            'error': 'Results not found'
+        }), 404
+
+    status = result.get('status', 'done')
+    if status == 'error' or 'error' in result:
+        return jsonify({
+            'success': False,
+            'status': 'error',
+            'error': result.get('error', 'Recognition failed')
+        })
+
+    if status in ('queued', 'running'):
+        return jsonify({
+            'success': True,
+            'status': status,
+            'session_id': session_id
+        })
+
+    return jsonify({
+        'success': True,
+        'status': 'done',
+        'session_id': session_id,
+        'original': result['original'],
+        'transcription': result['original'],
+        'translated': result['translated'],
+        'src_lang': result['src_lang'],
+        'dest_lang': result['dest_lang'],
+        'src_lang_name': result.get('src_lang_name', 'Unknown'),
+        'dest_lang_name': result.get('dest_lang_name', 'Unknown'),
+        'timestamp': result.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+        'tone': result.get('tone', 'Neutral'),
+        'summary': result.get('summary', ''),
+        'segments': result.get('segments', []),
+        'partial': result.get('partial', False),
+        'failed_segments': result.get('failed_segments', 0),
+        'stats': result.get('stats', {})
+    })
+
+@app.route('/api/speak', methods=['POST'])
+def speak_text():
+    if not speech_module_available:
+        return jsonify({
+            'success': False,
+            'error': 'Speech module not available'
+        }), 500
+
+    data = request.json
+    text = data.get('text', '')
+    language = data.get('language', 'en')
+
+    if not text:
+        return jsonify({
+            'success': False,
+            'error': 'No text provided'
+        }), 400
+
+    # 'render' returns the synthesized clip to the browser; 'play' speaks on the server
+    mode = data.get('mode', 'play')
+    if mode == 'render':
+        audio_format = data.get('format', 'wav')
+        if audio_format not in ('wav', 'ogg', 'mp3'):
+            return jsonify({'success': False, 'error': 'Unsupported audio format'}), 400
+        try:
+            tts_pool = components.get('tts_pool') if TTS_WORKERS > 0 else None
+            audio, mimetype = get_translator().synthesize_speech(text, language=language, rate=data.get('rate'),
+                                                                 audio_format=audio_format, tts_pool=tts_pool)
+            return send_file(
+                io.BytesIO(audio),
+                mimetype=mimetype,
+                as_attachment=False,
+                download_name=f"speech.{audio_format}"
+            )
+        except TTSQueueFull as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
+        except Exception as e:
+            logger.error(f"Error synthesizing speech: {e}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+
+    try:
+        # Use the SpeechTranslator module to speak the text
+        get_translator().speak_text(text, language=language)
+
+        return jsonify({
+            'success': True,
+            'message': 'Text spoken successfully'
+        })
+    except Exception as e:
+        logger.error(f"Error speaking text: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/recognition-backends', methods=['GET'])
+def recognition_backends():
+    if not speech_module_available:
+        return jsonify({'success': False, 'error': 'Speech module not available'}), 500
+    translator = get_translator()
+    return jsonify({
+        'success': True,
+        'default': translator.default_backend,
+        'backends': [backend.describe() for backend in translator.backends.values()]
+    })
+
+@app.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    stats = {}
+    if transcription_cache is not None:
+        stats['transcription'] = transcription_cache.stats()
+    if tts_cache is not None:
+        stats['tts'] = tts_cache.stats()
+    stats['documents'] = document_renderer.cache.stats()
+    stats['static'] = static_assets.stats()
+    if components.is_loaded('recognizer'):
+        stats['translation'] = get_translator().translation_cache.stats()
+    return jsonify({'success': True, 'caches': stats, 'tone_batcher': tone_batcher.stats()})
+
+# Prometheus scrape endpoint; see metrics.py for the metric names
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    if not metrics.prometheus_available:
+        return jsonify({'success': False, 'error': 'Metrics require prometheus_client'}), 501
+    body, content_type = metrics.render()
+    return Response(body, content_type=content_type)
+
+def admin_error():
+    """
+    Error response unless the request carries the admin token (AUDIOFY_PROFILE_TOKEN, in the
+    profiling header), else None. Guards the profile downloads and /api/warmup.
+    """
+    if not request_profiler.token:
+        return jsonify({'success': False, 'error': 'Admin endpoints are disabled (set AUDIOFY_PROFILE_TOKEN)'}), 404
+    if not request_profiler.is_admin(request.headers):
+        return jsonify({'success': False, 'error': 'Admin token required'}), 403
+    return None
+
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    error = admin_error()
+    if error:
+        return error
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({'success': True, 'profiles': request_profiler.store.list(limit)})
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    error = admin_error()
+    if error:
+        return error
+    # pstats for cProfile runs (python -m pstats, snakeviz), speedscope JSON for sampled ones
+    fmt = request.args.get('format')
+    formats = [fmt] if fmt else ['pstats', 'speedscope']
+    for candidate in formats:
+        path = request_profiler.store.path(profile_id, candidate)
+        if path:
+            return send_file(os.path.abspath(path), as_attachment=True, download_name=os.path.basename(path),
+                             mimetype='application/json' if candidate == 'speedscope' else 'application/octet-stream')
+    return jsonify({'success': False, 'error': 'Profile not found'}), 404
+
+@app.route('/api/languages', methods=['GET'])
+def get_languages():
+    if not speech_module_available:
+        return jsonify({
+            'success': False,
+            'error': 'Speech module not available'
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'languages': get_translator().languages
+    })
+
+@app.route('/api/generate-pdf', methods=['POST'])
+def generate_pdf():
+    if not reportlab_available:
+        return jsonify({
+            'success': False,
+            'error': 'PDF generation module not available'
+        }), 500
+    
+    data = request.json
+    text = data.get('text', '')
+    filename = data.get('filename', 'document')
+    
+    if not text:
+        return jsonify({
+            'success': False,
+            'error': 'No text provided'
+        }), 400
+    
+    try:
+        pdf_value = document_renderer.render(text, 'pdf', data.get('template', 'default'))
+
+        return send_file(
+            io.BytesIO(pdf_value),
+            mimetype=DOCUMENT_MIMETYPES['pdf'],
+            as_attachment=True,
+            download_name=f"{filename}.pdf"
+        )
+        
+    except Exception as e:
+        logger.error(f"Error generating PDF: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/generate-docx', methods=['POST'])
+def generate_docx():
+    if not docx_available:
+        return jsonify({
+            'success': False,
+            'error': 'DOCX generation module not available'
+        }), 500
+    
+    data = request.json
+    text = data.get('text', '')
+    filename = data.get('filename', 'document')
+    
+    if not text:
+        return jsonify({
+            'success': False,
+            'error': 'No text provided'
+        }), 400
+    
+    try:
+        docx_value = document_renderer.render(text, 'docx', data.get('template', 'default'))
+
+        return send_file(
+            io.BytesIO(docx_value),
+            mimetype=DOCUMENT_MIMETYPES['docx'],
+            as_attachment=True,
+            download_name=f"{filename}.docx"
+        )
+        
+    except Exception as e:
+        logger.error(f"Error generating DOCX: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def set_attachment(response, download_name):
+    """Mark a response as a download named download_name, quoted the way send_file does it."""
+    try:
+        download_name.encode('ascii')
+        names = {'filename': download_name}
+    except UnicodeEncodeError:
+        # ASCII fallback for old clients, plus the exact name as RFC 5987 filename*
+        simple = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+        names = {'filename': simple, 'filename*': f"UTF-8''{quote(download_name, safe='!#$&+^`|~')}"}
+    response.headers.set('Content-Disposition', 'attachment', **names)
+    return response
+
+# Documents for ZIP exports are rendered on these threads while the archive streams
+export_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('AUDIOFY_EXPORT_WORKERS', 4)),
+                                     thread_name_prefix='audiofy-export')
+
+# Add a route to download both PDF and DOCX as a ZIP file
+@app.route('/api/download-all', methods=['POST'])
+def download_all():
+    data = request.json
+    text = data.get('text', '')
+    filename = data.get('filename', 'document')
+    audio_file_path = data.get('audio_file_path', '')  # Name of the uploaded audio file
+
+    if not text:
+        return jsonify({
+            'success': False,
+            'error': 'No text provided'
+        }), 400
+
+    try:
+        # Start rendering the documents concurrently; the archive streams as each one is ready
+        members = []
+        if audio_file_path:
+            # Only recent uploads (in memory, or in the upload folder) can be attached
+            audio_name = upload_name(audio_file_path)
+            audio_path = os.path.join(UPLOAD_FOLDER, audio_name)
+            audio_data = recent_uploads.get(audio_name)
+            # Audio is already compressed: store it, copied from disk in chunks if it was saved
+            if audio_data is not None:
+                members.append((audio_name, audio_data, zipfile.ZIP_STORED))
+            elif os.path.isfile(audio_path):
+                members.append((audio_name, audio_path, zipfile.ZIP_STORED))
+        if reportlab_available:
+            members.append((f"{filename}.pdf", export_executor.submit(document_renderer.render, text, 'pdf'),
+                            zipfile.ZIP_DEFLATED))
+        if docx_available:
+            members.append((f"{filename}.docx", export_executor.submit(document_renderer.render, text, 'docx'),
+                            zipfile.ZIP_STORED))
+
+        response = Response(stream_with_context(stream_zip(members)), mimetype='application/zip')
+        return set_attachment(response, f"{filename}_files.zip")
+
+    except Exception as e:
+        logger.error(f"Error creating ZIP file: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Add a new route to process audio directly
+@app.route('/api/process-audio', methods=['POST'])
+def process_audio():
+    try:
+        logger.info("Processing audio file...")
+        if not speech_module_available:
+            logger.error("Speech module not available")
+            return jsonify({'success': False, 'error': 'Speech module not available'}), 500
+
+        audio_file = request.files.get('audio')
+        if not audio_file:
+            logger.error("No audio file provided")
+            return jsonify({'success': False, 'error': 'No audio file provided'}), 400
+
+        data = audio_file.read()
+        speech_lang = request.form.get('language', 'en-US')
+        long_audio = parse_long_audio(request.form.get('long_audio'))
+        decode_mode = request.form.get('decode') or None
+        backend = request.form.get('backend') or None
+        error = unknown_backend_error(backend)
+        if error:
+            return error
+
+        # Submit-and-poll mode: hand the work to the job pool and return immediately
+        if request.form.get('async', '').lower() in ('1', 'true', 'yes'):
+            dest_lang = request.form.get('dest_lang') or None
+            job_id = submit_recognition_job(data, audio_file.filename, speech_lang, dest_lang, long_audio, decode_mode,
+                                            current_user_id(), backend)
+            if not job_id:
+                logger.error("Recognition queue is full")
+                return jsonify({'success': False, 'error': 'Server is busy, please retry shortly'}), 503
+            logger.info(f"Queued recognition job {job_id}")
+            return jsonify({
+                'success': True,
+                'status': 'queued',
+                'session_id': job_id,
+                'results_url': f"/api/results/{job_id}"
+            }), 202
+
+        details = {}
+        original_text = transcribe_upload(data, audio_file.filename, speech_lang, long_audio, details, decode_mode,
+                                          backend)
+        if not original_text:
+            logger.error("Could not transcribe audio")
+            return jsonify({'success': False, 'error': 'Could not transcribe audio'}), 500
+
+        logger.info(f"Audio transcription successful ({details.get('stats', {})})")
+        record_history(current_user_id(), 'transcription', src_lang=speech_lang.split('-')[0],
+                       filename=audio_file.filename, transcript=original_text, stats=details.get('stats'))
+        response = {'success': True, 'transcription': original_text, 'stats': details.get('stats', {})}
+        if 'segments' in details:
+            response['segments'] = details['segments']
+        if 'cache' in details:
+            response['cache'] = details['cache']
+        if details.get('partial'):
+            # Some segments failed on the recognition service; the transcript has gaps
+            logger.warning(f"Partial transcription: {details['failed_segments']} segments failed")
+            response.update(partial=True, failed_segments=details['failed_segments'])
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"Error processing audio: {e}")
+        # Add a proper return statement for the exception case
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# Add a route for summarization
+@app.route('/api/summarize', methods=['POST'])
+def summarize_text():
+    data = request.json
+    text = data.get('text', '')
+    num_sentences = data.get('sentences')
+    ratio = data.get('ratio')
+
+    if not text.strip():
+        return jsonify({'success': False, 'error': 'No text provided'}), 400
+
+    # Summary length: a number of sentences, or a ratio (0-1] of the transcript
+    # (JSON true/false would pass as the ints 1/0, so booleans are rejected explicitly)
+    if num_sentences is not None and (isinstance(num_sentences, bool) or not isinstance(num_sentences, int)
+                                      or num_sentences < 1):
+        return jsonify({'success': False, 'error': "'sentences' must be a positive integer"}), 400
+    if ratio is not None and (isinstance(ratio, bool) or not isinstance(ratio, (int, float)) or not 0 < ratio <= 1):
+        return jsonify({'success': False, 'error': "'ratio' must be between 0 and 1"}), 400
+
+    try:
+        if speech_module_available:
+            summary = get_translator().generate_summary(text, num_sentences=num_sentences, ratio=ratio)
+        else:
+            # Fallback summarization without the speech module
+            summary = summarize(text, num_sentences=num_sentences, ratio=ratio)
+        record_history(current_user_id(), 'summary', transcript=text, summary=summary)
+        return jsonify({'success': True, 'summary': summary})
+    except Exception as e:
+        logger.error(f"Error generating summary: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+MAX_TRANSLATION_TARGETS = 20
+
+def translate_to_targets(text, src_lang, dest_langs):
+    """Fan-out mode of /api/translate: one text (or list of texts) into several languages."""
+    if isinstance(text, list):
+        if not all(isinstance(t, str) for t in text):
+            return jsonify({'success': False, 'error': "'texts' must be a list of strings"}), 400
+    if not text:
+        return jsonify({'success': False, 'error': 'No text provided'}), 400
+
+    try:
+        started = time.perf_counter()
+        translations = get_translator().translate_targets(text, src=src_lang, dests=dest_langs)
+        failed = [lang for lang, value in translations.items()
+                  if value is None or (isinstance(value, list) and any(t is None for t in value))]
+        if isinstance(text, str):
+            user_id = current_user_id()
+            for lang, value in translations.items():
+                if value:
+                    record_history(user_id, 'translation', src_lang=src_lang, dest_lang=lang,
+                                   transcript=text, translation=value)
+        return jsonify({
+            'success': not failed,
+            'translations': translations,
+            'failed': failed,
+            'stats': {'targets': len(translations), 'seconds': round(time.perf_counter() - started, 3)}
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/translate', methods=['POST'])
+def translate():
+    data = request.json
+    text = data.get('text', '')
+    texts = data.get('texts')
+    src_lang = data.get('src_lang', 'auto')
+    dest_lang = data.get('dest_lang', 'en')
+    # Several targets can be requested at once as 'dest_langs' (or as a list in 'dest_lang')
+    dest_langs = data.get('dest_langs')
+    if dest_langs is None and isinstance(dest_lang, list):
+        dest_langs = dest_lang
+
+    # A list of segments can be sent as 'texts' (or as a list in 'text')
+    if texts is None and isinstance(text, list):
+        texts = text
+
+    if dest_langs is not None:
+        if (not isinstance(dest_langs, list) or not dest_langs
+                or not all(isinstance(lang, str) and lang for lang in dest_langs)):
+            return jsonify({'success': False, 'error': "'dest_langs' must be a non-empty list of language codes"}), 400
+        if len(set(dest_langs)) > MAX_TRANSLATION_TARGETS:
+            return jsonify({'success': False,
+                            'error': f'At most {MAX_TRANSLATION_TARGETS} target languages per request'}), 400
+        return translate_to_targets(texts if texts is not None else text, src_lang, dest_langs)
+
+    if texts is not None:
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            return jsonify({'success': False, 'error': "'texts' must be a list of strings"}), 400
+        if not texts:
+            return jsonify({'success': False, 'error': 'No text provided'}), 400
+        try:
+            translations = get_translator().translate_batch(texts, src=src_lang, dest=dest_lang)
+            return jsonify({'success': all(t is not None for t in translations), 'translations': translations})
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    if not text:
+        return jsonify({'success': False, 'error': 'No text provided'}), 400
+
+    try:
+        translated_text = get_translator().translate_text(text, src=src_lang, dest=dest_lang)
+        if not translated_text:
+            return jsonify({'success': False, 'error': 'Translation failed'}), 500
+
+        record_history(current_user_id(), 'translation', src_lang=src_lang, dest_lang=dest_lang,
+                       transcript=text, translation=translated_text)
+        return jsonify({'success': True, 'translated_text': translated_text})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/analyze-tone', methods=['POST'])
+def analyze_tone():
+    try:
+        data = request.json
+        text = data.get('text', '')
+        texts = data.get('texts')
+        # 'model' uses the transformers pipeline; 'lexicon' is the cheap keyword detector
+        engine = data.get('engine', 'model')
+
+        if engine not in ('model', 'lexicon'):
+            return jsonify({'success': False, 'error': "'engine' must be 'model' or 'lexicon'"}), 400
+
+        # Several texts can be analyzed at once by sending a list
+        if texts is None and isinstance(text, list):
+            texts = text
+
+        if texts is not None:
+            if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t for t in texts):
+                return jsonify({'success': False, 'error': "'texts' must be a non-empty list of strings"}), 400
+            if engine == 'lexicon':
+                return jsonify({'success': True, 'tones': tone_lexicon.detect_tones(texts)})
+            results = tone_batcher.map(texts)
+            return jsonify({
+                'success': True,
+                'tones': [result['label'] for result in results],
+                'scores': [result['score'] for result in results]
+            })
+
+        if not text:
+            return jsonify({'success': False, 'error': 'No text provided'}), 400
+
+        if engine == 'lexicon':
+            tone = tone_lexicon.detect_tone(text)
+        else:
+            # Analyze the tone using the Hugging Face pipeline (batched with concurrent requests)
+            result = tone_batcher.map([text])
+
+            # Extract the label (e.g., POSITIVE, NEGATIVE, NEUTRAL)
+            tone = result[0]['label']
+
+        record_history(current_user_id(), 'tone', transcript=text, tone=tone)
+        return jsonify({'success': True, 'tone': tone})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/warmup', methods=['POST'])
+def warmup():
+    # Loading every model is expensive, so only admins may trigger (or retry) it
+    error = admin_error()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    names = data.get('components') or None
+    unknown = [name for name in names or [] if name not in components.names()]
+    if unknown:
+        return jsonify({'success': False, 'error': f"Unknown components: {', '.join(unknown)}"}), 400
+    report = components.warm_up(names)
+    failed = [name for name, info in report['components'].items() if info['error']]
+    return jsonify({'success': not failed, 'report': report})
+
+@app.route('/api/startup-report', methods=['GET'])
+def startup_report():
+    report = components.report()
+    report['app_import_seconds'] = APP_IMPORT_SECONDS
+    return jsonify({'success': True, 'report': report})
+
+APP_IMPORT_SECONDS = round(time.perf_counter() - _import_started, 4)
+
+if __name__ == '__main__':
+    # Check if the speech recognition module is available
+    if not speech_module_available:
+        print("WARNING: Speech recognition module not available. Some features will be disabled.")
+    
+    # Check if document generation modules are available
+    if not reportlab_available:
+        print("WARNING: PDF generation module not available. PDF export will be disabled.")
+    
+    if not docx_available:
+        print("WARNING: DOCX generation module not available. DOCX export will be disabled.")
+    
+    # Optionally load every heavy component before accepting requests
+    if '--warmup' in sys.argv or os.environ.get('AUDIOFY_WARMUP') == '1':
+        report = components.warm_up()
+        for name, info in report['components'].items():
+            status = f"{info['load_seconds']:.2f}s" if info['loaded'] else f"failed ({info['error']})"
+            logger.info(f"Warm-up {name}: {status}")
+        logger.info(f"Warm-up finished in {report['total_load_seconds']:.2f}s")
+
+    # Get port from environment variable or use default
+    port = int(os.environ.get('PORT', 5000))
+    
+    # Run the Flask app
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
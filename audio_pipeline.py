@@ -0,0 +1,299 @@
+import audioop
+import subprocess
+import threading
+from collections import deque
+
+# Segmentation defaults for long recordings. Segments are cut at the first
+# sufficiently long pause after MIN_SEGMENT_SECONDS, and hard-cut at
+# MAX_SEGMENT_SECONDS so memory per segment stays bounded.
+MIN_SEGMENT_SECONDS = 10.0
+MAX_SEGMENT_SECONDS = 30.0
+FRAME_MS = 30
+SILENCE_MS = 300
+SILENCE_THRESHOLD = 300  # RMS energy on 16-bit samples, same scale as sr.Recognizer.energy_threshold
+
+
+def iter_silence_segments(read_frames, sample_rate, sample_width,
+                          min_segment_seconds=MIN_SEGMENT_SECONDS,
+                          max_segment_seconds=MAX_SEGMENT_SECONDS,
+                          frame_ms=FRAME_MS, silence_ms=SILENCE_MS,
+                          silence_threshold=SILENCE_THRESHOLD):
+    """
+    Split a mono PCM stream into segments at silence boundaries.
+
+    read_frames(n) must return up to n frames of raw mono PCM (b'' at end of stream),
+    e.g. the stream of an open sr.AudioFile. Yields (start_seconds, pcm_bytes) tuples;
+    only the segment being built is held in memory.
+    """
+    frame_count = max(1, int(sample_rate * frame_ms / 1000))
+    frame_bytes = frame_count * sample_width
+    # Thresholds are expressed for 16-bit audio; rescale for other widths
+    threshold = silence_threshold * (2 ** (8 * (sample_width - 2))) if sample_width > 1 else silence_threshold / 256
+    min_bytes = int(min_segment_seconds * sample_rate) * sample_width
+    max_bytes = int(max_segment_seconds * sample_rate) * sample_width
+    silence_frames_needed = max(1, silence_ms // frame_ms)
+
+    segment = bytearray()
+    segment_start = 0
+    position = 0  # bytes consumed so far
+    silent_run = 0
+
+    while True:
+        chunk = read_frames(frame_count)
+        if not chunk:
+            break
+        segment.extend(chunk)
+        position += len(chunk)
+
+        if len(chunk) >= sample_width and audioop.rms(chunk, sample_width) < threshold:
+            silent_run += 1
+        else:
+            silent_run = 0
+
+        at_pause = silent_run >= silence_frames_needed and len(segment) >= min_bytes
+        if at_pause or len(segment) >= max_bytes:
+            yield segment_start / (sample_rate * sample_width), bytes(segment)
+            segment_start = position
+            segment = bytearray()
+            silent_run = 0
+
+        if len(chunk) < frame_bytes:
+            break
+
+    if segment:
+        yield segment_start / (sample_rate * sample_width), bytes(segment)
+
+
+# Live streams are cut per utterance: a shorter pause ends one, and the growing
+# utterance is offered for a partial transcript every STREAM_PARTIAL_SECONDS.
+STREAM_SILENCE_MS = 500
+STREAM_PARTIAL_SECONDS = 0.5
+STREAM_MAX_UTTERANCE_SECONDS = 15.0
+STREAM_PREROLL_MS = 150
+
+
+class UtteranceSegmenter:
+    """
+    Incremental utterance detector for live mono PCM.
+
+    feed() accepts chunks of any size and returns the events they complete:
+    ('partial', start_seconds, pcm_so_far) while an utterance is growing, and
+    ('final', start_seconds, pcm) once it ends at a pause (or hits the length cap).
+    Silence between utterances is dropped, apart from a short pre-roll kept so the
+    first syllable isn't clipped.
+    """
+
+    def __init__(self, sample_rate, sample_width, frame_ms=FRAME_MS, silence_ms=STREAM_SILENCE_MS,
+                 partial_seconds=STREAM_PARTIAL_SECONDS, max_utterance_seconds=STREAM_MAX_UTTERANCE_SECONDS,
+                 preroll_ms=STREAM_PREROLL_MS, silence_threshold=SILENCE_THRESHOLD):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_bytes = max(1, int(sample_rate * frame_ms / 1000)) * sample_width
+        self.threshold = silence_threshold * (2 ** (8 * (sample_width - 2))) if sample_width > 1 else silence_threshold / 256
+        self.silence_frames_needed = max(1, silence_ms // frame_ms)
+        self.partial_bytes = int(partial_seconds * sample_rate) * sample_width
+        self.max_bytes = int(max_utterance_seconds * sample_rate) * sample_width
+        self.preroll_frames = max(0, preroll_ms // frame_ms)
+
+        self._pending = bytearray()  # bytes not yet making up a whole frame
+        self._preroll = deque(maxlen=self.preroll_frames or 1)
+        self._utterance = bytearray()
+        self._utterance_start = 0
+        self._position = 0  # bytes consumed so far
+        self._silent_run = 0
+        self._last_partial = 0
+
+    @property
+    def in_utterance(self):
+        return bool(self._utterance)
+
+    def _seconds(self, position):
+        return position / (self.sample_rate * self.sample_width)
+
+    def _finish(self):
+        event = ('final', self._seconds(self._utterance_start), bytes(self._utterance))
+        self._utterance = bytearray()
+        self._silent_run = 0
+        self._last_partial = 0
+        return event
+
+    def feed(self, pcm):
+        events = []
+        self._pending.extend(pcm)
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[:self.frame_bytes])
+            del self._pending[:self.frame_bytes]
+            self._position += len(frame)
+            silent = audioop.rms(frame, self.sample_width) < self.threshold
+
+            if not self._utterance:
+                if silent:
+                    if self.preroll_frames:
+                        self._preroll.append(frame)
+                    continue
+                # Speech starts: open an utterance with the pre-roll in front of it
+                preroll = b''.join(self._preroll) if self.preroll_frames else b''
+                self._preroll.clear()
+                self._utterance.extend(preroll)
+                self._utterance_start = self._position - len(frame) - len(preroll)
+
+            self._utterance.extend(frame)
+            self._silent_run = self._silent_run + 1 if silent else 0
+            if self._silent_run >= self.silence_frames_needed or len(self._utterance) >= self.max_bytes:
+                events.append(self._finish())
+            elif len(self._utterance) - self._last_partial >= self.partial_bytes and not silent:
+                self._last_partial = len(self._utterance)
+                events.append(('partial', self._seconds(self._utterance_start), bytes(self._utterance)))
+        return events
+
+    def flush(self):
+        """End of stream: close the current utterance, if any."""
+        if self._pending and self._utterance:
+            self._utterance.extend(self._pending)
+            self._position += len(self._pending)
+        self._pending = bytearray()
+        return [self._finish()] if self._utterance else []
+
+
+# Format produced by the in-memory decoder and expected by the recognizer
+PCM_SAMPLE_RATE = 16000
+PCM_SAMPLE_WIDTH = 2
+
+
+class AudioDecodeError(Exception):
+    """Raised when ffmpeg cannot decode uploaded audio."""
+
+
+def decode_to_pcm(data, sample_rate=PCM_SAMPLE_RATE, ffmpeg_binary='ffmpeg', timeout=600):
+    """
+    Decode audio bytes in any format ffmpeg understands to mono 16-bit little-endian PCM.
+    Input and output go through pipes, so no temporary files are written.
+    """
+    output_args = ['-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate)]
+    return _run_ffmpeg(data, output_args, ffmpeg_binary, timeout)
+
+
+class PCMStream:
+    """
+    Audio bytes being decoded by ffmpeg to mono 16-bit little-endian PCM, read
+    incrementally from its stdout (e.g. by iter_silence_segments), so the decoded
+    audio is never held in memory as a whole. The input is fed to ffmpeg's stdin on
+    a background thread. Use as a context manager: on leaving it, ffmpeg is reaped
+    and AudioDecodeError is raised if it failed on a stream that was read to the end.
+    """
+
+    def __init__(self, data, sample_rate=PCM_SAMPLE_RATE, ffmpeg_binary='ffmpeg', timeout=600):
+        command = [ffmpeg_binary, '-hide_banner', '-loglevel', 'error', '-nostdin', '-i', 'pipe:0',
+                   '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate), 'pipe:1']
+        try:
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.PIPE)
+        except OSError as e:
+            raise AudioDecodeError(f"ffmpeg could not be run: {e}")
+        self.bytes_read = 0
+        self._eof = False
+        self._closed = False
+        self._stderr = b''
+        self._timer = threading.Timer(timeout, self._process.kill)
+        self._timer.daemon = True
+        self._threads = [threading.Thread(target=self._write, args=(data,), daemon=True),
+                         threading.Thread(target=self._read_errors, daemon=True)]
+        self._timer.start()
+        for thread in self._threads:
+            thread.start()
+
+    def _write(self, data):
+        try:
+            self._process.stdin.write(data)
+        except OSError:
+            # ffmpeg stopped reading (bad input or close()); its exit status tells why
+            pass
+        finally:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+
+    def _read_errors(self):
+        self._stderr = self._process.stderr.read()
+
+    def read(self, size=-1):
+        """Up to size bytes of PCM (all that is left for -1); fewer only at the end of the stream."""
+        chunk = self._process.stdout.read(size)
+        self.bytes_read += len(chunk)
+        if size < 0 or len(chunk) < size:
+            self._eof = True
+        return chunk
+
+    def close(self):
+        """
+        Reap ffmpeg. A stream abandoned before its end is killed quietly; one read to
+        the end raises AudioDecodeError if ffmpeg failed or produced no audio.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not self._eof:
+            self._process.kill()
+        self._process.stdout.close()
+        returncode = self._process.wait()
+        self._timer.cancel()
+        for thread in self._threads:
+            thread.join()
+        if self._eof and (returncode != 0 or not self.bytes_read):
+            message = self._stderr.decode('utf-8', 'replace').strip().splitlines()
+            raise AudioDecodeError(message[-1] if message else f"ffmpeg exited with code {returncode}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            try:
+                self.close()
+            except AudioDecodeError:
+                pass
+
+
+def _run_ffmpeg(data, output_args, ffmpeg_binary, timeout):
+    """Feed data to ffmpeg on stdin and return what it writes to stdout."""
+    command = [ffmpeg_binary, '-hide_banner', '-loglevel', 'error', '-nostdin', '-i', 'pipe:0']
+    command += output_args + ['pipe:1']
+    try:
+        result = subprocess.run(command, input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                timeout=timeout, check=False)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise AudioDecodeError(f"ffmpeg could not be run: {e}")
+    if result.returncode != 0 or not result.stdout:
+        message = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise AudioDecodeError(message[-1] if message else f"ffmpeg exited with code {result.returncode}")
+    return result.stdout
+
+
+# ffmpeg output settings for the formats clips can be re-encoded to
+ENCODE_FORMATS = {
+    'ogg': ['-f', 'ogg', '-acodec', 'libopus', '-b:a', '48k'],
+    'mp3': ['-f', 'mp3', '-acodec', 'libmp3lame', '-b:a', '64k'],
+}
+
+
+def encode_audio(data, audio_format, ffmpeg_binary='ffmpeg', timeout=120):
+    """Re-encode audio bytes (e.g. a rendered WAV clip) to ogg or mp3 through ffmpeg pipes."""
+    if audio_format not in ENCODE_FORMATS:
+        raise ValueError(f"Unsupported audio format: {audio_format}")
+    return _run_ffmpeg(data, ENCODE_FORMATS[audio_format], ffmpeg_binary, timeout)
+
+
+def audio_mimetype(data):
+    """Guess the mimetype of an audio clip from its header."""
+    if data[:4] == b'RIFF':
+        return 'audio/wav'
+    if data[:4] == b'OggS':
+        return 'audio/ogg'
+    if data[:4] == b'FORM':
+        return 'audio/aiff'
+    if data[:3] == b'ID3' or data[:2] == b'\xff\xfb':
+        return 'audio/mpeg'
+    return 'application/octet-stream'
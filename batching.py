@@ -0,0 +1,86 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Collect items submitted concurrently from many threads and process them together.
+
+    A background thread waits for the first item, then keeps collecting for up to
+    max_wait_ms (or until max_batch_size items are queued) and hands the whole list to
+    process_batch, which must return one result per item in the same order. Each
+    caller gets its own result back through a Future.
+    """
+
+    def __init__(self, process_batch, max_batch_size=16, max_wait_ms=10, name='micro-batcher'):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def submit(self, item):
+        """Queue one item and return a Future for its result."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def map(self, items, timeout=None):
+        """Process a list of items (possibly batched with other callers) and return their results."""
+        futures = [self.submit(item) for item in items]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Past the deadline, still take whatever is already waiting
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name}: expected {len(items)} results, got {len(results)}")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000
+        }
@@ -0,0 +1,119 @@
+"""
+Login throughput under concurrent load: connection per request vs. the pool.
+
+Seeds a scratch database with users, then runs the login lookup from many threads
+at once (with a share of signups mixed in as writes). The "per-request" mode
+opens a default rollback-journal connection for every request, as the auth
+endpoints used to; the "pooled" mode uses database.ConnectionPool with WAL.
+Password hashing is left out so the numbers reflect the database layer.
+
+    python benchmarks/bench_login.py [--threads 16] [--requests 4000] [--write-ratio 0.05] [--json]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+def seed(path, users):
+    conn = sqlite3.connect(path)
+    database.init_schema(conn)
+    conn.executemany(database.SQL_INSERT_USER,
+                     ((f'user{i}', f'user{i}@example.com', 'x' * 100) for i in range(users)))
+    conn.commit()
+    conn.close()
+
+
+def per_request_connection(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def run(mode, path, args):
+    pool = database.ConnectionPool(path, size=args.pool_size) if mode == 'pooled' else None
+    counter = itertools.count()
+    errors = []
+    errors_lock = threading.Lock()
+    latencies = []
+
+    def request(i):
+        rng = random.Random(i)
+        started = time.perf_counter()
+        conn = pool.acquire() if pool else per_request_connection(path)
+        try:
+            if rng.random() < args.write_ratio:
+                n = next(counter)
+                email = f'{mode}{n}@example.com'
+                if not database.find_existing_user(conn, email, f'{mode}{n}'):
+                    database.create_user(conn, f'{mode}{n}', email, 'x' * 100)
+            else:
+                database.find_user_by_email(conn, f'user{rng.randrange(args.users)}@example.com')
+        except sqlite3.OperationalError as e:
+            with errors_lock:
+                errors.append(str(e))
+        finally:
+            if pool:
+                pool.release(conn)
+            else:
+                conn.close()
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(request, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    if pool:
+        pool.close()
+
+    latencies.sort()
+    return {
+        'mode': mode,
+        'requests_per_second': round(args.requests / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        'errors': len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--write-ratio', type=float, default=0.05, help='fraction of requests that sign up')
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    for mode in ('per-request', 'pooled'):
+        # Fresh database per mode, so WAL from the pooled run doesn't leak into the baseline
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.db')
+            seed(path, args.users)
+            results.append(run(mode, path, args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':>12} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for row in results:
+            print(f"{row['mode']:>12} {row['requests_per_second']:>10.1f} {row['p50_ms']:>8.3f} "
+                  f"{row['p99_ms']:>8.3f} {row['errors']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
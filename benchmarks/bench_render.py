@@ -0,0 +1,71 @@
+"""
+Cold vs warm document render latency.
+
+Cold: a fresh DocumentRenderer (styles and DOCX template not built yet, empty cache).
+Warm: the same renderer exporting the same transcript again (memoized).
+
+    python benchmarks/bench_render.py [--repeat 5] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_renderer import DocumentRenderer, reportlab_available, docx_available
+
+SENTENCE = "The quarterly review covered the product roadmap, hiring plans and the migration timeline. "
+# Roughly 450 words fit on one letter-size page with the export styles
+PAGE_TEXT = "\n".join(SENTENCE * 5 for _ in range(6))
+
+
+def transcript(pages):
+    return "\n".join(PAGE_TEXT for _ in range(pages))
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 200])
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    formats = [fmt for fmt, ok in (('pdf', reportlab_available), ('docx', docx_available)) if ok]
+    if not formats:
+        print("Neither ReportLab nor python-docx is installed; nothing to benchmark.")
+        return 1
+
+    results = []
+    for pages in args.pages:
+        text = transcript(pages)
+        for fmt in formats:
+            cold = measure(lambda: DocumentRenderer().render(text, fmt), args.repeat)
+            renderer = DocumentRenderer()
+            renderer.render(text, fmt)
+            warm = measure(lambda: renderer.render(text, fmt), args.repeat)
+            results.append({'pages': pages, 'format': fmt, 'cold_ms': round(cold * 1000, 3),
+                            'warm_ms': round(warm * 1000, 3), 'speedup': round(cold / warm, 1) if warm else None})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'pages':>6} {'format':>6} {'cold ms':>10} {'warm ms':>10} {'speedup':>9}")
+        for row in results:
+            print(f"{row['pages']:>6} {row['format']:>6} {row['cold_ms']:>10.2f} {row['warm_ms']:>10.3f} {row['speedup']:>8}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
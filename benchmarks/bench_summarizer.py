@@ -0,0 +1,66 @@
+"""
+Summarizer latency versus transcript length.
+
+Generates synthetic transcripts of increasing size and reports the time per
+1k words, which should stay roughly flat (linear scaling).
+
+    python benchmarks/bench_summarizer.py [--words 5000 10000 50000 100000] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summarizer import summarize
+
+VOCABULARY = ("budget roadmap hiring migration customer release quality latency storage pricing "
+              "contract vendor security audit launch feedback support training analytics forecast "
+              "design review deadline priority network database interface revenue growth region").split()
+FILLER = "the a and of to in for with on is was we they this that".split()
+
+
+def transcript(words, seed=0):
+    rng = random.Random(seed)
+    sentences, count = [], 0
+    while count < words:
+        length = rng.randint(6, 24)
+        tokens = [rng.choice(VOCABULARY) if rng.random() < 0.5 else rng.choice(FILLER) for _ in range(length)]
+        sentences.append(" ".join(tokens).capitalize() + rng.choice(".!?.."))
+        count += length
+    return " ".join(sentences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, nargs='+', default=[5000, 10000, 25000, 50000, 100000])
+    parser.add_argument('--ratio', type=float, default=None, help='summary ratio (default: 3 sentences)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    for words in args.words:
+        text = transcript(words)
+        best = float('inf')
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            summarize(text, ratio=args.ratio)
+            best = min(best, time.perf_counter() - started)
+        results.append({'words': words, 'ms': round(best * 1000, 2),
+                        'ms_per_1k_words': round(best * 1000 / (words / 1000), 3)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'words':>8} {'ms':>10} {'ms/1k words':>12}")
+        for row in results:
+            print(f"{row['words']:>8} {row['ms']:>10.2f} {row['ms_per_1k_words']:>12.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Transcription accuracy and speed per language and recognition backend.
+
+Runs SpeechTranslator.transcribe_audio_file end to end over a corpus of recordings
+with reference transcripts, and reports per (backend, language): word error rate
+(jiwer, over the whole group), real-time factor (processing time / audio time),
+p50/p95/p99 latency per clip and the peak RSS of the process that ran the group.
+Every group runs in a fresh process, so peak RSS includes loading its model.
+
+The corpus is a manifest, with audio paths relative to it:
+
+    {"clips": [{"audio": "en/0001.wav", "language": "en-US", "text": "reference transcript"},
+               {"audio": "hi/0001.wav", "language": "hi-IN", "text": "..."}]}
+
+By default it runs offline: the recognizer stand-in (recognizer_standin.py) is started
+in-process on the same corpus and the 'standin' backend is measured. Keep the corpus
+as 16 kHz mono WAV so the stand-in can match requests to clips exactly.
+
+The default corpus lives in benchmarks/corpus/ and is generated, not checked in: when
+its manifest is missing it is built with make_corpus.py (synthetic clips for every
+app language). Run make_corpus.py --engine tts for real speech to measure the google,
+vosk or whisper backends, or point --corpus at a recorded corpus.
+
+    python benchmarks/bench_transcription.py [--corpus benchmarks/corpus/manifest.json]
+        [--backends standin google vosk whisper] [--languages en-US hi-IN] [--repeat 1]
+        [--vad] [--standin-latency-ms 150] [--standin-error-rate 0]
+        [--vosk-model en=/models/vosk-en] [--whisper-model base]
+        [--json] [--out results.json] [--compare previous.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognizer_standin import load_manifest, read_clip, start_server
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'manifest.json')
+
+
+def normalize(text):
+    """Lowercase, drop punctuation (but not combining marks), collapse whitespace."""
+    text = ''.join(ch for ch in (text or '').lower() if not unicodedata.category(ch).startswith('P'))
+    return ' '.join(text.split())
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a non-empty list (q in 0-100)."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def build_backend(name, options):
+    """The RecognitionBackend list for a backend name; Google is built into SpeechTranslator."""
+    from recognition_backends import GoogleBackend, VoskBackend, WhisperBackend, parse_model_paths
+    if name == 'standin':
+        return [GoogleBackend(endpoint=options['standin_url'], name='standin')]
+    if name == 'vosk':
+        return [VoskBackend(parse_model_paths(options['vosk_model']))]
+    if name == 'whisper':
+        return [WhisperBackend(options['whisper_model'])]
+    return []
+
+
+def run_group(backend, clips, options):
+    """Transcribe every clip of one (backend, language) group; runs in its own process."""
+    # Keep the transcriber's progress output off stdout, where the results go
+    sys.stdout = sys.stderr
+    from speech_translator import SpeechTranslator
+    vad = None
+    if options['vad']:
+        from vad import VoiceActivityDetector
+        vad = VoiceActivityDetector()
+    translator = SpeechTranslator(vad=vad, backends=build_backend(backend, options), default_backend=backend)
+
+    samples = []
+    for clip in clips:
+        for _ in range(options['repeat']):
+            details = {}
+            started = time.perf_counter()
+            try:
+                hypothesis = translator.transcribe_audio_file(clip['audio'], language=clip['language'],
+                                                              details=details, backend=backend)
+                error = None
+            except Exception as e:
+                hypothesis, error = None, str(e)
+            samples.append({'audio': clip['audio'], 'seconds': time.perf_counter() - started,
+                            'hypothesis': hypothesis, 'error': error})
+    # ru_maxrss is in kilobytes on Linux
+    return samples, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def summarize_group(backend, language, clips, samples, peak_rss):
+    from jiwer import wer
+    references = {clip['audio']: normalize(clip['text']) for clip in clips}
+    durations = {clip['audio']: clip['audio_seconds'] for clip in clips}
+    scored = [(references[s['audio']], normalize(s['hypothesis'])) for s in samples if references[s['audio']]]
+    latencies = [s['seconds'] for s in samples]
+    audio_seconds = sum(durations[s['audio']] for s in samples)
+    return {
+        'backend': backend,
+        'language': language,
+        'clips': len(clips),
+        'runs': len(samples),
+        'failures': sum(1 for s in samples if s['hypothesis'] is None),
+        'audio_seconds': round(audio_seconds, 3),
+        'wer': round(wer([r for r, _ in scored], [h for _, h in scored]), 4) if scored else None,
+        'rtf': round(sum(latencies) / audio_seconds, 4) if audio_seconds else None,
+        'latency_ms': {f'p{q}': round(percentile(latencies, q) * 1000, 1) for q in (50, 95, 99)},
+        'peak_rss_mb': round(peak_rss / (1024 * 1024), 1)
+    }
+
+
+def compare(results, previous):
+    """Attach the change against a previous run's JSON to each matching group."""
+    before = {(row['backend'], row['language']): row for row in previous.get('results', [])}
+    for row in results:
+        old = before.get((row['backend'], row['language']))
+        if not old:
+            continue
+        row['delta'] = {
+            'wer': round(row['wer'] - old['wer'], 4) if None not in (row['wer'], old['wer']) else None,
+            'rtf': round(row['rtf'] - old['rtf'], 4) if None not in (row['rtf'], old['rtf']) else None,
+            'p95_ms': round(row['latency_ms']['p95'] - old['latency_ms']['p95'], 1),
+            'peak_rss_mb': round(row['peak_rss_mb'] - old['peak_rss_mb'], 1)
+        }
+
+
+def signed(value):
+    return f"{value:+}" if value is not None else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='corpus manifest.json')
+    parser.add_argument('--backends', nargs='+', default=['standin'],
+                        choices=['standin', 'google', 'vosk', 'whisper'])
+    parser.add_argument('--languages', nargs='+', help='only these manifest languages')
+    parser.add_argument('--repeat', type=int, default=1, help='transcriptions per clip')
+    parser.add_argument('--vad', action='store_true', help='trim non-speech before recognition')
+    parser.add_argument('--standin-url', help='use a running stand-in instead of starting one')
+    parser.add_argument('--standin-latency-ms', type=float, default=0)
+    parser.add_argument('--standin-latency-per-second-ms', type=float, default=0)
+    parser.add_argument('--standin-error-rate', type=float, default=0.0)
+    parser.add_argument('--vosk-model', default=os.environ.get('AUDIOFY_VOSK_MODEL'))
+    parser.add_argument('--whisper-model', default=os.environ.get('AUDIOFY_WHISPER_MODEL', 'base'))
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--out', help='also write the JSON results to this file')
+    parser.add_argument('--compare', help='JSON results of a previous run to report changes against')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        if os.path.abspath(args.corpus) != DEFAULT_CORPUS:
+            print(f"Corpus manifest not found: {args.corpus}")
+            return 1
+        from make_corpus import build_corpus
+        build_corpus(os.path.dirname(DEFAULT_CORPUS))
+        print(f"Built the synthetic corpus in {os.path.relpath(os.path.dirname(DEFAULT_CORPUS))}", file=sys.stderr)
+    if 'vosk' in args.backends and not args.vosk_model:
+        print("The vosk backend needs --vosk-model (or AUDIOFY_VOSK_MODEL).")
+        return 1
+
+    clips = load_manifest(args.corpus)
+    if args.languages:
+        clips = [clip for clip in clips if clip['language'] in args.languages]
+    for clip in clips:
+        pcm, sample_rate = read_clip(clip['audio'])
+        clip['audio_seconds'] = len(pcm) / 2 / sample_rate
+    languages = sorted({clip['language'] for clip in clips})
+
+    standin_url = args.standin_url
+    if 'standin' in args.backends and not standin_url:
+        _, standin_url = start_server(args.corpus, latency_ms=args.standin_latency_ms,
+                                      latency_per_second_ms=args.standin_latency_per_second_ms,
+                                      error_rate=args.standin_error_rate, seed=0)
+    options = {'vad': args.vad, 'repeat': args.repeat, 'standin_url': standin_url,
+               'vosk_model': args.vosk_model, 'whisper_model': args.whisper_model}
+
+    # A fresh (spawned, not forked) process per group keeps peak RSS per group honest
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for backend in args.backends:
+        for language in languages:
+            group = [clip for clip in clips if clip['language'] == language]
+            with context.Pool(1) as pool:
+                samples, peak_rss = pool.apply(run_group, (backend, group, options))
+            results.append(summarize_group(backend, language, group, samples, peak_rss))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+    report = {
+        'corpus': os.path.relpath(args.corpus),
+        'clips': len(clips),
+        'options': {'repeat': args.repeat, 'vad': args.vad, 'standin_latency_ms': args.standin_latency_ms,
+                    'standin_error_rate': args.standin_error_rate},
+        'python': platform.python_version(),
+        'results': results
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print(f"{'backend':>8} {'language':>9} {'clips':>6} {'WER':>7} {'RTF':>7} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'RSS MB':>7} {'failed':>6}")
+        for row in results:
+            wer_text = f"{row['wer']:.2%}" if row['wer'] is not None else '-'
+            rtf_text = f"{row['rtf']:.3f}" if row['rtf'] is not None else '-'
+            print(f"{row['backend']:>8} {row['language']:>9} {row['clips']:>6} {wer_text:>7} {rtf_text:>7} "
+                  f"{row['latency_ms']['p50']:>8.1f} {row['latency_ms']['p95']:>8.1f} {row['latency_ms']['p99']:>8.1f} "
+                  f"{row['peak_rss_mb']:>7.1f} {row['failures']:>6}")
+            if 'delta' in row:
+                delta = row['delta']
+                print(f"{'':>18} change: WER {signed(delta['wer'])}  RTF {signed(delta['rtf'])}  "
+                      f"p95 {signed(delta['p95_ms'])} ms  RSS {signed(delta['peak_rss_mb'])} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Build the transcription benchmark corpus: 16 kHz mono WAV clips with reference
+transcripts for every language the app recognizes, and their manifest.json.
+
+    python benchmarks/make_corpus.py [--out benchmarks/corpus] [--engine synthetic|tts]
+        [--languages en-US hi-IN] [--long-seconds 90] [--seed 0]
+
+The default 'synthetic' engine needs nothing but NumPy and works offline: every word
+becomes a burst of voiced, speech-band noise, with pauses between words and sentences.
+The audio is not intelligible, but it is unique per clip, so the recognizer stand-in
+(recognizer_standin.py) answers each clip with its reference text, and the benchmark
+measures the app's own decode, VAD, segmentation and recognition overhead.
+
+The 'tts' engine speaks the sentences with pyttsx3 (the app's text-to-speech) in each
+language a voice is installed for, which gives a real-speech corpus for the google,
+vosk and whisper backends; languages without a voice are skipped.
+
+--long-seconds adds one clip per language of about that length, made of the sentences
+repeated with pauses, so recordings past LONG_AUDIO_THRESHOLD_SECONDS take the segmented
+path. bench_transcription.py builds the default corpus with this script when it is missing.
+"""
+import argparse
+import audioop
+import io
+import json
+import os
+import sys
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+SAMPLE_RATE = 16000
+
+# Reference sentences per recognition locale (speech_translator.LANG_MAP)
+SENTENCES = {
+    'en-US': ["the quick brown fox jumps over the lazy dog",
+              "please translate this sentence into another language",
+              "the meeting has been moved to thursday afternoon"],
+    'hi-IN': ["मेरा नाम राम है और मैं दिल्ली में रहता हूँ",
+              "आज मौसम बहुत अच्छा है",
+              "कृपया मुझे स्टेशन का रास्ता बताइए"],
+    'es-ES': ["el perro corre en el parque",
+              "me gustaría una taza de café por favor",
+              "mañana vamos a visitar a mis abuelos"],
+    'fr-FR': ["le chat dort sur le canapé",
+              "nous allons au marché demain matin",
+              "pouvez-vous parler plus lentement s'il vous plaît"],
+    'de-DE': ["der hund spielt im garten",
+              "ich möchte heute abend ins kino gehen",
+              "der zug kommt in zehn minuten an"],
+    'it-IT': ["il treno parte alle otto",
+              "la cena è pronta in cucina",
+              "vorrei prenotare un tavolo per due persone"],
+    'ja-JP': ["今日はとても良い天気です",
+              "駅までの道を教えてください",
+              "明日の会議は午後三時からです"],
+    'ko-KR': ["오늘 날씨가 정말 좋네요",
+              "도서관은 몇 시에 문을 닫나요",
+              "저는 매일 아침 커피를 마셔요"],
+    'zh-CN': ["我每天早上喝一杯咖啡",
+              "请问火车站怎么走",
+              "这本书非常有意思"],
+    'ru-RU': ["сегодня очень хорошая погода",
+              "я люблю читать книги по вечерам",
+              "где находится ближайшая аптека"],
+    'ar-SA': ["أنا أحب تعلم اللغات الجديدة",
+              "الطقس جميل جدا اليوم",
+              "أين يقع أقرب مستشفى"]
+}
+
+# Scripts written without spaces get one burst per character instead of per word
+UNSPACED = ('ja-JP', 'zh-CN')
+
+
+def synthesize(text, language, rng):
+    """16-bit PCM of one burst of speech-band noise per word (or character), with pauses."""
+    units = list(text.replace(' ', '')) if language in UNSPACED else text.split()
+    pieces = [np.zeros(int(SAMPLE_RATE * 0.3), dtype=np.float32)]
+    for unit in units:
+        seconds = min(0.6, 0.12 + 0.05 * len(unit)) if language not in UNSPACED else 0.22
+        length = int(SAMPLE_RATE * seconds)
+        t = np.arange(length, dtype=np.float32) / SAMPLE_RATE
+        # A few harmonics of a random pitch, plus noise, under a smooth envelope
+        pitch = rng.uniform(100, 220)
+        burst = sum(np.sin(2 * np.pi * pitch * k * t + rng.uniform(0, 2 * np.pi)) / k for k in range(1, 6))
+        burst = burst + rng.normal(0, 0.4, length)
+        burst *= np.hanning(length) * rng.uniform(4000, 7000) / 2
+        pieces.append(burst.astype(np.float32))
+        pieces.append(np.zeros(int(SAMPLE_RATE * rng.uniform(0.06, 0.14)), dtype=np.float32))
+    pieces.append(np.zeros(int(SAMPLE_RATE * 0.3), dtype=np.float32))
+    return np.clip(np.concatenate(pieces), -32768, 32767).astype('<i2').tobytes()
+
+
+class Speaker:
+    """pyttsx3 voices by language, rendering to 16 kHz mono PCM."""
+
+    def __init__(self):
+        import pyttsx3
+        from tts_pool import build_voice_index
+        self.engine = pyttsx3.init()
+        self.voice_index = build_voice_index(self.engine.getProperty('voices'))
+
+    def voice_for(self, language):
+        code = language.split('-')[0]
+        if code == 'en':
+            return self.voice_index.get('default') or ''
+        return self.voice_index.get('zh-CN' if code == 'zh' else code)
+
+    def speak(self, text, language):
+        from tts_pool import render_to_bytes
+        data = render_to_bytes(self.engine, text, self.voice_for(language) or None, 150)
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            pcm = wav.readframes(wav.getnframes())
+            width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        if channels == 2:
+            pcm = audioop.tomono(pcm, width, 0.5, 0.5)
+        if width != 2:
+            pcm = audioop.lin2lin(pcm, width, 2)
+        if rate != SAMPLE_RATE:
+            pcm, _ = audioop.ratecv(pcm, 2, 1, rate, SAMPLE_RATE, None)
+        return pcm
+
+
+def write_wav(path, pcm):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+
+
+def build_corpus(out=DEFAULT_OUT, engine='synthetic', languages=None, long_seconds=0, seed=0):
+    """Write the clips and manifest.json under out; returns the manifest path."""
+    speaker = Speaker() if engine == 'tts' else None
+    clips = []
+    for language in languages or list(SENTENCES):
+        if speaker is not None and speaker.voice_for(language) is None:
+            print(f"No text-to-speech voice for {language}, skipped", file=sys.stderr)
+            continue
+        rng = np.random.default_rng([seed, list(SENTENCES).index(language)])
+        render = speaker.speak if speaker is not None else (lambda text, lang: synthesize(text, lang, rng))
+        directory = language.split('-')[0]
+        for number, text in enumerate(SENTENCES[language], 1):
+            pcm = render(text, language)
+            write_wav(os.path.join(out, directory, f"{number:04d}.wav"), pcm)
+            clips.append({'audio': f"{directory}/{number:04d}.wav", 'language': language, 'text': text})
+        if long_seconds:
+            # The sentences over and over, each followed by the kind of pause segmentation
+            # cuts at; synthetic repeats are rendered afresh, so they are distinct audio
+            texts, pieces, seconds = [], [], 0.0
+            while seconds < long_seconds:
+                text = SENTENCES[language][len(texts) % len(SENTENCES[language])]
+                pcm = render(text, language) + b'\0' * (SAMPLE_RATE * 2)
+                texts.append(text)
+                pieces.append(pcm)
+                seconds += len(pcm) / 2 / SAMPLE_RATE
+            number = len(SENTENCES[language]) + 1
+            write_wav(os.path.join(out, directory, f"{number:04d}.wav"), b''.join(pieces))
+            clips.append({'audio': f"{directory}/{number:04d}.wav", 'language': language, 'text': ' '.join(texts)})
+    manifest = os.path.join(out, 'manifest.json')
+    os.makedirs(out, exist_ok=True)
+    with open(manifest, 'w', encoding='utf-8') as f:
+        json.dump({'engine': engine, 'sample_rate': SAMPLE_RATE, 'clips': clips}, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', default=DEFAULT_OUT, help='corpus directory (manifest.json goes here)')
+    parser.add_argument('--engine', choices=['synthetic', 'tts'], default='synthetic')
+    parser.add_argument('--languages', nargs='+', choices=list(SENTENCES), help='only these locales')
+    parser.add_argument('--long-seconds', type=float, default=0, help='add one long clip per language')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = build_corpus(args.out, args.engine, args.languages, args.long_seconds, args.seed)
+    with open(manifest, encoding='utf-8') as f:
+        count = len(json.load(f)['clips'])
+    print(f"Wrote {count} clips and {os.path.relpath(manifest)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
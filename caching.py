@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import metrics
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """
+    Persistent, content-addressed cache of transcripts.
+
+    Entries are keyed by (SHA-256 of the audio bytes, recognition locale) and stored in
+    a small SQLite database. When the cache grows past max_entries or max_bytes the
+    least recently used entries are evicted. A name reports lookups to /metrics.
+    """
+
+    def __init__(self, db_path, max_entries=5000, max_bytes=50 * 1024 * 1024, name=None):
+        self.db_path = db_path
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    digest TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    segments TEXT,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (digest, locale)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_transcripts_last_used ON transcripts (last_used)')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def key_for_file(self, file_path, locale):
+        """Build the cache key for an audio file without decoding it."""
+        return hash_file(file_path), locale
+
+    def key_for_bytes(self, data, locale):
+        """Build the cache key for audio held in memory; matches key_for_file for the same bytes."""
+        return hashlib.sha256(data).hexdigest(), locale
+
+    def get(self, key):
+        """Return the cached entry as {'text', 'segments'}, or None on a miss."""
+        digest, locale = key
+        with self._lock, self._connect() as conn:
+            row = conn.execute('SELECT text, segments FROM transcripts WHERE digest = ? AND locale = ?',
+                               (digest, locale)).fetchone()
+            if self.name:
+                metrics.cache_lookup(self.name, row is not None)
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute('UPDATE transcripts SET last_used = ? WHERE digest = ? AND locale = ?',
+                         (time.time(), digest, locale))
+            self.hits += 1
+            return {'text': row['text'], 'segments': json.loads(row['segments']) if row['segments'] else []}
+
+    def put(self, key, text, segments=None):
+        digest, locale = key
+        segments_json = json.dumps(segments) if segments else None
+        size = len(text.encode('utf-8')) + len(segments_json or '')
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO transcripts (digest, locale, text, segments, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (digest, locale, text, segments_json, size, now, now))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Remove least recently used entries until both limits are satisfied."""
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = conn.execute('SELECT digest, locale, size FROM transcripts ORDER BY last_used ASC').fetchall()
+        for row in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM transcripts WHERE digest = ? AND locale = ?', (row['digest'], row['locale']))
+            count -= 1
+            total -= row['size']
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock, self._connect() as conn:
+            count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': count,
+            'bytes': total,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with hit/miss counters.
+
+    Bounded by max_entries and, when sizeof is given, by the total max_bytes
+    of the cached values. A name reports lookups to /metrics.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, sizeof=None, name=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            hit = key in self._data
+            if hit:
+                self._data.move_to_end(key)
+                self.hits += 1
+                value = self._data[key]
+            else:
+                self.misses += 1
+                value = default
+        if self.name:
+            metrics.cache_lookup(self.name, hit)
+        return value
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self.sizeof(self._data.pop(key)) if self.sizeof else 0
+            self._data[key] = value
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= self.sizeof(evicted) if self.sizeof else 0
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class DiskLRUCache:
+    """
+    Directory of cached binary blobs (e.g. rendered speech clips), one file per key.
+
+    Files are named by the SHA-256 of the key, and their modification time records the
+    last use. Once the directory holds more than max_bytes, the least recently used
+    files are deleted. A name reports lookups to /metrics.
+    """
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024, name=None):
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(entry.stat().st_size for entry in os.scandir(directory)
+                          if entry.is_file() and entry.name.endswith('.bin'))
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.bin')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Mark as recently used
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            if self.name:
+                metrics.cache_lookup(self.name, False)
+            return None
+        with self._lock:
+            self.hits += 1
+        if self.name:
+            metrics.cache_lookup(self.name, True)
+        return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._bytes += len(data) - previous
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until the directory fits in max_bytes. Caller holds the lock."""
+        entries = [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith('.bin')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        self._bytes = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
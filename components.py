@@ -0,0 +1,126 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Recorded at import so the report can show how long the process took to become ready
+PROCESS_START = time.time()
+
+
+# Fields of /proc/<pid>/smaps_rollup reported by process_memory(), in kB
+SMAPS_FIELDS = {
+    'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared_clean', 'Shared_Dirty': 'shared_dirty',
+    'Private_Clean': 'private_clean', 'Private_Dirty': 'private_dirty'
+}
+
+
+def process_memory(pid='self'):
+    """
+    Memory of a process in bytes. On Linux this includes PSS and the shared/private
+    split, which shows how much of a forked worker is still shared copy-on-write
+    with its parent. Elsewhere only the current process's peak RSS is available.
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            memory = {}
+            for line in f:
+                field, _, value = line.partition(':')
+                if field in SMAPS_FIELDS:
+                    memory[SMAPS_FIELDS[field]] = int(value.split()[0]) * 1024
+        memory['shared'] = memory.get('shared_clean', 0) + memory.get('shared_dirty', 0)
+        memory['private'] = memory.get('private_clean', 0) + memory.get('private_dirty', 0)
+        return memory
+    except OSError:
+        pass
+    if pid != 'self' and pid != os.getpid():
+        return {}
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return {'peak_rss': peak if sys.platform == 'darwin' else peak * 1024}
+    except ImportError:
+        return {}
+
+
+class ComponentRegistry:
+    """
+    Registry of heavy dependencies (models, engines, external tool paths) that are
+    loaded on first use instead of at import time.
+
+    Each component is registered with a zero-argument loader. get() runs the loader
+    once, thread-safely, and records how long it took, so the startup report can
+    show the cost of every component separately.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._instances = {}
+        self._timings = {}
+        self._errors = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, description=''):
+        with self._lock:
+            self._loaders[name] = (loader, description)
+            self._locks[name] = threading.Lock()
+
+    def names(self):
+        return list(self._loaders)
+
+    def is_loaded(self, name):
+        return name in self._instances
+
+    def get(self, name):
+        """Return the component, loading it on first use."""
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown component: {name}")
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+            loader, _ = self._loaders[name]
+            started = time.perf_counter()
+            try:
+                instance = loader()
+            except Exception as e:
+                self._errors[name] = str(e)
+                logger.error(f"Failed to load component '{name}': {e}")
+                raise
+            self._timings[name] = time.perf_counter() - started
+            self._errors.pop(name, None)
+            self._instances[name] = instance
+            logger.info(f"Loaded component '{name}' in {self._timings[name]:.2f}s")
+            return instance
+
+    def warm_up(self, names=None):
+        """Load the given components (all registered ones by default) and return the report."""
+        for name in names or self.names():
+            try:
+                self.get(name)
+            except Exception:
+                # Already logged and recorded in the report
+                pass
+        return self.report()
+
+    def report(self):
+        components = {}
+        for name, (_, description) in self._loaders.items():
+            components[name] = {
+                'description': description,
+                'loaded': name in self._instances,
+                'load_seconds': round(self._timings[name], 4) if name in self._timings else None,
+                'error': self._errors.get(name)
+            }
+        return {
+            'components': components,
+            'total_load_seconds': round(sum(self._timings.values()), 4),
+            'uptime_seconds': round(time.time() - PROCESS_START, 2),
+            'pid': os.getpid(),
+            'memory': process_memory()
+        }
@@ -1439,7 +1439,7 @@ document.addEventListener("DOMContentLoaded", () => {
       return;
     }
 
-    // Call the backend API to play the translation
+    // Ask the backend to render the translation and play it in the browser
     fetch("/api/speak", {
       method: "POST",
       headers: {
@@ -1448,16 +1448,22 @@ document.addEventListener("DOMContentLoaded", () => {
       body: JSON.stringify({
         text: translatedText,
         language: targetLanguage,
+        mode: "render",
       }),
     })
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.success) {
-          console.log("Text spoken successfully.");
-        } else {
-          console.error("Error speaking text:", data.error);
-          alert("Error: " + data.error);
+      .then((response) => {
+        if (!response.ok) {
+          return response.json().then((data) => {
+            throw new Error(data.error || "Speech synthesis failed")
+          })
         }
+        return response.blob()
+      })
+      .then((blob) => {
+        const audioUrl = URL.createObjectURL(blob)
+        const audio = new Audio(audioUrl)
+        audio.addEventListener("ended", () => URL.revokeObjectURL(audioUrl))
+        return audio.play()
       })
       .catch((error) => {
         console.error("Error calling /api/speak:", error);
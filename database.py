@@ -0,0 +1,292 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Statements reused by the auth endpoints. sqlite3 keeps compiled statements in a
+# per-connection cache keyed by SQL text, so pooled connections prepare each once.
+SQL_FIND_USER_BY_EMAIL = 'SELECT * FROM users WHERE email = ?'
+SQL_FIND_EXISTING_USER = 'SELECT id FROM users WHERE email = ? OR username = ?'
+SQL_INSERT_USER = 'INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)'
+
+# History pages are keyset-paginated on (created_at, id), newest first, so each page is
+# an index range read no matter how deep the user scrolls.
+HISTORY_COLUMNS = ('id, kind, created_at, src_lang, dest_lang, filename, transcript, '
+                   'translation, tone, summary, stats')
+SQL_INSERT_HISTORY = '''
+    INSERT INTO history (user_id, kind, created_at, src_lang, dest_lang, filename,
+                         transcript, translation, tone, summary, stats)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_LIST_HISTORY = f'''
+    SELECT {HISTORY_COLUMNS} FROM history
+    WHERE user_id = ? AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC LIMIT ?
+'''
+# The FTS index carries user_id as a column, so the MATCH itself is limited to one user's
+# rows (see search_query); the join only fetches the page
+SQL_SEARCH_HISTORY = f'''
+    SELECT {', '.join('h.' + column for column in HISTORY_COLUMNS.split(', '))}
+    FROM history_fts JOIN history h ON h.id = history_fts.rowid
+    WHERE history_fts MATCH ? AND history_fts.rowid < ? AND h.user_id = ?
+    ORDER BY history_fts.rowid DESC LIMIT ?
+'''
+SQL_HISTORY_FTS_COLUMNS = 'SELECT name FROM pragma_table_info(\'history_fts\')'
+SQL_REBUILD_HISTORY_FTS = "INSERT INTO history_fts (history_fts) VALUES ('rebuild')"
+SQL_DELETE_HISTORY = 'DELETE FROM history WHERE id = ? AND user_id = ?'
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        kind TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        src_lang TEXT,
+        dest_lang TEXT,
+        filename TEXT,
+        transcript TEXT NOT NULL DEFAULT '',
+        translation TEXT NOT NULL DEFAULT '',
+        tone TEXT,
+        summary TEXT NOT NULL DEFAULT '',
+        stats TEXT
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_history_user_time ON history (user_id, created_at DESC, id DESC)',
+    # Full-text index over the history text, kept in sync by triggers (external content table).
+    # user_id is indexed too, as a token, so searches match within one user's rows
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+        user_id, transcript, translation, summary, content='history', content_rowid='id'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+        INSERT INTO history_fts (rowid, user_id, transcript, translation, summary)
+        VALUES (new.id, new.user_id, new.transcript, new.translation, new.summary);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, user_id, transcript, translation, summary)
+        VALUES ('delete', old.id, old.user_id, old.transcript, old.translation, old.summary);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS history_au AFTER UPDATE ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, user_id, transcript, translation, summary)
+        VALUES ('delete', old.id, old.user_id, old.transcript, old.translation, old.summary);
+        INSERT INTO history_fts (rowid, user_id, transcript, translation, summary)
+        VALUES (new.id, new.user_id, new.transcript, new.translation, new.summary);
+    END
+    '''
+]
+
+# Objects replaced when an older database's history_fts lacks the user_id column
+HISTORY_FTS_OBJECTS = [
+    'DROP TRIGGER IF EXISTS history_ai',
+    'DROP TRIGGER IF EXISTS history_ad',
+    'DROP TRIGGER IF EXISTS history_au',
+    'DROP TABLE IF EXISTS history_fts'
+]
+
+
+def connect(path, busy_timeout_ms=5000):
+    """Open a connection tuned for concurrent web requests."""
+    conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, check_same_thread=False,
+                           cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    # WAL lets readers proceed while a writer commits; NORMAL sync is durable enough with WAL
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={int(busy_timeout_ms)}')
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections.
+
+    Connections are opened lazily up to size and then reused, keeping their
+    statement caches warm. acquire() blocks for up to timeout seconds when every
+    connection is checked out.
+    """
+
+    def __init__(self, path, size=8, busy_timeout_ms=5000, timeout=10.0):
+        self.path = path
+        self.size = size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.timeout = timeout
+        self._reset()
+        # SQLite connections must not cross fork(); a pre-forking server's workers start empty
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # Inherited connections are dropped, not closed, so the parent's stay intact
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return connect(self.path, self.busy_timeout_ms)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise RuntimeError('Timed out waiting for a database connection')
+
+    def release(self, conn):
+        # Never hand an open transaction to the next user
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+
+
+def init_schema(conn):
+    columns = [row[0] for row in conn.execute(SQL_HISTORY_FTS_COLUMNS)]
+    outdated = bool(columns) and 'user_id' not in columns
+    if outdated:
+        for statement in HISTORY_FTS_OBJECTS:
+            conn.execute(statement)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    if outdated:
+        # Re-index the existing history from the content table
+        conn.execute(SQL_REBUILD_HISTORY_FTS)
+    conn.commit()
+
+
+def find_user_by_email(conn, email):
+    return conn.execute(SQL_FIND_USER_BY_EMAIL, (email,)).fetchone()
+
+
+def find_existing_user(conn, email, username):
+    return conn.execute(SQL_FIND_EXISTING_USER, (email, username)).fetchone()
+
+
+def create_user(conn, username, email, password_hash):
+    """Insert a user and return the new id."""
+    cursor = conn.execute(SQL_INSERT_USER, (username, email, password_hash))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def add_history(conn, user_id, kind, src_lang=None, dest_lang=None, filename=None, transcript='',
+                translation='', tone=None, summary='', stats=None):
+    """Save one processed item (transcription, translation, tone or summary) and return its id."""
+    cursor = conn.execute(SQL_INSERT_HISTORY, (
+        user_id, kind, time.time(), src_lang, dest_lang, filename, transcript or '',
+        translation or '', tone, summary or '', json.dumps(stats) if stats else None
+    ))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def _history_item(row):
+    item = dict(row)
+    item['stats'] = json.loads(item['stats']) if item['stats'] else None
+    return item
+
+
+def encode_cursor(item):
+    return f"{item['created_at']!r}:{item['id']}"
+
+
+def decode_cursor(cursor):
+    """Parse a list cursor into (created_at, id); raises ValueError if it is malformed."""
+    created_at, _, item_id = cursor.partition(':')
+    return float(created_at), int(item_id)
+
+
+def list_history(conn, user_id, limit=20, cursor=None):
+    """
+    One page of a user's history, newest first.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    created_at, item_id = decode_cursor(cursor) if cursor else (float('inf'), 0)
+    rows = conn.execute(SQL_LIST_HISTORY, (user_id, created_at, item_id, limit + 1)).fetchall()
+    items = [_history_item(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    terms = text.split()
+    return ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def search_query(user_id, text):
+    """The FTS5 query for text in one user's transcripts, translations and summaries ('' for no words)."""
+    query = fts_query(text)
+    if not query:
+        return ''
+    return f'user_id : "{int(user_id)}" AND {{transcript translation summary}} : ({query})'
+
+
+def search_history(conn, user_id, text, limit=20, cursor=None):
+    """
+    Full-text search over a user's transcripts, translations and summaries, newest first.
+    Returns (items, next_cursor) like list_history; here the cursor is the last item id.
+    """
+    query = search_query(user_id, text)
+    if not query:
+        return [], None
+    before = int(cursor) if cursor else 2 ** 63 - 1
+    rows = conn.execute(SQL_SEARCH_HISTORY, (query, before, user_id, limit + 1)).fetchall()
+    items = [_history_item(row) for row in rows[:limit]]
+    next_cursor = str(items[-1]['id']) if len(rows) > limit else None
+    return items, next_cursor
+
+
+def delete_history(conn, user_id, item_id):
+    """Delete one of a user's history items; returns False if it doesn't exist."""
+    deleted = conn.execute(SQL_DELETE_HISTORY, (item_id, user_id)).rowcount
+    conn.commit()
+    return deleted > 0
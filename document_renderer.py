@@ -0,0 +1,165 @@
+import hashlib
+import io
+import logging
+import threading
+from datetime import datetime
+
+import metrics
+from caching import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Try to import document generation libraries
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    reportlab_available = True
+    logger.info("ReportLab (PDF generation) loaded successfully")
+except ImportError as e:
+    logger.error(f"Error importing ReportLab: {e}")
+    reportlab_available = False
+
+try:
+    import docx
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.style import WD_STYLE_TYPE
+    docx_available = True
+    logger.info("python-docx (DOCX generation) loaded successfully")
+except ImportError as e:
+    logger.error(f"Error importing python-docx: {e}")
+    docx_available = False
+
+# Document templates: the title printed at the top of each export
+TEMPLATES = {
+    'default': {'title': 'Speech Recognition Results'}
+}
+
+MIMETYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+
+class DocumentRenderer:
+    """
+    Renders transcripts to PDF and DOCX.
+
+    ReportLab styles and the base DOCX template are built once per process and
+    shared by every render. Finished documents are memoized by (text hash, format,
+    template) in a byte-bounded LRU cache, so exporting the same transcript again
+    is served from memory (including its original "Generated on" timestamp).
+    """
+
+    def __init__(self, cache_bytes=64 * 1024 * 1024):
+        self.cache = LRUCache(max_entries=1024, max_bytes=cache_bytes, sizeof=len, name='documents')
+        self._pdf_styles = None
+        self._docx_template = None
+        self._lock = threading.Lock()
+
+    def _get_pdf_styles(self):
+        if self._pdf_styles is None:
+            with self._lock:
+                if self._pdf_styles is None:
+                    styles = getSampleStyleSheet()
+                    self._pdf_styles = {
+                        'title': ParagraphStyle(
+                            'Title',
+                            parent=styles['Heading1'],
+                            alignment=TA_CENTER,
+                            spaceAfter=12
+                        ),
+                        'body': ParagraphStyle(
+                            'Body',
+                            parent=styles['Normal'],
+                            fontSize=10,
+                            leading=14
+                        ),
+                        'italic': styles['Italic']
+                    }
+        return self._pdf_styles
+
+    def _get_docx_template(self):
+        """Bytes of the base DOCX (with our styles), so each render skips rebuilding it."""
+        if self._docx_template is None:
+            with self._lock:
+                if self._docx_template is None:
+                    template = docx.Document()
+                    # The package default has no 'Italic' paragraph style for the timestamp line
+                    italic = template.styles.add_style('Italic', WD_STYLE_TYPE.PARAGRAPH)
+                    italic.base_style = template.styles['Normal']
+                    italic.font.italic = True
+                    buffer = io.BytesIO()
+                    template.save(buffer)
+                    self._docx_template = buffer.getvalue()
+        return self._docx_template
+
+    def render(self, text, fmt, template='default'):
+        """Return the document bytes for text in the given format ('pdf' or 'docx')."""
+        if fmt not in MIMETYPES:
+            raise ValueError(f"Unsupported document format: {fmt}")
+        if template not in TEMPLATES:
+            raise ValueError(f"Unknown document template: {template}")
+
+        key = (hashlib.sha256(text.encode('utf-8')).hexdigest(), fmt, template)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with metrics.stage('export'):
+            if fmt == 'pdf':
+                document = self.render_pdf(text, TEMPLATES[template])
+            else:
+                document = self.render_docx(text, TEMPLATES[template])
+        self.cache.put(key, document)
+        return document
+
+    def render_pdf(self, text, template):
+        if not reportlab_available:
+            raise RuntimeError('PDF generation module not available')
+        styles = self._get_pdf_styles()
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+
+        # Create the content
+        content = []
+        content.append(Paragraph(template['title'], styles['title']))
+        content.append(Spacer(1, 12))
+
+        # Add timestamp
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        content.append(Paragraph(f"Generated on: {timestamp}", styles['italic']))
+        content.append(Spacer(1, 12))
+
+        # Add the text content
+        for para in text.split('\n'):
+            if para.strip():
+                content.append(Paragraph(para, styles['body']))
+                content.append(Spacer(1, 6))
+
+        doc.build(content)
+        return buffer.getvalue()
+
+    def render_docx(self, text, template):
+        if not docx_available:
+            raise RuntimeError('DOCX generation module not available')
+        document = docx.Document(io.BytesIO(self._get_docx_template()))
+
+        # Add title
+        title = document.add_heading(template['title'], level=1)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Add timestamp
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp_para = document.add_paragraph(f"Generated on: {timestamp}")
+        timestamp_para.style = 'Italic'
+
+        # Add the text content
+        for para in text.split('\n'):
+            if para.strip():
+                document.add_paragraph(para)
+
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
@@ -17,6 +17,7 @@ export default function AudioDashboard({ user, onOpenAuth }) {
 
   const mediaRecorderRef = useRef(null);
   const audioChunksRef = useRef([]);
+  const streamingRef = useRef(null);
 
   // Water Droplets Neon Effect
   useEffect(() => {
@@ -90,10 +91,99 @@ export default function AudioDashboard({ user, onOpenAuth }) {
     };
   }, []);
 
-  // Handle Speech Recognition via Web Speech API or Audio Stream recording
+  // Live recognition: stream microphone PCM to the server over a WebSocket and show
+  // partial/final transcripts as each utterance is recognized. Resolves false if the
+  // server can't stream, so the caller can fall back to record-and-upload.
+  const startStreaming = (stream) => new Promise((resolve) => {
+    const AudioCtx = window.AudioContext || window.webkitAudioContext;
+    if (!window.WebSocket || !AudioCtx) {
+      resolve(false);
+      return;
+    }
+    const audioContext = new AudioCtx();
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const ws = new WebSocket(
+      `${protocol}://${window.location.host}/api/stream-recognize` +
+      `?language=${encodeURIComponent(language)}&sample_rate=${audioContext.sampleRate}`
+    );
+    ws.binaryType = 'arraybuffer';
+    let started = false;
+    let finalText = '';
+
+    const fail = () => {
+      if (!started) {
+        audioContext.close();
+        resolve(false);
+      }
+    };
+
+    ws.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'ready') {
+        // ScriptProcessor hands us Float32 samples; convert to 16-bit PCM for the server
+        const source = audioContext.createMediaStreamSource(stream);
+        const processor = audioContext.createScriptProcessor(4096, 1, 1);
+        processor.onaudioprocess = (e) => {
+          if (ws.readyState !== WebSocket.OPEN) return;
+          const input = e.inputBuffer.getChannelData(0);
+          const pcm = new Int16Array(input.length);
+          for (let i = 0; i < input.length; i++) {
+            const sample = Math.max(-1, Math.min(1, input[i]));
+            pcm[i] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+          }
+          ws.send(pcm.buffer);
+        };
+        source.connect(processor);
+        processor.connect(audioContext.destination);
+        streamingRef.current = { ws, audioContext, source, processor, stream };
+        started = true;
+        resolve(true);
+      } else if (message.type === 'partial') {
+        setTranscription(`${finalText} ${message.text}`.trim());
+      } else if (message.type === 'final') {
+        finalText = `${finalText} ${message.text}`.trim();
+        setTranscription(finalText);
+      } else if (message.type === 'done') {
+        setStatusText(finalText ? 'Transcription complete!' : 'No speech was detected. Please try again.');
+        setLoading(false);
+        ws.close();
+      } else if (message.type === 'error') {
+        console.error('Streaming recognition error:', message.error);
+        if (started) setStatusText(message.error);
+        fail();
+      }
+    };
+    ws.onerror = fail;
+    ws.onclose = () => {
+      if (started) setLoading(false);
+      fail();
+    };
+  });
+
+  const stopStreaming = () => {
+    const { ws, audioContext, source, processor, stream } = streamingRef.current;
+    streamingRef.current = null;
+    processor.disconnect();
+    source.disconnect();
+    stream.getTracks().forEach((track) => track.stop());
+    audioContext.close();
+    if (ws.readyState === WebSocket.OPEN) {
+      setLoading(true);
+      ws.send(JSON.stringify({ type: 'stop' }));
+    }
+  };
+
+  // Handle Speech Recognition via live streaming, or Audio Stream recording as a fallback
   const startRecording = async () => {
     try {
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+      setTranscription('');
+      if (await startStreaming(stream)) {
+        setIsRecording(true);
+        setStatusText('Listening... transcript updates as you speak.');
+        return;
+      }
+
       mediaRecorderRef.current = new MediaRecorder(stream);
       audioChunksRef.current = [];
 
@@ -118,6 +208,12 @@ export default function AudioDashboard({ user, onOpenAuth }) {
   };
 
   const stopRecording = () => {
+    if (streamingRef.current && isRecording) {
+      stopStreaming();
+      setIsRecording(false);
+      setStatusText('Finishing transcription...');
+      return;
+    }
     if (mediaRecorderRef.current && isRecording) {
       mediaRecorderRef.current.stop();
       setIsRecording(false);
@@ -0,0 +1,151 @@
+"""
+Prometheus metrics for the app, served at /metrics.
+
+    audiofy_requests_total{endpoint, method, status}       counter
+    audiofy_request_duration_seconds{endpoint, method}     histogram
+    audiofy_requests_in_flight{endpoint}                   gauge
+    audiofy_stage_duration_seconds{stage, backend}         histogram (decode, convert, read_audio,
+                                                           vad, recognize, translate, tone, tts, export, ...)
+    audiofy_stages_in_flight{stage}                        gauge
+    audiofy_stage_errors_total{stage, backend, error}      counter (error is the exception type; expected
+                                                           outcomes such as "no speech" are not errors)
+    audiofy_cache_lookups_total{cache, result}             counter (result is hit or miss)
+
+Cache hit ratio is a query, so it stays correct when summed over workers:
+    sum by (cache) (rate(audiofy_cache_lookups_total{result="hit"}[5m]))
+      / sum by (cache) (rate(audiofy_cache_lookups_total[5m]))
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR (serve.py does) before this
+module is imported: every process then writes its samples to files there and /metrics
+adds them up across workers, whichever worker answers the scrape.
+
+prometheus_client is optional; without it every metric is a no-op and /metrics is off.
+"""
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                                   generate_latest, multiprocess)
+    prometheus_available = True
+except ImportError:
+    prometheus_available = False
+
+MULTIPROCESS = prometheus_available and bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class _NoopMetric:
+    """Stands in for every metric when prometheus_client isn't installed."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+
+if prometheus_available:
+    REQUESTS = Counter('audiofy_requests_total', 'HTTP requests handled',
+                       ['endpoint', 'method', 'status'])
+    REQUEST_SECONDS = Histogram('audiofy_request_duration_seconds', 'HTTP request latency',
+                                ['endpoint', 'method'], buckets=REQUEST_BUCKETS)
+    REQUESTS_IN_FLIGHT = Gauge('audiofy_requests_in_flight', 'HTTP requests being handled',
+                               ['endpoint'], multiprocess_mode='livesum')
+    STAGE_SECONDS = Histogram('audiofy_stage_duration_seconds', 'Time spent in one processing stage',
+                              ['stage', 'backend'], buckets=STAGE_BUCKETS)
+    STAGES_IN_FLIGHT = Gauge('audiofy_stages_in_flight', 'Processing stages running right now',
+                             ['stage'], multiprocess_mode='livesum')
+    STAGE_ERRORS = Counter('audiofy_stage_errors_total', 'Processing stages that raised',
+                           ['stage', 'backend', 'error'])
+    CACHE_LOOKUPS = Counter('audiofy_cache_lookups_total', 'Cache lookups by result',
+                            ['cache', 'result'])
+else:
+    REQUESTS = REQUEST_SECONDS = REQUESTS_IN_FLIGHT = _NoopMetric()
+    STAGE_SECONDS = STAGES_IN_FLIGHT = STAGE_ERRORS = CACHE_LOOKUPS = _NoopMetric()
+
+
+# Stage timings of the current request, when something (profiling.py) is collecting them
+_stage_log = contextvars.ContextVar('audiofy_stage_log', default=None)
+
+
+@contextmanager
+def stage(name, backend='', expected=()):
+    """
+    Time the enclosed block as one processing stage. Exceptions are counted as stage
+    errors and re-raised; those of the expected types (an ordinary outcome, like
+    sr.UnknownValueError for a segment with no speech) are re-raised without counting.
+    """
+    in_flight = STAGES_IN_FLIGHT.labels(name)
+    in_flight.inc()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        if not isinstance(e, expected):
+            error = type(e).__name__
+            STAGE_ERRORS.labels(name, backend, error).inc()
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_SECONDS.labels(name, backend).observe(seconds)
+        in_flight.dec()
+        log = _stage_log.get()
+        if log is not None:
+            log.append({'stage': name, 'backend': backend, 'seconds': round(seconds, 6), 'error': error})
+
+
+def collect_stages():
+    """Start recording the stages timed in this context (thread); returns (log, token for stop_collecting)."""
+    log = []
+    return log, _stage_log.set(log)
+
+
+def stop_collecting(token):
+    try:
+        _stage_log.reset(token)
+    except ValueError:
+        # Finished in another context (e.g. after a streamed response); just stop recording
+        _stage_log.set(None)
+
+
+def cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def request_started(endpoint):
+    REQUESTS_IN_FLIGHT.labels(endpoint).inc()
+    return time.perf_counter()
+
+
+def request_finished(endpoint, method, status, started):
+    REQUESTS_IN_FLIGHT.labels(endpoint).dec()
+    REQUESTS.labels(endpoint, method, str(status)).inc()
+    REQUEST_SECONDS.labels(endpoint, method).observe(time.perf_counter() - started)
+
+
+def render():
+    """(body, content_type) of the current metrics in Prometheus text format."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges (its counters and histograms are kept)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,270 @@
+"""
+On-demand request profiling.
+
+A request is profiled when it carries the admin header (X-Audiofy-Profile set to
+AUDIOFY_PROFILE_TOKEN), or at random for AUDIOFY_PROFILE_SAMPLE_RATE of the requests
+to the endpoints in AUDIOFY_PROFILE_ENDPOINTS. Two profilers are available; admin
+requests pick one with X-Audiofy-Profile-Mode (default cprofile), sampled requests
+use AUDIOFY_PROFILE_MODE (default sample):
+
+    cprofile  deterministic, every call counted; saved as pstats
+    sample    the request thread's stack every few milliseconds; saved as speedscope JSON,
+              cheaper on call-heavy code and safe to run on several requests at once
+
+Each profile is saved to AUDIOFY_PROFILE_DIR with the request's endpoint, status,
+duration and the stage timings from metrics.stage(); the newest AUDIOFY_PROFILE_KEEP
+are kept. The response of a profiled request carries X-Audiofy-Profile-Id.
+
+Only the thread that handles the request is profiled; work handed to executors and
+batchers shows up as time spent waiting on them (their stages are in /metrics).
+"""
+import cProfile
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+PROFILE_HEADER = 'X-Audiofy-Profile'
+MODE_HEADER = 'X-Audiofy-Profile-Mode'
+ID_HEADER = 'X-Audiofy-Profile-Id'
+MODES = ('cprofile', 'sample')
+SAMPLE_INTERVAL_SECONDS = 0.005
+PROFILE_ID = re.compile(r'^\d{8}-\d{6}-\d{6}-[0-9a-f]{8}$')
+FORMATS = {'pstats': '.pstats', 'speedscope': '.speedscope.json'}
+
+# cProfile can only be active once per process on newer Pythons (sys.monitoring),
+# so deterministic profiles run one at a time; a busy request is sampled instead
+_cprofile_lock = threading.Lock()
+
+
+class StackSampler:
+    """Records one thread's Python stack at a fixed interval from a background thread."""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames = []
+        self._frame_index = {}
+        self.samples = []
+        self.weights = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _frame_id(self, code):
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({'name': code.co_name, 'file': code.co_filename, 'line': code.co_firstlineno})
+        return index
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                last = now
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(stack)
+            self.weights.append(now - last)
+            last = now
+
+    def speedscope(self, name):
+        """The samples as a speedscope file (https://www.speedscope.app/file-format-schema.json)."""
+        total = sum(self.weights)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': self.frames},
+            'profiles': [{'type': 'sampled', 'name': name, 'unit': 'seconds', 'startValue': 0,
+                          'endValue': total, 'samples': self.samples, 'weights': self.weights}],
+            'name': name,
+            'activeProfileIndex': 0,
+            'exporter': 'audiofy'
+        }
+
+
+class RequestProfile:
+    """The profiler running for one request."""
+
+    def __init__(self, mode, trigger, endpoint, method, path):
+        self.started_at = time.time()
+        # Sortable by start time: date-time-microseconds-random
+        self.id = (f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))}-"
+                   f"{int(self.started_at % 1 * 1e6):06d}-{uuid.uuid4().hex[:8]}")
+        self.mode = mode
+        self.trigger = trigger
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self._started = None
+        self.seconds = None
+        self._profiler = None
+        self._sampler = None
+
+    def start(self):
+        if self.mode == 'cprofile':
+            if _cprofile_lock.acquire(blocking=False):
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+            else:
+                self.mode = 'sample'
+        if self.mode == 'sample':
+            self._sampler = StackSampler(threading.get_ident())
+            self._sampler.start()
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """Stop profiling; False if it had already been stopped."""
+        if self.seconds is not None:
+            return False
+        self.seconds = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            _cprofile_lock.release()
+        if self._sampler is not None:
+            self._sampler.stop()
+        return True
+
+    def save(self, directory, status, stages):
+        """Write the profile and its metadata; returns the metadata."""
+        base = os.path.join(directory, self.id)
+        formats = []
+        if self._profiler is not None:
+            self._profiler.dump_stats(base + FORMATS['pstats'])
+            formats.append('pstats')
+        if self._sampler is not None:
+            with open(base + FORMATS['speedscope'], 'w', encoding='utf-8') as f:
+                json.dump(self._sampler.speedscope(f"{self.method} {self.path}"), f)
+            formats.append('speedscope')
+        meta = {
+            'id': self.id,
+            'endpoint': self.endpoint,
+            'method': self.method,
+            'path': self.path,
+            'status': status,
+            'mode': self.mode,
+            'trigger': self.trigger,
+            'started_at': self.started_at,
+            'seconds': round(self.seconds, 6),
+            'stages': stages,
+            'formats': formats
+        }
+        if self._sampler is not None:
+            meta['samples'] = len(self._sampler.samples)
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        return meta
+
+
+class ProfileStore:
+    """Directory of saved profiles (metadata JSON + pstats/speedscope files), newest `keep` kept."""
+
+    def __init__(self, directory, keep=50):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def save(self, profile, status, stages):
+        os.makedirs(self.directory, exist_ok=True)
+        meta = profile.save(self.directory, status, stages)
+        self._prune()
+        return meta
+
+    def _metadata_files(self):
+        try:
+            names = [name for name in os.listdir(self.directory)
+                     if name.endswith('.json') and not name.endswith(FORMATS['speedscope'])]
+        except FileNotFoundError:
+            return []
+        # Profile ids start with their timestamp, so names sort oldest first
+        return sorted(names)
+
+    def _prune(self):
+        with self._lock:
+            for name in self._metadata_files()[:-self.keep or None]:
+                profile_id = name[:-len('.json')]
+                for suffix in ['.json'] + list(FORMATS.values()):
+                    try:
+                        os.remove(os.path.join(self.directory, profile_id + suffix))
+                    except FileNotFoundError:
+                        pass
+
+    def list(self, limit=None):
+        """Metadata of saved profiles, newest first."""
+        profiles = []
+        for name in reversed(self._metadata_files()):
+            try:
+                with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                # Pruned by another worker, or still being written
+                continue
+            if limit and len(profiles) >= limit:
+                break
+        return profiles
+
+    def path(self, profile_id, fmt):
+        """File of a saved profile in the given format, or None."""
+        if not PROFILE_ID.match(profile_id) or fmt not in FORMATS:
+            return None
+        path = os.path.join(self.directory, profile_id + FORMATS[fmt])
+        return path if os.path.exists(path) else None
+
+
+class RequestProfiler:
+    """Decides which requests to profile."""
+
+    def __init__(self, store, token=None, sample_rate=0.0, endpoints=(), default_mode='sample'):
+        if default_mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {default_mode}")
+        self.store = store
+        self.token = token
+        self.sample_rate = sample_rate
+        self.endpoints = set(endpoints)
+        self.default_mode = default_mode
+        self._random = random.Random()
+
+    @property
+    def enabled(self):
+        return bool(self.token) or self.sample_rate > 0
+
+    def is_admin(self, headers):
+        supplied = headers.get(PROFILE_HEADER)
+        if not self.token or supplied is None:
+            return False
+        # Constant-time, so response timing doesn't leak how much of the token matched
+        return hmac.compare_digest(supplied.encode('utf-8'), self.token.encode('utf-8'))
+
+    def begin(self, endpoint, method, path, headers):
+        """A started RequestProfile when this request should be profiled, else None."""
+        if self.is_admin(headers):
+            trigger = 'header'
+        elif self.sample_rate > 0 and endpoint in self.endpoints and self._random.random() < self.sample_rate:
+            trigger = 'sampled'
+        else:
+            return None
+        if trigger == 'header':
+            mode = headers.get(MODE_HEADER) if headers.get(MODE_HEADER) in MODES else 'cprofile'
+        else:
+            mode = self.default_mode
+        profile = RequestProfile(mode, trigger, endpoint, method, path)
+        profile.start()
+        return profile
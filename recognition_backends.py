@@ -0,0 +1,193 @@
+import json
+import threading
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import speech_recognition as sr
+
+GOOGLE_ENDPOINT = 'http://www.google.com/speech-api/v2/recognize'
+
+
+class RecognitionBackend:
+    """
+    A speech-to-text engine.
+
+    recognize(audio_data, language) takes an sr.AudioData and a locale such as
+    'en-US' and returns the transcript. Like sr.Recognizer's methods, it raises
+    sr.UnknownValueError when nothing was understood and sr.RequestError when the
+    engine itself failed, so callers handle every backend the same way.
+    """
+
+    name = None
+
+    def recognize(self, audio_data, language):
+        raise NotImplementedError
+
+    def describe(self):
+        return {'name': self.name}
+
+
+class GoogleBackend(RecognitionBackend):
+    """
+    Google Web Speech API. With an endpoint, requests go to that URL instead,
+    e.g. the local stand-in server in recognizer_standin.py.
+    """
+
+    def __init__(self, recognizer=None, endpoint=None, key=None, timeout=30, name='google'):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.endpoint = endpoint
+        self.key = key
+        self.timeout = timeout
+        self.name = name
+
+    def describe(self):
+        return {'name': self.name, 'endpoint': self.endpoint or GOOGLE_ENDPOINT}
+
+    def recognize(self, audio_data, language):
+        if self.endpoint is None:
+            return self.recognizer.recognize_google(audio_data, key=self.key, language=language)
+        return self._recognize_endpoint(audio_data, language)
+
+    def _recognize_endpoint(self, audio_data, language):
+        """The same request and response handling as recognize_google, against self.endpoint."""
+        flac_data = audio_data.get_flac_data(
+            convert_rate=None if audio_data.sample_rate >= 8000 else 8000, convert_width=2
+        )
+        sample_rate = max(audio_data.sample_rate, 8000)
+        params = {'client': 'chromium', 'lang': language, 'pFilter': 0}
+        if self.key:
+            params['key'] = self.key
+        url = f"{self.endpoint}?{urlencode(params)}"
+        request = Request(url, data=flac_data, headers={'Content-Type': f'audio/x-flac; rate={sample_rate}'})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                body = response.read().decode('utf-8')
+        except HTTPError as e:
+            raise sr.RequestError(f"recognition request failed: {e.reason}")
+        except URLError as e:
+            raise sr.RequestError(f"recognition connection failed: {e.reason}")
+
+        # The response is one JSON object per line; the first non-empty result wins
+        result = None
+        for line in body.split('\n'):
+            if not line:
+                continue
+            results = json.loads(line).get('result', [])
+            if results:
+                result = results[0]
+                break
+        if not result or not result.get('alternative'):
+            raise sr.UnknownValueError()
+        alternatives = result['alternative']
+        best = max(alternatives, key=lambda alternative: alternative.get('confidence', 0))
+        return best['transcript']
+
+
+def _language_key(language):
+    return language.split('-')[0].lower() if isinstance(language, str) else ''
+
+
+class VoskBackend(RecognitionBackend):
+    """
+    Offline Kaldi recognition with Vosk, on CPU.
+
+    model_paths maps a language code ('en', 'hi', ...) to a Vosk model directory;
+    the '' entry is used for any other language. Models are loaded on first use
+    and shared by all requests; each request gets its own recognizer.
+    """
+
+    name = 'vosk'
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model_paths):
+        self.model_paths = model_paths
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def describe(self):
+        return {'name': self.name, 'models': self.model_paths}
+
+    def _model(self, language):
+        key = _language_key(language)
+        if key not in self.model_paths:
+            key = ''
+        path = self.model_paths.get(key)
+        if not path:
+            raise sr.RequestError(f"No Vosk model configured for {language}")
+        if path not in self._models:
+            with self._lock:
+                if path not in self._models:
+                    try:
+                        from vosk import Model, SetLogLevel
+                    except ImportError:
+                        raise sr.RequestError("vosk is not installed")
+                    SetLogLevel(-1)
+                    self._models[path] = Model(path)
+        return self._models[path]
+
+    def recognize(self, audio_data, language):
+        from vosk import KaldiRecognizer
+        recognizer = KaldiRecognizer(self._model(language), self.SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class WhisperBackend(RecognitionBackend):
+    """
+    Offline Whisper recognition on CPU through faster-whisper (int8 CTranslate2).
+    model is a size name ('tiny', 'base', 'small', ...) or a converted model path.
+    """
+
+    name = 'whisper'
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model='base', compute_type='int8', cpu_threads=0, beam_size=1):
+        self.model_name = model
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    def describe(self):
+        return {'name': self.name, 'model': self.model_name, 'compute_type': self.compute_type}
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from faster_whisper import WhisperModel
+                    except ImportError:
+                        raise sr.RequestError("faster-whisper is not installed")
+                    self._model = WhisperModel(self.model_name, device='cpu', compute_type=self.compute_type,
+                                               cpu_threads=self.cpu_threads)
+        return self._model
+
+    def recognize(self, audio_data, language):
+        import numpy as np
+        model = self._get_model()
+        pcm = audio_data.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        samples = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+        segments, _ = model.transcribe(samples, language=_language_key(language) or None,
+                                       beam_size=self.beam_size)
+        text = ' '.join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+def parse_model_paths(value):
+    """'en=/models/en,hi=/models/hi' -> {'en': ..., 'hi': ...}; a bare path applies to every language."""
+    paths = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        language, sep, path = item.partition('=')
+        if sep:
+            paths[language.strip().lower()] = path.strip()
+        else:
+            paths[''] = item
+    return paths
@@ -0,0 +1,274 @@
+"""
+Local stand-in for the Google Web Speech API, for offline testing and load tests.
+
+It speaks the same protocol as www.google.com/speech-api/v2/recognize (FLAC or L16
+POST body, line-delimited JSON response), so GoogleBackend pointed at it behaves like
+the real thing. Transcripts are deterministic: every clip in the corpus manifest is
+decoded at startup, and a request is matched back to the clip (and the part of the
+clip) it was cut from, returning the reference text for that span.
+
+    python recognizer_standin.py --corpus corpus/manifest.json [--port 8765]
+        [--latency-ms 150] [--latency-per-second-ms 40] [--jitter-ms 20]
+        [--error-rate 0.01] [--seed 1]
+
+then run the app with AUDIOFY_STANDIN_URL=http://127.0.0.1:8765/speech-api/v2/recognize
+and pick backend=standin (or AUDIOFY_RECOGNITION_BACKEND=standin).
+
+The manifest is JSON: {"clips": [{"audio": "en/0001.wav", "language": "en-US",
+"text": "..."}]}, audio paths relative to the manifest. Matching is exact on samples,
+so keep the corpus as 16 kHz mono WAV, the rate the app recognizes at.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from audio_pipeline import AudioDecodeError, _run_ffmpeg
+
+RECOGNIZE_PATH = '/speech-api/v2/recognize'
+# Two probes of this length locate a request inside a corpus clip
+PROBE_SECONDS = 0.1
+# A request covering this much of a clip gets the clip's whole transcript
+FULL_CLIP_RATIO = 0.9
+
+
+def read_clip(path, sample_rate=None):
+    """16-bit mono PCM and sample rate of a corpus clip (WAV directly, anything else via ffmpeg)."""
+    try:
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() == 2 and wav.getnchannels() == 1 and sample_rate in (None, wav.getframerate()):
+                return wav.readframes(wav.getnframes()), wav.getframerate()
+    except (wave.Error, EOFError):
+        pass
+    sample_rate = sample_rate or 16000
+    with open(path, 'rb') as f:
+        pcm = _run_ffmpeg(f.read(), ['-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate)],
+                          'ffmpeg', 600)
+    return pcm, sample_rate
+
+
+def load_manifest(path):
+    """Clips of a corpus manifest, with audio paths made absolute."""
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    root = os.path.dirname(os.path.abspath(path))
+    clips = []
+    for clip in manifest.get('clips', []):
+        clip = dict(clip)
+        clip['audio'] = os.path.join(root, clip['audio'])
+        clips.append(clip)
+    return clips
+
+
+class TranscriptIndex:
+    """Corpus PCM keyed by sample rate, and the lookup from request audio back to reference text."""
+
+    def __init__(self, clips):
+        self.clips = []
+        for clip in clips:
+            pcm, sample_rate = read_clip(clip['audio'])
+            self.clips.append({'pcm': pcm, 'sample_rate': sample_rate,
+                               'language': clip.get('language', ''), 'words': clip['text'].split()})
+
+    def _probe(self, pcm, sample_rate, low, high):
+        """The loudest PROBE_SECONDS window of pcm[low:high], as (offset, bytes)."""
+        length = max(2, int(sample_rate * PROBE_SECONDS)) * 2
+        window = pcm[low:high]
+        if len(window) <= length:
+            return low, pcm[low:low + length]
+        samples = np.frombuffer(window, dtype='<i2', count=len(window) // 2).astype(np.float32)
+        energy = np.convolve(samples * samples, np.ones(length // 2, dtype=np.float32), mode='valid')
+        offset = low + int(np.argmax(energy)) * 2
+        return offset, pcm[offset:offset + length]
+
+    @staticmethod
+    def _find(haystack, needle, start=0):
+        """First sample-aligned occurrence of needle in haystack, or -1."""
+        position = haystack.find(needle, start)
+        while position != -1 and position % 2:
+            position = haystack.find(needle, position + 1)
+        return position
+
+    def lookup(self, pcm, sample_rate, language):
+        """Reference text for request audio, or None when it isn't from the corpus."""
+        if len(pcm) < 4:
+            return None
+        quarter = len(pcm) // 4 & ~1
+        first_offset, first = self._probe(pcm, sample_rate, 0, max(quarter, 2))
+        last_offset, last = self._probe(pcm, sample_rate, len(pcm) - max(quarter, 2), len(pcm))
+        language = language.split('-')[0].lower()
+        for clip in self.clips:
+            if clip['sample_rate'] != sample_rate:
+                continue
+            if language and clip['language'] and clip['language'].split('-')[0].lower() != language:
+                continue
+            start = self._find(clip['pcm'], first)
+            if start == -1:
+                continue
+            end = self._find(clip['pcm'], last, start)
+            if end == -1:
+                continue
+            # Map the request's span of the clip to the same fraction of its words
+            start -= first_offset
+            end += len(pcm) - last_offset
+            total = len(clip['pcm'])
+            words = clip['words']
+            if (end - start) >= total * FULL_CLIP_RATIO:
+                return ' '.join(words)
+            low = int(round(max(0, start) / total * len(words)))
+            high = int(round(min(total, end) / total * len(words)))
+            return ' '.join(words[low:max(high, low + 1)])
+        return None
+
+
+def decode_flac(body):
+    """16-bit PCM of a FLAC body, with the flac binary speech_recognition ships (else ffmpeg)."""
+    try:
+        import speech_recognition as sr
+        converter = sr.get_flac_converter()
+    except (ImportError, OSError):
+        return _run_ffmpeg(body, ['-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1'], 'ffmpeg', 60)
+    command = [converter, '--decode', '--stdout', '--silent', '--force-raw-format', '--endian=little',
+               '--sign=signed', '-']
+    result = subprocess.run(command, input=body, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            timeout=60, check=False)
+    if result.returncode != 0:
+        raise AudioDecodeError(result.stderr.decode('utf-8', 'replace').strip() or 'flac decoding failed')
+    return result.stdout
+
+
+def decode_request(body, content_type):
+    """(pcm, sample_rate) of a request body: audio/x-flac or audio/l16, with a rate= parameter."""
+    media_type, _, params = content_type.partition(';')
+    options = dict(part.strip().partition('=')[::2] for part in params.split(';') if '=' in part)
+    sample_rate = int(options.get('rate', 16000))
+    media_type = media_type.strip().lower()
+    if media_type == 'audio/l16':
+        # L16 is big-endian on the wire
+        return np.frombuffer(body, dtype='>i2', count=len(body) // 2).astype('<i2').tobytes(), sample_rate
+    if media_type == 'audio/x-flac':
+        return decode_flac(body), sample_rate
+    raise AudioDecodeError(f"Unsupported content type: {content_type}")
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, index, latency_ms=0, latency_per_second_ms=0, jitter_ms=0,
+                 error_rate=0.0, seed=None, default_transcript=None):
+        super().__init__(address, StandinHandler)
+        self.index = index
+        self.latency_ms = latency_ms
+        self.latency_per_second_ms = latency_per_second_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.default_transcript = default_transcript
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.stats = {'requests': 0, 'matched': 0, 'unmatched': 0, 'errors': 0}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, content_type='application/json; charset=utf-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/stats':
+            self._reply(200, json.dumps(self.server.stats))
+        else:
+            self._reply(404, json.dumps({'error': 'not found'}))
+
+    def do_POST(self):
+        server = self.server
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if url.path != RECOGNIZE_PATH:
+            self._reply(404, json.dumps({'error': 'not found'}))
+            return
+        server.stats['requests'] += 1
+        language = parse_qs(url.query).get('lang', [''])[0]
+        try:
+            pcm, sample_rate = decode_request(body, self.headers.get('Content-Type', ''))
+        except (AudioDecodeError, ValueError) as e:
+            self._reply(400, json.dumps({'error': str(e)}))
+            return
+
+        with server.random_lock:
+            jitter = server.random.uniform(-server.jitter_ms, server.jitter_ms) if server.jitter_ms else 0
+            failed = server.random.random() < server.error_rate
+        audio_seconds = len(pcm) / 2 / sample_rate
+        delay = server.latency_ms + server.latency_per_second_ms * audio_seconds + jitter
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if failed:
+            server.stats['errors'] += 1
+            self._reply(500, json.dumps({'error': 'injected failure'}))
+            return
+
+        transcript = server.index.lookup(pcm, sample_rate, language)
+        server.stats['matched' if transcript is not None else 'unmatched'] += 1
+        if transcript is None:
+            transcript = server.default_transcript
+        # Same shape as Google: an empty result line, then the result with its alternatives
+        lines = [json.dumps({'result': []})]
+        if transcript:
+            lines.append(json.dumps({'result': [{'alternative': [{'transcript': transcript, 'confidence': 0.95}],
+                                                 'final': True}], 'result_index': 0}))
+        self._reply(200, '\n'.join(lines) + '\n')
+
+
+def start_server(corpus=None, host='127.0.0.1', port=0, **options):
+    """Start a stand-in on a background thread; returns (server, recognize_url). Port 0 picks a free port."""
+    index = TranscriptIndex(load_manifest(corpus) if corpus else [])
+    server = StandinServer((host, port), index, **options)
+    threading.Thread(target=server.serve_forever, name='recognizer-standin', daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{RECOGNIZE_PATH}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='corpus manifest.json whose clips requests are matched against')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help='fixed delay per request')
+    parser.add_argument('--latency-per-second-ms', type=float, default=0, help='extra delay per second of audio')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='uniform random +/- delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with HTTP 500')
+    parser.add_argument('--seed', type=int, help='seed for jitter and injected errors')
+    parser.add_argument('--default-transcript', help='answer for audio not in the corpus (default: no speech)')
+    args = parser.parse_args(argv)
+
+    index = TranscriptIndex(load_manifest(args.corpus) if args.corpus else [])
+    server = StandinServer((args.host, args.port), index, latency_ms=args.latency_ms,
+                           latency_per_second_ms=args.latency_per_second_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, seed=args.seed, default_transcript=args.default_transcript)
+    print(f"Recognizer stand-in with {len(index.clips)} clips on "
+          f"http://{args.host}:{server.server_address[1]}{RECOGNIZE_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Production server: gunicorn with the heavy components preloaded before forking.
+
+The master process imports the app and loads the tone model, recognizer and
+ffmpeg once; workers are then forked from it and share those pages copy-on-write
+instead of each loading their own copy. The master periodically logs every
+worker's RSS, PSS and shared/private memory, so you can see how many workers fit
+on a box. (`python app.py` remains the single-process development server.)
+
+Prometheus metrics are collected in multiprocess mode, so /metrics reports totals
+over all workers whichever worker answers: samples go to PROMETHEUS_MULTIPROC_DIR
+(a fresh temporary directory unless it is set), which is emptied at startup.
+
+    python serve.py [--workers 4] [--threads 4] [--bind 0.0.0.0:5000]
+                    [--preload tone_model recognizer ffmpeg] [--memory-report-interval 60]
+
+Every option can also be set with an environment variable: AUDIOFY_WORKERS,
+AUDIOFY_THREADS, AUDIOFY_BIND (or PORT), AUDIOFY_PRELOAD (comma-separated),
+AUDIOFY_MEMORY_REPORT_INTERVAL and AUDIOFY_WORKER_TIMEOUT.
+"""
+import argparse
+import gc
+import logging
+import glob
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from components import process_memory
+
+logger = logging.getLogger('audiofy.serve')
+
+# Loaded in the master. tts_pool is left out on purpose: its renderer processes and
+# their pipes can't be shared with forked workers, so each worker starts its own.
+DEFAULT_PRELOAD = ['ffmpeg', 'recognizer', 'tone_model']
+
+
+def format_mb(value):
+    return f"{value / (1024 * 1024):8.1f}" if value is not None else f"{'-':>8}"
+
+
+def log_memory_report(worker_pids):
+    """Log one line per process: the master, then every live worker."""
+    rows = [('master', os.getpid())] + [('worker', pid) for pid in sorted(worker_pids)]
+    lines = [f"{'process':>8} {'pid':>7} {'rss MB':>8} {'pss MB':>8} {'shared':>8} {'private':>8}"]
+    total_pss = 0
+    for role, pid in rows:
+        memory = process_memory(pid)
+        total_pss += memory.get('pss', 0)
+        lines.append(f"{role:>8} {pid:>7} {format_mb(memory.get('rss'))} {format_mb(memory.get('pss'))} "
+                     f"{format_mb(memory.get('shared'))} {format_mb(memory.get('private'))}")
+    lines.append(f"total PSS: {total_pss / (1024 * 1024):.1f} MB across {len(rows)} processes")
+    logger.info("Worker memory report\n" + "\n".join(lines))
+
+
+def worker_pids(server, attempts=5):
+    """Snapshot the arbiter's worker pids; the master thread may be changing the dict meanwhile."""
+    for _ in range(attempts):
+        try:
+            return list(server.WORKERS)
+        except RuntimeError:
+            # "dictionary changed size during iteration": a worker was just spawned or reaped
+            time.sleep(0.01)
+    return []
+
+
+def start_memory_reporter(server, interval):
+    def report_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                log_memory_report(worker_pids(server))
+            except Exception:
+                # Keep reporting: one failed report must not end the thread
+                logger.exception("Worker memory report failed")
+
+    threading.Thread(target=report_loop, name='memory-report', daemon=True).start()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('AUDIOFY_WORKERS', 2)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('AUDIOFY_THREADS', 4)),
+                        help='request threads per worker')
+    parser.add_argument('--bind', default=os.environ.get('AUDIOFY_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}"))
+    parser.add_argument('--preload', nargs='*',
+                        default=[name for name in os.environ.get('AUDIOFY_PRELOAD', ','.join(DEFAULT_PRELOAD)).split(',')
+                                 if name],
+                        help='components to load in the master before forking (none to load lazily per worker)')
+    parser.add_argument('--memory-report-interval', type=float,
+                        default=float(os.environ.get('AUDIOFY_MEMORY_REPORT_INTERVAL', 60)),
+                        help='seconds between worker memory reports (0 disables)')
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('AUDIOFY_WORKER_TIMEOUT', 300)),
+                        help='seconds before a silent worker is restarted')
+    return parser.parse_args(argv)
+
+
+def prepare_metrics_dir():
+    """Point prometheus_client at an empty multiprocess directory; must run before the app is imported."""
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        # Samples left by a previous run would be added to this one's
+        for path in glob.glob(os.path.join(directory, '*.db')):
+            os.remove(path)
+    else:
+        directory = os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='audiofy-metrics-')
+    return directory
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("serve.py needs gunicorn (pip install gunicorn); use `python app.py` for development.",
+              file=sys.stderr)
+        return 1
+    metrics_dir = prepare_metrics_dir()
+
+    class AudiofyServer(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': args.bind,
+                'workers': args.workers,
+                'threads': args.threads,
+                'worker_class': 'gthread' if args.threads > 1 else 'sync',
+                'timeout': args.timeout,
+                # Import the app (and the preloaded components) once, in the master
+                'preload_app': True,
+                'when_ready': self.when_ready,
+                'child_exit': self.child_exit
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            import app as audiofy
+            if args.preload:
+                report = audiofy.components.warm_up(args.preload)
+                for name in args.preload:
+                    info = report['components'].get(name)
+                    if info is None:
+                        logger.warning(f"Unknown component '{name}' not preloaded")
+                    elif info['loaded']:
+                        logger.info(f"Preloaded {name} in {info['load_seconds']:.2f}s")
+                    else:
+                        logger.error(f"Failed to preload {name}: {info['error']}")
+            # Move everything loaded so far out of the collector's reach, so GC passes in
+            # the workers don't write to (and un-share) the preloaded objects' pages
+            gc.collect()
+            gc.freeze()
+            return audiofy.app
+
+        def when_ready(self, server):
+            logger.info(f"Serving on {args.bind} with {args.workers} workers x {args.threads} threads")
+            logger.info(f"Collecting worker metrics in {metrics_dir}")
+            if args.memory_report_interval > 0:
+                start_memory_reporter(server, args.memory_report_interval)
+
+        def child_exit(self, server, worker):
+            import metrics
+            metrics.mark_process_dead(worker.pid)
+
+    AudiofyServer().run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,455 +1,946 @@
-import speech_recognition as sr
-from deep_translator import GoogleTranslator
-import pyttsx3
-import time
-import os
-from jiwer import wer
-import static_ffmpeg
-static_ffmpeg.add_paths()
-
-# Redefine print to safely handle Unicode encoding errors on console output
-def print(*args, **kwargs):
-    import builtins
-    try:
-        builtins.print(*args, **kwargs)
-    except UnicodeEncodeError:
-        new_args = []
-        for arg in args:
-            if isinstance(arg, str):
-                new_args.append(arg.encode('ascii', 'backslashreplace').decode('ascii'))
-            else:
-                new_args.append(arg)
-        try:
-            builtins.print(*new_args, **kwargs)
-        except Exception:
-            pass
-    except Exception:
-        pass
-
-class SpeechTranslator:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.engine = pyttsx3.init()
-        
-        # Available languages (ISO 639-1 codes)
-        self.languages = {
-            "en": "English",
-            "hi": "Hindi",
-            "es": "Spanish",
-            "fr": "French",
-            "de": "German",
-            "it": "Italian",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "zh-CN": "Chinese (Simplified)",
-            "ru": "Russian",
-            "ar": "Arabic"
-        }
-        
-        # Set up Indian English voice if available
-        self.setup_indian_voice()
-    
-    def setup_indian_voice(self):
-        """Try to find and set an Indian English voice"""
-        voices = self.engine.getProperty('voices')
-        indian_voice = None
-        
-        # Print available voices for debugging
-        print("\nAvailable voices:")
-        for i, voice in enumerate(voices):
-            print(f"Voice {i}: {voice.name} ({voice.id})")
-            # Look for voices that might be Indian English
-            if any(term in voice.name.lower() for term in ["indian", "hindi", "india"]):
-                indian_voice = voice
-                print(f"Found potential Indian voice: {voice.name}")
-        
-        # Set default voice to Indian if found, otherwise use system default
-        if indian_voice:
-            self.engine.setProperty('voice', indian_voice.id)
-            print(f"Set default voice to: {indian_voice.name}")
-        else:
-            print("No specific Indian voice found. Using system default.")
-            
-        # Adjust speech rate and volume
-        self.engine.setProperty('rate', 150)  # Speed of speech
-        self.engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
-    
-    def list_languages(self):
-        """Display available languages"""
-        print("\nAvailable languages:")
-        for code, name in self.languages.items():
-            print(f"  {code}: {name}")
-    
-    def recognize_speech(self, language="en-US"):
-        """Recognize speech from the microphone."""
-        recognizer = sr.Recognizer()
-
-        with sr.Microphone() as source:
-            print("Adjusting for ambient noise... Please wait.")
-            recognizer.adjust_for_ambient_noise(source, duration=1)
-            print("Listening...")
-            try:
-                audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
-                print("Processing speech...")
-                text = recognizer.recognize_google(audio, language=language)
-                try:
-                    print(f"Recognized: {text}")
-                except UnicodeEncodeError:
-                    print("Recognized text (contains non-ASCII characters, printed safely to API)")
-                return text
-            except sr.WaitTimeoutError:
-                print("Listening timed out waiting for phrase to start")
-                return None
-            except sr.UnknownValueError:
-                print("Could not understand audio")
-                return None
-            except sr.RequestError as e:
-                print(f"Recognition error: {e}")
-                return None
-    
-    def translate_text(self, text, src="auto", dest="en"):
-        """Translate text from source language to destination language."""
-        try:
-            translator = GoogleTranslator(source=src, target=dest)
-            translated_text = translator.translate(text)
-        
-            # Debugging: Log the translation process
-            try:
-                print(f"Translating from {src} to {dest}: '{text}' -> '{translated_text}'")
-            except UnicodeEncodeError:
-                print(f"Translating from {src} to {dest}: [text translation printed to log safely]")
-        
-            return translated_text
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return None
-    
-    def speak_text(self, text, language="en"):
-        """Convert text to speech"""
-        if not text:
-            return
-        
-        # Set voice properties based on language
-        voices = self.engine.getProperty('voices')
-        
-        # Voice selection logic
-        if language == "hi":
-            # Try to find a Hindi voice
-            hindi_voice = None
-            for voice in voices:
-                if any(term in voice.name.lower() for term in ["hindi", "indian", "india"]):
-                    hindi_voice = voice
-                    break
-            
-            if hindi_voice:
-                self.engine.setProperty('voice', hindi_voice.id)
-                print(f"Using voice: {hindi_voice.name} for Hindi")
-            else:
-                # If no Hindi voice, use default voice
-                print("No specific Hindi voice found. Using default voice.")
-        
-        elif language == "en":
-            # For English, use the Indian English voice we set up earlier
-            # This is already handled in setup_indian_voice()
-            pass
-        
-        elif language in ["es", "it", "fr", "ja", "ko", "de", "ru", "zh-CN", "ar"]:
-            # Try to use an appropriate voice matching the requested language
-            for voice in voices:
-                if any(term in voice.name.lower() for term in [language, "spanish", "italian", "french", "japanese", "korean", "german", "russian", "chinese", "arabic"]):
-                    self.engine.setProperty('voice', voice.id)
-                    print(f"Using voice: {voice.name}")
-                    break
-        
-        # Speak the text
-        self.engine.say(text)
-        self.engine.runAndWait()
-        
-        # Reset to default Indian English voice after speaking
-        self.setup_indian_voice()
-
-    # Add a method to transcribe audio files
-    def transcribe_audio_file(self, file_path, language="en-US"):
-        """Transcribe an uploaded audio file into text."""
-        try:
-            # Map simple language codes to standard locales for Google Speech Recognition
-            lang_map = {
-                "en": "en-US",
-                "hi": "hi-IN",
-                "es": "es-ES",
-                "fr": "fr-FR",
-                "de": "de-DE",
-                "it": "it-IT",
-                "ja": "ja-JP",
-                "ko": "ko-KR",
-                "zh-cn": "zh-CN",
-                "zh-CN": "zh-CN",
-                "ru": "ru-RU",
-                "ar": "ar-SA"
-            }
-            language = lang_map.get(language.lower() if isinstance(language, str) else language, language)
-            
-            # Check if file exists
-            if not os.path.exists(file_path):
-                print(f"File not found: {file_path}")
-                return None
-                
-            # Convert audio file to WAV format if necessary
-            if not file_path.endswith(".wav"):
-                try:
-                    from pydub import AudioSegment
-                    audio = AudioSegment.from_file(file_path)
-                    wav_path = file_path.rsplit(".", 1)[0] + ".wav"
-                    audio.export(wav_path, format="wav")
-                    file_path = wav_path
-                    print(f"Converted audio to WAV: {file_path}")
-                except ImportError:
-                    print("pydub not available, trying to process file directly")
-                except Exception as e:
-                    print(f"Error converting audio to WAV: {e}")
-                    return None
-
-            # Load and read the audio file
-            audio_data = None
-            try:
-                with sr.AudioFile(file_path) as source:
-                    print("Processing audio file directly...")
-                    audio_data = self.recognizer.record(source)
-            except Exception as e:
-                print(f"Failed to read file directly with speech_recognition: {e}. Trying conversion to standard PCM WAV...")
-                # If reading directly failed (e.g. not a PCM wav file), convert it using pydub
-                try:
-                    from pydub import AudioSegment
-                    audio = AudioSegment.from_file(file_path)
-                    # Convert to standard mono 16kHz PCM WAV
-                    audio = audio.set_frame_rate(16000).set_channels(1)
-                    pcm_wav_path = file_path.rsplit(".", 1)[0] + "_pcm.wav"
-                    audio.export(pcm_wav_path, format="wav", codec="pcm_s16le")
-                    file_path = pcm_wav_path
-                    print(f"Successfully converted audio to PCM WAV: {file_path}")
-                    with sr.AudioFile(file_path) as source:
-                        audio_data = self.recognizer.record(source)
-                except Exception as convert_error:
-                    print(f"Error converting to PCM WAV: {convert_error}")
-                    return None
-
-            if not audio_data:
-                print("Failed to obtain audio data from file.")
-                return None
-
-            # Recognize speech in the audio file
-            text = self.recognizer.recognize_google(audio_data, language=language)
-            try:
-                print(f"Transcription: {text}")
-            except UnicodeEncodeError:
-                print("Transcription contains non-ASCII characters, printed safely to API")
-            return text
-
-        except sr.UnknownValueError:
-            print("Could not understand the audio.")
-            return None
-        except sr.RequestError as e:
-            print(f"Error with the speech recognition service: {e}")
-            return None
-        except Exception as e:
-            print(f"Error processing audio file: {e}")
-            return None
-
-    # Add a method to detect tone
-    def detect_tone(self, text):
-        """
-        Detect the emotional tone of the text using a more sophisticated approach.
-        Returns one of: Happy, Sad, Angry, Neutral, Excited, Worried, Confused
-        """
-        if not text:
-            return "Neutral"
-        
-        try:
-            # Try to use TextBlob for sentiment analysis if available
-            from textblob import TextBlob
-            
-            # Get sentiment polarity (-1 to 1) and subjectivity (0 to 1)
-            analysis = TextBlob(text)
-            polarity = analysis.sentiment.polarity
-            subjectivity = analysis.sentiment.subjectivity
-            
-            # Determine tone based on polarity and subjectivity
-            if polarity > 0.5:
-                return "Happy" if subjectivity < 0.6 else "Excited"
-            elif polarity > 0.1:
-                return "Happy"
-            elif polarity < -0.5:
-                return "Angry" if "!" in text else "Sad"
-            elif polarity < -0.1:
-                return "Sad"
-            else:
-                # Check for question marks to detect confusion
-                if "?" in text and text.count("?") > 1:
-                    return "Confused"
-                # Check for specific worry indicators
-                elif any(word in text.lower() for word in ["worry", "worried", "concern", "afraid", "fear", "anxious"]):
-                    return "Worried"
-                else:
-                    return "Neutral"
-        
-        except ImportError:
-            # Fallback to enhanced keyword-based approach
-            text_lower = text.lower()
-            
-            # More comprehensive emotion dictionaries
-            happy_words = [
-                "happy", "joy", "joyful", "delighted", "excited", "glad", "pleased", 
-                "thrilled", "wonderful", "amazing", "great", "good", "love", "like", 
-                "enjoy", "fantastic", "excellent", "awesome", "smile", "laugh", "fun",
-                "celebrate", "congratulations", "perfect", "beautiful", "best"
-            ]
-            
-            sad_words = [
-                "sad", "unhappy", "depressed", "depression", "miserable", "heartbroken", 
-                "disappointed", "upset", "terrible", "awful", "horrible", "hate", "dislike", 
-                "sorry", "regret", "cry", "tears", "grief", "mourn", "miss", "lost", "alone",
-                "lonely", "unfortunate", "tragic", "failed", "failure", "passed away", "died"
-            ]
-            
-            angry_words = [
-                "angry", "mad", "furious", "annoyed", "irritated", "frustrated", "rage", 
-                "hate", "outraged", "disgusted", "bitter", "hostile", "offended", "resent",
-                "damn", "hell", "stupid", "idiot", "fool", "ridiculous", "unfair", "wrong"
-            ]
-            
-            worried_words = [
-                "worry", "worried", "anxious", "anxiety", "nervous", "stress", "stressed",
-                "concern", "concerned", "afraid", "fear", "scared", "frightened", "panic",
-                "uneasy", "tense", "apprehensive", "dread", "doubt", "uncertain"
-            ]
-            
-            confused_words = [
-                "confused", "confusing", "confusion", "puzzled", "perplexed", "unsure",
-                "uncertain", "doubt", "wondering", "wonder", "understand", "complicated"
-            ]
-            
-            # Count exclamation marks and question marks
-            exclamation_count = text.count("!")
-            question_count = text.count("?")
-            
-            # Count occurrences of emotion words
-            happy_count = sum(1 for word in happy_words if word in text_lower)
-            sad_count = sum(1 for word in sad_words if word in text_lower)
-            angry_count = sum(1 for word in angry_words if word in text_lower)
-            worried_count = sum(1 for word in worried_words if word in worried_words if word in text_lower)
-            confused_count = sum(1 for word in confused_words if word in text_lower)
-            
-            # Apply weights to different factors
-            if exclamation_count > 1:
-                if angry_count > 0:
-                    angry_count += exclamation_count
-                else:
-                    happy_count += exclamation_count
-            
-            if question_count > 1:
-                confused_count += question_count
-            
-            # Check for specific phrases that strongly indicate emotions
-            if "my mother passed away" in text_lower or "my father passed away" in text_lower:
-                sad_count += 5
-            
-            if "congratulations" in text_lower or "well done" in text_lower:
-                happy_count += 3
-            
-            # Determine the dominant emotion
-            max_count = max(happy_count, sad_count, angry_count, worried_count, confused_count)
-            
-            if max_count == 0:
-                return "Neutral"
-            elif max_count == happy_count:
-                return "Excited" if exclamation_count > 1 else "Happy"
-            elif max_count == sad_count:
-                return "Sad"
-            elif max_count == angry_count:
-                return "Angry"
-            elif max_count == worried_count:
-                return "Worried"
-            elif max_count == confused_count:
-                return "Confused"
-            else:
-                return "Neutral"
-
-    # Improved method to generate a summary
-    def generate_summary(self, text):
-        """Generate a summary of the text."""
-        if not text or len(text) < 50:
-            return "Text is too short to summarize."
-        
-        # Improved extractive summarization
-        sentences = text.split('.')
-        if len(sentences) <= 3:
-            return text
-        
-        # Calculate word frequency
-        word_freq = {}
-        # Define stop words to ignore
-        stop_words = ["the", "a", "an", "and", "or", "but", "is", "are", "was", "were", 
-                      "in", "on", "at", "to", "for", "with", "by", "about", "like", 
-                      "from", "of", "that", "this", "there", "it", "as", "be", "been"]
-        
-        for sentence in sentences:
-            words = sentence.lower().split()
-            for word in words:
-                if word not in stop_words and len(word) > 3:
-                    if word not in word_freq:
-                        word_freq[word] = 1
-                    else:
-                        word_freq[word] += 1
-        
-        # Score sentences based on word frequency and position
-        sentence_scores = []
-        for i, sentence in enumerate(sentences):
-            if not sentence.strip():
-                continue
-                
-            words = sentence.lower().split()
-            score = sum(word_freq.get(word, 0) for word in words) / max(len(words), 1)
-            
-            # Give higher weight to first and last sentences
-            if i == 0 or i == len(sentences) - 1:
-                score *= 1.25
-                
-            # Penalize very short sentences
-            if len(words) < 4:
-                score *= 0.7
-                
-            sentence_scores.append((sentence, score, i))
-        
-        # Get top 3 sentences
-        top_sentences = sorted(sentence_scores, key=lambda x: x[1], reverse=True)[:3]
-        
-        # Sort by original order
-        top_sentences.sort(key=lambda x: x[2])
-        
-        # Join sentences
-        summary = '. '.join(sentence[0] for sentence in top_sentences) + '.'
-        return summary
-
-# Function to calculate Word Error Rate (WER)
-# def calculate_wer(reference, hypothesis):
-#     """
-#     Calculate the Word Error Rate (WER) between the reference and hypothesis.
-#     :param reference: The ground truth text.
-#     :param hypothesis: The transcribed text.
-#     :return: WER as a percentage.
-#     """
-#     error_rate = wer(reference, hypothesis)
-#     print(f"WER: {error_rate * 100:.2f}%")
-#     return error_rate
-
-# Example usage of the SpeechTranslator class
-translator = SpeechTranslator()
-result = translator.translate_text("नमस्ते", src="hi", dest="en")
-print(result)  # Expected output: "Hello"
-
-reference_text = "This is the correct transcription."
-transcribed_text = "This is the transcription."
-
-# Calculate WER
-# error_rate = calculate_wer(reference_text, transcribed_text)
-# print(f"Word Error Rate: {error_rate * 100:.2f}%")
+import speech_recognition as sr
+import io
+import re
+import time
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from jiwer import wer
+from audio_pipeline import (iter_silence_segments, PCMStream, encode_audio, audio_mimetype,
+                            PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH)
+from caching import LRUCache
+import metrics
+from recognition_backends import GoogleBackend
+from summarizer import summarize
+import tone_lexicon
+from translation_client import PooledGoogleTranslator, build_session
+from tts_pool import build_voice_index, render_to_bytes
+
+logger = logging.getLogger(__name__)
+
+# Redefine print to safely handle Unicode encoding errors on console output
+def print(*args, **kwargs):
+    import builtins
+    try:
+        builtins.print(*args, **kwargs)
+    except UnicodeEncodeError:
+        new_args = []
+        for arg in args:
+            if isinstance(arg, str):
+                new_args.append(arg.encode('ascii', 'backslashreplace').decode('ascii'))
+            else:
+                new_args.append(arg)
+        try:
+            builtins.print(*new_args, **kwargs)
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+# Map simple language codes to standard locales for Google Speech Recognition
+LANG_MAP = {
+    "en": "en-US",
+    "hi": "hi-IN",
+    "es": "es-ES",
+    "fr": "fr-FR",
+    "de": "de-DE",
+    "it": "it-IT",
+    "ja": "ja-JP",
+    "ko": "ko-KR",
+    "zh-cn": "zh-CN",
+    "ru": "ru-RU",
+    "ar": "ar-SA"
+}
+
+def resolve_locale(language):
+    """Resolve a simple language code (e.g. 'hi') to the recognizer locale (e.g. 'hi-IN')."""
+    if not isinstance(language, str):
+        return language
+    return LANG_MAP.get(language.lower(), language)
+
+_ffmpeg_ready = False
+_ffmpeg_lock = threading.Lock()
+
+def ensure_ffmpeg():
+    """Put the bundled ffmpeg binaries on PATH, once, the first time audio needs converting."""
+    global _ffmpeg_ready
+    if _ffmpeg_ready:
+        return
+    with _ffmpeg_lock:
+        if not _ffmpeg_ready:
+            import static_ffmpeg
+            static_ffmpeg.add_paths()
+            _ffmpeg_ready = True
+
+def normalize_text(text):
+    """Collapse whitespace within each line so trivially different inputs share cache entries."""
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines() if line.strip())
+
+# Paragraph breaks (a blank line), and the space after a sentence end (incl. danda and CJK stops)
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?।。！？])\s+")
+
+def normalize_paragraphs(text):
+    """normalize_text, but keeping one blank line between paragraphs (translations preserve them)."""
+    paragraphs = (normalize_text(paragraph) for paragraph in PARAGRAPH_BREAK.split(text.strip()))
+    return "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+
+def split_for_translation(text, max_chars):
+    """
+    Split text into [(chunk, separator)] with every chunk at most max_chars long, such
+    that ''.join(chunk + separator) gives back the text. Whole paragraphs are packed
+    together while they fit; longer paragraphs are split between sentences, and only a
+    single sentence longer than max_chars is cut, at the last space that fits.
+    """
+    # Pieces that must not be split further, each with the whitespace that followed it
+    pieces = []
+
+    def add_piece(piece, separator):
+        # An empty piece (whitespace left over by a cut) only extends the previous separator
+        if not piece and pieces:
+            pieces[-1] = (pieces[-1][0], pieces[-1][1] + separator)
+        else:
+            pieces.append((piece, separator))
+
+    position = 0
+    for match in list(PARAGRAPH_BREAK.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        paragraph, separator = text[position:end], match.group() if match else ""
+        position = match.end() if match else len(text)
+        if len(paragraph) <= max_chars:
+            add_piece(paragraph, separator)
+            continue
+        sentence_start = 0
+        for sentence_match in list(SENTENCE_BREAK.finditer(paragraph)) + [None]:
+            sentence_end = sentence_match.start() if sentence_match else len(paragraph)
+            sentence = paragraph[sentence_start:sentence_end]
+            gap = sentence_match.group() if sentence_match else separator
+            sentence_start = sentence_match.end() if sentence_match else len(paragraph)
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars + 1)
+                cut = cut if cut > 0 else max_chars
+                rest = sentence[cut:].lstrip(" ")
+                add_piece(sentence[:cut], sentence[cut:len(sentence) - len(rest)])
+                sentence = rest
+            add_piece(sentence, gap)
+
+    # Pack consecutive pieces into chunks; the separator between chunks is kept out of them
+    chunks = []
+    current, current_separator = None, ""
+    for piece, separator in pieces:
+        if current is not None and len(current) + len(current_separator) + len(piece) > max_chars:
+            chunks.append((current, current_separator))
+            current = None
+        current = piece if current is None else current + current_separator + piece
+        current_separator = separator
+    chunks.append((current, current_separator))
+    return chunks
+
+# Translation cache size and the character budget for one packed batch request
+TRANSLATION_CACHE_ENTRIES = int(os.environ.get("AUDIOFY_TRANSLATION_CACHE_ENTRIES", 10000))
+TRANSLATION_BATCH_CHARS = 4500
+# Longer texts are split at paragraph/sentence boundaries into chunks of at most this
+# many characters (the provider rejects requests over 5000) and translated in parallel
+TRANSLATION_CHUNK_CHARS = int(os.environ.get("AUDIOFY_TRANSLATION_CHUNK_CHARS", TRANSLATION_BATCH_CHARS))
+# Upstream translation requests in flight at once, across all callers
+TRANSLATION_CONCURRENCY = int(os.environ.get("AUDIOFY_TRANSLATION_CONCURRENCY", 8))
+
+# Default text-to-speech rate (words per minute)
+DEFAULT_SPEECH_RATE = 150
+
+# Recordings longer than this are split at pauses and recognized in parallel
+LONG_AUDIO_THRESHOLD_SECONDS = float(os.environ.get("AUDIOFY_LONG_AUDIO_SECONDS", 60))
+LONG_AUDIO_WORKERS = int(os.environ.get("AUDIOFY_LONG_AUDIO_WORKERS", 4))
+
+class SpeechTranslator:
+    def __init__(self, transcription_cache=None, tts_cache=None, vad=None, backends=None, default_backend=None):
+        self.recognizer = sr.Recognizer()
+        # Recognition engines by name; Google is always available, others are added from config
+        self.backends = {"google": GoogleBackend(self.recognizer)}
+        for backend in backends or []:
+            self.backends[backend.name] = backend
+        self.default_backend = default_backend or "google"
+        if self.default_backend not in self.backends:
+            raise ValueError(f"Unknown recognition backend: {self.default_backend}")
+        # Optional vad.VoiceActivityDetector; trims non-speech before recognition
+        self.vad = vad
+        # The TTS engine is started on first use (see the engine property)
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        # pyttsx3 engines are not thread-safe; all speaking/rendering goes through this lock
+        self._tts_lock = threading.RLock()
+        # Optional caching.DiskLRUCache of rendered speech clips
+        self.tts_cache = tts_cache
+        # Language -> voice id, filled in when the engine starts
+        self.voice_index = {}
+        # Optional caching.TranscriptionCache shared by all transcriptions
+        self.transcription_cache = transcription_cache
+        # Translations keyed by (src, dest, normalized text), and one client per language pair;
+        # every client shares one keep-alive connection pool, and the semaphore bounds
+        # how many requests are in flight on it
+        self.translation_cache = LRUCache(max_entries=TRANSLATION_CACHE_ENTRIES, name="translation")
+        self._translators = {}
+        self._translators_lock = threading.Lock()
+        self.translation_session = build_session(TRANSLATION_CONCURRENCY)
+        self._translation_slots = threading.BoundedSemaphore(TRANSLATION_CONCURRENCY)
+        
+        # Available languages (ISO 639-1 codes)
+        self.languages = {
+            "en": "English",
+            "hi": "Hindi",
+            "es": "Spanish",
+            "fr": "French",
+            "de": "German",
+            "it": "Italian",
+            "ja": "Japanese",
+            "ko": "Korean",
+            "zh-CN": "Chinese (Simplified)",
+            "ru": "Russian",
+            "ar": "Arabic"
+        }
+
+    @property
+    def engine(self):
+        """The pyttsx3 engine, initialized (with the Indian English voice) on first access."""
+        return self._ensure_engine()
+
+    def _ensure_engine(self):
+        """Start the pyttsx3 engine and build the voice index, once; returns the engine."""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    import pyttsx3
+                    engine = pyttsx3.init()
+                    voices = engine.getProperty('voices')
+
+                    # Print available voices for debugging
+                    print("\nAvailable voices:")
+                    for i, voice in enumerate(voices):
+                        print(f"Voice {i}: {voice.name} ({voice.id})")
+
+                    # Index voices by language once instead of scanning them on every request
+                    self.voice_index = build_voice_index(voices)
+                    self._engine = engine
+                    # Set up Indian English voice if available
+                    self.setup_indian_voice()
+        return self._engine
+
+    def setup_indian_voice(self):
+        """Set the default voice (Indian English if one was found), rate and volume"""
+        indian_voice = self.voice_index.get("default")
+        
+        # Set default voice to Indian if found, otherwise use system default
+        if indian_voice:
+            self.engine.setProperty('voice', indian_voice)
+        
+        # Adjust speech rate and volume
+        self.engine.setProperty('rate', DEFAULT_SPEECH_RATE)  # Speed of speech
+        self.engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
+    
+    def list_languages(self):
+        """Display available languages"""
+        print("\nAvailable languages:")
+        for code, name in self.languages.items():
+            print(f"  {code}: {name}")
+    
+    def get_backend(self, name=None):
+        """The named recognition backend (the configured default for None); ValueError if unknown."""
+        name = name or self.default_backend
+        if name not in self.backends:
+            raise ValueError(f"Unknown recognition backend: {name}")
+        return self.backends[name]
+
+    def _cache_locale(self, language, backend, long_audio=None):
+        # Transcripts differ per engine, so non-Google results are cached under their own key,
+        # and a forced segmented or single-shot recognition under its own mode
+        name = self.get_backend(backend).name
+        locale = language if name == "google" else f"{language}|{name}"
+        if long_audio is not None:
+            locale += "|segmented" if long_audio else "|single"
+        return locale
+
+    def recognize_speech(self, language="en-US", backend=None):
+        """Recognize speech from the microphone."""
+        recognizer = sr.Recognizer()
+
+        with sr.Microphone() as source:
+            print("Adjusting for ambient noise... Please wait.")
+            recognizer.adjust_for_ambient_noise(source, duration=1)
+            print("Listening...")
+            try:
+                audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
+                print("Processing speech...")
+                text = self.get_backend(backend).recognize(audio, language)
+                try:
+                    print(f"Recognized: {text}")
+                except UnicodeEncodeError:
+                    print("Recognized text (contains non-ASCII characters, printed safely to API)")
+                return text
+            except sr.WaitTimeoutError:
+                print("Listening timed out waiting for phrase to start")
+                return None
+            except sr.UnknownValueError:
+                print("Could not understand audio")
+                return None
+            except sr.RequestError as e:
+                print(f"Recognition error: {e}")
+                return None
+    
+    def _get_translator(self, src, dest):
+        """Return the shared translation client for a language pair."""
+        with self._translators_lock:
+            client = self._translators.get((src, dest))
+            if client is None:
+                client = PooledGoogleTranslator(source=src, target=dest, session=self.translation_session)
+                self._translators[(src, dest)] = client
+            return client
+
+    def _translate_upstream(self, text, src, dest):
+        client = self._get_translator(src, dest)
+        with self._translation_slots, metrics.stage("translate", "google"):
+            return client.translate(text)
+
+    def translate_text(self, text, src="auto", dest="en", max_chars=None):
+        """
+        Translate text from source language to destination language.
+        Text longer than max_chars (TRANSLATION_CHUNK_CHARS) is translated in chunks.
+        """
+        # Paragraph breaks survive translation, so texts differing in them are cached apart
+        key = (src, dest, normalize_paragraphs(text))
+        cached = self.translation_cache.get(key)
+        if cached is not None:
+            return cached
+        max_chars = max_chars or TRANSLATION_CHUNK_CHARS
+        if len(text.strip()) > max_chars:
+            translated_text = self._translate_chunked(text, src, dest, max_chars)
+            if translated_text:
+                self.translation_cache.put(key, translated_text)
+            return translated_text
+        try:
+            translated_text = self._translate_upstream(text, src, dest)
+        
+            # Debugging: Log the translation process
+            try:
+                print(f"Translating from {src} to {dest}: '{text}' -> '{translated_text}'")
+            except UnicodeEncodeError:
+                print(f"Translating from {src} to {dest}: [text translation printed to log safely]")
+
+            if translated_text:
+                self.translation_cache.put(key, translated_text)
+            return translated_text
+        except Exception as e:
+            print(f"Translation error: {e}")
+            return None
+
+    def _translate_chunked(self, text, src, dest, max_chars):
+        """
+        Translate a long text as sentence-aligned chunks, in parallel, and rejoin them
+        in order with the original paragraph breaks. None if any chunk fails.
+        """
+        chunks = split_for_translation(text.strip(), max_chars)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(len(chunks), TRANSLATION_CONCURRENCY),
+                                thread_name_prefix="translate-chunk") as pool:
+            translations = list(pool.map(lambda chunk: self.translate_text(chunk[0], src=src, dest=dest,
+                                                                           max_chars=max_chars), chunks))
+        logger.info(f"Chunked translation from {src} to {dest}: {len(text)} chars in {len(chunks)} chunks, "
+                    f"{time.perf_counter() - started:.2f}s")
+        if any(translation is None for translation in translations):
+            return None
+        return "".join(translation + separator for translation, (_, separator) in zip(translations, chunks))
+
+    def translate_batch(self, texts, src="auto", dest="en"):
+        """
+        Translate a list of texts, returning translations in the same order (None on failure).
+        Cached texts are answered locally; the remaining single-line texts are packed
+        newline-separated into as few upstream requests as the provider size limit allows.
+        Texts share cache entries with translate_text.
+        """
+        results = [None] * len(texts)
+        misses = {}  # cache key (normalize_paragraphs) -> indexes waiting on it
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = text
+                continue
+            normalized = normalize_paragraphs(text)
+            cached = self.translation_cache.get((src, dest, normalized))
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.setdefault(normalized, []).append(i)
+
+        if not misses:
+            return results
+
+        # Multi-line texts can't be packed unambiguously, so they go upstream on their own,
+        # as written, keeping their line and paragraph breaks
+        packable = [t for t, indexes in misses.items() if "\n" not in texts[indexes[0]].strip()]
+        singles = [t for t, indexes in misses.items() if "\n" in texts[indexes[0]].strip()]
+        batch, batch_len = [], 0
+        batches = []
+        for text in packable:
+            if batch and batch_len + len(text) + 1 > TRANSLATION_BATCH_CHARS:
+                batches.append(batch)
+                batch, batch_len = [], 0
+            batch.append(text)
+            batch_len += len(text) + 1
+        if batch:
+            batches.append(batch)
+
+        translated = {}
+        for batch in batches:
+            lines = None
+            try:
+                joined = self._translate_upstream("\n".join(batch), src, dest)
+                lines = joined.split("\n") if joined else None
+            except Exception as e:
+                logger.error(f"Batch translation error: {e}")
+            if lines is not None and len(lines) == len(batch):
+                translated.update(zip(batch, (line.strip() for line in lines)))
+            else:
+                # The provider merged or split lines; fall back to one request per text
+                singles.extend(batch)
+
+        for text in singles:
+            translated[text] = self.translate_text(texts[misses[text][0]], src=src, dest=dest)
+
+        logger.info(f"Batch translation from {src} to {dest}: {len(texts)} texts, {len(misses)} sent upstream")
+        for normalized, indexes in misses.items():
+            value = translated.get(normalized)
+            if value:
+                self.translation_cache.put((src, dest, normalized), value)
+            for i in indexes:
+                results[i] = value
+        return results
+
+    def translate_targets(self, text, src="auto", dests=("en",)):
+        """
+        Translate text (a string, or a list for translate_batch) into several languages
+        at once. Returns {dest: translation}, with None for a target that failed. The
+        targets run concurrently, so the total time is close to the slowest one.
+        """
+        translate = self.translate_batch if isinstance(text, list) else self.translate_text
+        dests = list(dict.fromkeys(dests))
+        with ThreadPoolExecutor(max_workers=max(1, min(len(dests), TRANSLATION_CONCURRENCY)),
+                                thread_name_prefix="translate") as pool:
+            futures = {dest: pool.submit(translate, text, src=src, dest=dest) for dest in dests}
+        return {dest: future.result() for dest, future in futures.items()}
+    
+    def _select_voice(self, language):
+        """Return the voice id to use for a language, or None to keep the default voice."""
+        # For English, use the Indian English voice set up in setup_indian_voice()
+        if language == "en":
+            return None
+        # The voice index is built when the engine starts
+        self._ensure_engine()
+        return self.voice_index.get(language)
+
+    def speak_text(self, text, language="en"):
+        """Convert text to speech"""
+        if not text:
+            return
+        
+        with self._tts_lock:
+            # Set voice properties based on language
+            voice_id = self._select_voice(language)
+            if voice_id:
+                self.engine.setProperty('voice', voice_id)
+                print(f"Using voice: {voice_id}")
+            
+            # Speak the text
+            self.engine.say(text)
+            self.engine.runAndWait()
+            
+            # Reset to default Indian English voice after speaking
+            self.setup_indian_voice()
+
+    def synthesize_speech(self, text, language="en", rate=None, audio_format="wav", tts_pool=None):
+        """
+        Render text to speech and return (audio_bytes, mimetype) instead of playing it
+        on the server. Rendering runs on tts_pool (a tts_pool.TTSWorkerPool) when given,
+        otherwise on this process's engine. Clips are served from the TTS cache when the
+        same (text, language, voice, rate, format) was rendered before.
+        """
+        rate = int(rate or DEFAULT_SPEECH_RATE)
+        if tts_pool is not None:
+            voice_id = tts_pool.voice_index.get(language) or tts_pool.voice_index.get("default")
+        else:
+            # The voice index (and so the cache key) is only complete once the engine has started
+            self._ensure_engine()
+            voice_id = self._select_voice(language) or self.voice_index.get("default")
+
+        cache_key = None
+        if self.tts_cache is not None:
+            cache_key = "\0".join([text, language, voice_id or "system", str(rate), audio_format])
+            cached = self.tts_cache.get(cache_key)
+            if cached is not None:
+                return cached, audio_mimetype(cached)
+
+        with metrics.stage("tts"):
+            if tts_pool is not None:
+                audio = tts_pool.render(text, language=language, rate=rate)
+            else:
+                with self._tts_lock:
+                    audio = render_to_bytes(self.engine, text, voice_id, rate)
+                    # Reset to default Indian English voice after rendering
+                    self.setup_indian_voice()
+
+        if audio_format != "wav":
+            ensure_ffmpeg()
+            with metrics.stage("encode"):
+                audio = encode_audio(audio, audio_format)
+
+        if cache_key is not None:
+            self.tts_cache.put(cache_key, audio)
+        return audio, audio_mimetype(audio)
+
+    # Add a method to transcribe audio files
+    def transcribe_audio_file(self, file_path, language="en-US", long_audio=None, details=None, backend=None):
+        """
+        Transcribe an uploaded audio file into text.
+        long_audio forces (True) or disables (False) segmented parallel recognition;
+        by default it is used for files longer than LONG_AUDIO_THRESHOLD_SECONDS.
+        backend names the recognition engine (see self.backends); None uses the default.
+        If a details dict is passed, per-segment results, the cache status and
+        per-stage stats are stored in it.
+        """
+        language = resolve_locale(language)
+        if details is None:
+            details = {}
+        stats = details.setdefault("stats", {})
+        stats.setdefault("decode_mode", "disk")
+        stats.setdefault("bytes_written", 0)
+
+        # Check if file exists
+        if not os.path.exists(file_path):
+            print(f"File not found: {file_path}")
+            return None
+
+        # Serve repeat uploads from the transcription cache without decoding or recognizing
+        cache_locale = self._cache_locale(language, backend, long_audio)
+        cache_key, cached = self._cache_lookup(lambda cache: cache.key_for_file(file_path, cache_locale), details)
+        if cached is not None:
+            return cached
+
+        text = self._transcribe_file(file_path, language, long_audio, details, backend)
+        self._finish_vad_stats(stats)
+        self._cache_store(cache_key, text, details)
+        return text
+
+    def transcribe_audio_bytes(self, data, language="en-US", long_audio=None, details=None, backend=None):
+        """
+        Transcribe uploaded audio held in memory. The bytes are piped through ffmpeg to
+        16 kHz mono PCM and handed to the recognizer without touching disk. Only the
+        first LONG_AUDIO_THRESHOLD_SECONDS are decoded up front; a longer recording is
+        segmented as ffmpeg decodes the rest, so its whole PCM is never held at once.
+        Raises AudioDecodeError if ffmpeg cannot decode the input, so callers can fall
+        back to the disk path; otherwise behaves like transcribe_audio_file.
+        """
+        language = resolve_locale(language)
+        if details is None:
+            details = {}
+        stats = details.setdefault("stats", {})
+        stats.update(decode_mode="memory", bytes_written=0, input_bytes=len(data))
+
+        cache_locale = self._cache_locale(language, backend, long_audio)
+        cache_key, cached = self._cache_lookup(lambda cache: cache.key_for_bytes(data, cache_locale), details)
+        if cached is not None:
+            return cached
+
+        ensure_ffmpeg()
+        threshold_bytes = int(LONG_AUDIO_THRESHOLD_SECONDS * PCM_SAMPLE_RATE) * PCM_SAMPLE_WIDTH
+        with PCMStream(data) as stream:
+            started = time.perf_counter()
+            with metrics.stage("decode"):
+                pcm = stream.read() if long_audio is False else stream.read(threshold_bytes + PCM_SAMPLE_WIDTH)
+            stats["decode_seconds"] = round(time.perf_counter() - started, 4)
+            if not pcm:
+                # Raises AudioDecodeError with ffmpeg's message
+                stream.close()
+            if long_audio is None:
+                long_audio = len(pcm) > threshold_bytes
+            text = self._recognize_pcm(pcm, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH, language, long_audio, details, backend,
+                                       read_more=stream.read)
+        stats["pcm_bytes"] = stream.bytes_read
+        self._finish_vad_stats(stats)
+        self._cache_store(cache_key, text, details)
+        return text
+
+    def _cache_lookup(self, make_key, details):
+        """Return (cache_key, cached_text); the key is None when caching is off or unavailable."""
+        if self.transcription_cache is None:
+            return None, None
+        try:
+            cache_key = make_key(self.transcription_cache)
+            cached = self.transcription_cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Transcription cache unavailable: {e}")
+            return None, None
+        if cached:
+            logger.info("Transcription served from cache")
+            details["cache"] = "hit"
+            if cached["segments"]:
+                details["segments"] = cached["segments"]
+            return cache_key, cached["text"]
+        details["cache"] = "miss"
+        return cache_key, None
+
+    def _cache_store(self, cache_key, text, details):
+        # A transcript with failed segments is not cached, so a re-upload retries them
+        if text and cache_key is not None and not details.get("partial"):
+            try:
+                self.transcription_cache.put(cache_key, text, details.get("segments"))
+            except Exception as e:
+                logger.warning(f"Failed to store transcription in cache: {e}")
+
+    def _apply_vad(self, pcm, sample_rate, sample_width, stats):
+        """Drop non-speech from PCM with the configured VAD, adding its numbers to stats["vad"]."""
+        if self.vad is None or sample_width != 2 or not pcm:
+            return pcm
+        with metrics.stage("vad"):
+            kept, result = self.vad.trim(pcm, sample_rate)
+        vad_stats = stats.setdefault("vad", {"input_seconds": 0.0, "kept_seconds": 0.0, "bytes_saved": 0,
+                                             "vad_seconds": 0.0, "skipped_segments": 0})
+        for key in ("input_seconds", "kept_seconds", "bytes_saved", "vad_seconds"):
+            vad_stats[key] += result[key]
+        if not kept:
+            vad_stats["skipped_segments"] += 1
+        return kept
+
+    def _finish_vad_stats(self, stats):
+        """Add the kept ratio and the estimated recognition time saved to stats["vad"]."""
+        vad_stats = stats.get("vad")
+        if not vad_stats:
+            return
+        input_seconds, kept_seconds = vad_stats["input_seconds"], vad_stats["kept_seconds"]
+        vad_stats["kept_ratio"] = round(kept_seconds / input_seconds, 4) if input_seconds else 1.0
+        # Recognition time grows with audio length, so the dropped audio would have cost
+        # about recognize_seconds * dropped / kept more
+        recognize_seconds = stats.get("recognize_seconds")
+        if recognize_seconds is not None and kept_seconds:
+            vad_stats["recognize_seconds_saved"] = round(
+                recognize_seconds * (input_seconds - kept_seconds) / kept_seconds, 4)
+        for key in ("input_seconds", "kept_seconds", "vad_seconds"):
+            vad_stats[key] = round(vad_stats[key], 4)
+
+    def _transcribe_file(self, file_path, language, long_audio, details, backend=None):
+        """Decode and recognize an audio file on disk; language must already be a resolved locale."""
+        stats = details["stats"]
+        decode_started = time.perf_counter()
+        try:
+            # Convert audio file to WAV format if necessary (PCM WAV is read without ffmpeg)
+            if not file_path.endswith(".wav"):
+                try:
+                    ensure_ffmpeg()
+                    from pydub import AudioSegment
+                    with metrics.stage("convert"):
+                        audio = AudioSegment.from_file(file_path)
+                        wav_path = file_path.rsplit(".", 1)[0] + ".wav"
+                        audio.export(wav_path, format="wav")
+                    file_path = wav_path
+                    stats["bytes_written"] += os.path.getsize(wav_path)
+                    print(f"Converted audio to WAV: {file_path}")
+                except ImportError:
+                    print("pydub not available, trying to process file directly")
+                except Exception as e:
+                    print(f"Error converting audio to WAV: {e}")
+                    return None
+
+            # Make sure speech_recognition can read the file, converting to PCM WAV if needed
+            try:
+                with sr.AudioFile(file_path) as source:
+                    duration = source.DURATION
+            except Exception as e:
+                print(f"Failed to read file directly with speech_recognition: {e}. Trying conversion to standard PCM WAV...")
+                # If reading directly failed (e.g. not a PCM wav file), convert it using pydub
+                try:
+                    ensure_ffmpeg()
+                    from pydub import AudioSegment
+                    with metrics.stage("convert"):
+                        audio = AudioSegment.from_file(file_path)
+                        # Convert to standard mono 16kHz PCM WAV
+                        audio = audio.set_frame_rate(16000).set_channels(1)
+                        pcm_wav_path = file_path.rsplit(".", 1)[0] + "_pcm.wav"
+                        audio.export(pcm_wav_path, format="wav", codec="pcm_s16le")
+                    file_path = pcm_wav_path
+                    stats["bytes_written"] += os.path.getsize(pcm_wav_path)
+                    print(f"Successfully converted audio to PCM WAV: {file_path}")
+                    with sr.AudioFile(file_path) as source:
+                        duration = source.DURATION
+                except Exception as convert_error:
+                    print(f"Error converting to PCM WAV: {convert_error}")
+                    return None
+
+            if long_audio is None:
+                long_audio = duration > LONG_AUDIO_THRESHOLD_SECONDS
+
+            # Long recordings: recognize silence-delimited segments concurrently
+            if long_audio:
+                stats["decode_seconds"] = round(time.perf_counter() - decode_started, 4)
+                recognize_started = time.perf_counter()
+                segments = self.transcribe_long_audio(file_path, language=language, stats=stats, backend=backend)
+                stats["recognize_seconds"] = round(time.perf_counter() - recognize_started, 4)
+                return self._join_segments(segments, duration, details)
+
+            # Load and read the audio file
+            with metrics.stage("read_audio"), sr.AudioFile(file_path) as source:
+                print("Processing audio file directly...")
+                audio_data = self.recognizer.record(source)
+            stats["decode_seconds"] = round(time.perf_counter() - decode_started, 4)
+
+            if not audio_data:
+                print("Failed to obtain audio data from file.")
+                return None
+
+            if self.vad is not None:
+                pcm = self._apply_vad(audio_data.get_raw_data(convert_width=2), audio_data.sample_rate, 2, stats)
+                if not pcm:
+                    logger.info("No speech detected in the audio.")
+                    return None
+                audio_data = sr.AudioData(pcm, audio_data.sample_rate, 2)
+
+            return self._recognize_audio_data(audio_data, language, stats, backend)
+
+        except sr.UnknownValueError:
+            print("Could not understand the audio.")
+            return None
+        except sr.RequestError as e:
+            print(f"Error with the speech recognition service: {e}")
+            return None
+        except Exception as e:
+            print(f"Error processing audio file: {e}")
+            return None
+
+    def _recognize_pcm(self, pcm, sample_rate, sample_width, language, long_audio, details, backend=None,
+                       read_more=None):
+        """
+        Recognize raw mono PCM held in memory. For segmented recognition, read_more(size)
+        returns the PCM that follows pcm (still being decoded), b'' at its end.
+        """
+        stats = details["stats"]
+        if long_audio is None:
+            long_audio = len(pcm) / (sample_rate * sample_width) > LONG_AUDIO_THRESHOLD_SECONDS
+        try:
+            if long_audio:
+                # BytesIO shares the decoded buffer rather than copying it
+                buffer = io.BytesIO(pcm)
+
+                def read_frames(frames):
+                    size = frames * sample_width
+                    chunk = buffer.read(size)
+                    if len(chunk) < size and read_more is not None:
+                        chunk += read_more(size - len(chunk))
+                    return chunk
+
+                recognize_started = time.perf_counter()
+                segments = self._recognize_segments(read_frames, sample_rate, sample_width, language, stats=stats,
+                                                    backend=backend)
+                stats["recognize_seconds"] = round(time.perf_counter() - recognize_started, 4)
+                duration = segments[-1]["end"] if segments else 0.0
+                return self._join_segments(segments, duration, details)
+
+            pcm = self._apply_vad(pcm, sample_rate, sample_width, stats)
+            if not pcm:
+                logger.info("No speech detected in the audio.")
+                return None
+            audio_data = sr.AudioData(pcm, sample_rate, sample_width)
+            return self._recognize_audio_data(audio_data, language, stats, backend)
+        except sr.UnknownValueError:
+            print("Could not understand the audio.")
+            return None
+        except sr.RequestError as e:
+            print(f"Error with the speech recognition service: {e}")
+            return None
+        except Exception as e:
+            print(f"Error processing audio: {e}")
+            return None
+
+    def _recognize_audio_data(self, audio_data, language, stats, backend=None):
+        # Recognize speech in the audio file
+        engine = self.get_backend(backend)
+        stats["backend"] = engine.name
+        recognize_started = time.perf_counter()
+        text = self._recognize_with(engine, audio_data, language)
+        stats["recognize_seconds"] = round(time.perf_counter() - recognize_started, 4)
+        try:
+            print(f"Transcription: {text}")
+        except UnicodeEncodeError:
+            print("Transcription contains non-ASCII characters, printed safely to API")
+        return text
+
+    def _join_segments(self, segments, duration, details):
+        """
+        Stitch segment transcripts in order, keeping the per-segment offsets in details.
+        Segments the recognition service failed on carry an "error"; the transcript of
+        the rest is still returned, with details["partial"] set and the failures counted.
+        """
+        details["segments"] = segments
+        failed = sum(1 for segment in segments if segment.get("error"))
+        if failed:
+            details["partial"] = True
+            details["failed_segments"] = failed
+            logger.warning(f"Recognition failed on {failed} of {len(segments)} segments")
+        text = " ".join(segment["text"] for segment in segments if segment["text"])
+        if not text:
+            print("Could not understand the audio.")
+            return None
+        logger.info(f"Transcribed {len(segments)} segments ({duration:.1f}s of audio)")
+        return text
+
+    def _recognize_with(self, engine, audio_data, language):
+        # No speech is an answer, not a backend failure
+        with metrics.stage("recognize", engine.name, expected=(sr.UnknownValueError,)):
+            return engine.recognize(audio_data, language)
+
+    def _recognize_segment(self, audio_data, language, backend=None):
+        """
+        Recognize one segment of a long recording. Returns (text, error): text is ''
+        when nothing was understood, error the message when the service failed.
+        """
+        try:
+            return self._recognize_with(self.get_backend(backend), audio_data, language), None
+        except sr.UnknownValueError:
+            return "", None
+        except sr.RequestError as e:
+            logger.error(f"Error with the speech recognition service on segment: {e}")
+            return "", str(e) or type(e).__name__
+
+    def recognize_utterance(self, pcm, sample_rate=PCM_SAMPLE_RATE, sample_width=PCM_SAMPLE_WIDTH, language="en-US",
+                            backend=None):
+        """Recognize one short utterance of raw mono PCM (e.g. from a live stream); '' if nothing was understood."""
+        audio_data = sr.AudioData(pcm, sample_rate, sample_width)
+        text, _ = self._recognize_segment(audio_data, resolve_locale(language), backend)
+        return text
+
+    def transcribe_long_audio(self, file_path, language="en-US", max_workers=LONG_AUDIO_WORKERS, stats=None,
+                              backend=None):
+        """
+        Transcribe a long PCM WAV file by splitting it at pauses and recognizing the
+        segments on a thread pool. Returns a list of {index, start, end, text} dicts
+        in playback order, with an "error" on segments the service failed on. VAD stats are added to stats when a dict is passed.
+        """
+        with sr.AudioFile(file_path) as source:
+            return self._recognize_segments(source.stream.read, source.SAMPLE_RATE, source.SAMPLE_WIDTH,
+                                            language, max_workers, stats, backend)
+
+    def _recognize_segments(self, read_frames, sample_rate, sample_width, language, max_workers=LONG_AUDIO_WORKERS,
+                            stats=None, backend=None):
+        """
+        Split a PCM stream at pauses and recognize the segments concurrently.
+        At most 2 * max_workers segments are held in memory at once. Each segment is
+        trimmed by the VAD first, and segments with no speech are not sent at all.
+        """
+        results = []
+        pending = deque()
+        if stats is not None:
+            stats["backend"] = self.get_backend(backend).name
+
+        def collect_oldest():
+            index, start, end, future = pending.popleft()
+            text, error = future.result() if future is not None else ("", None)
+            segment = {"index": index, "start": round(start, 2), "end": round(end, 2), "text": text}
+            if error:
+                segment["error"] = error
+            results.append(segment)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            segments = iter_silence_segments(read_frames, sample_rate, sample_width)
+            for index, (start, pcm) in enumerate(segments):
+                end = start + len(pcm) / (sample_rate * sample_width)
+                if stats is not None:
+                    pcm = self._apply_vad(pcm, sample_rate, sample_width, stats)
+                future = None
+                if pcm:
+                    audio_data = sr.AudioData(pcm, sample_rate, sample_width)
+                    future = pool.submit(self._recognize_segment, audio_data, language, backend)
+                pending.append((index, start, end, future))
+                # Back-pressure: don't decode further ahead than the workers can consume
+                while len(pending) >= max_workers * 2:
+                    collect_oldest()
+            while pending:
+                collect_oldest()
+
+        return results
+
+    # Add a method to detect tone
+    def detect_tone(self, text):
+        """
+        Detect the emotional tone of the text using a more sophisticated approach.
+        Returns one of: Happy, Sad, Angry, Neutral, Excited, Worried, Confused
+        """
+        if not text:
+            return "Neutral"
+        
+        try:
+            # Try to use TextBlob for sentiment analysis if available
+            from textblob import TextBlob
+            
+            # Get sentiment polarity (-1 to 1) and subjectivity (0 to 1)
+            analysis = TextBlob(text)
+            polarity = analysis.sentiment.polarity
+            subjectivity = analysis.sentiment.subjectivity
+            
+            # Determine tone based on polarity and subjectivity
+            if polarity > 0.5:
+                return "Happy" if subjectivity < 0.6 else "Excited"
+            elif polarity > 0.1:
+                return "Happy"
+            elif polarity < -0.5:
+                return "Angry" if "!" in text else "Sad"
+            elif polarity < -0.1:
+                return "Sad"
+            else:
+                # Check for question marks to detect confusion
+                if "?" in text and text.count("?") > 1:
+                    return "Confused"
+                # Check for specific worry indicators
+                elif any(word in text.lower() for word in ["worry", "worried", "concern", "afraid", "fear", "anxious"]):
+                    return "Worried"
+                else:
+                    return "Neutral"
+        
+        except ImportError:
+            # Fallback to the compiled keyword lexicon
+            return tone_lexicon.detect_tone(text)
+
+    def detect_tones(self, texts):
+        """Keyword-based tone for many texts at once (no TextBlob, one lexicon scan per text)."""
+        return tone_lexicon.detect_tones(texts)
+
+    # Improved method to generate a summary
+    def generate_summary(self, text, num_sentences=None, ratio=None):
+        """
+        Generate an extractive TF-IDF summary of the text.
+        Keeps num_sentences sentences (default 3) or the given ratio of them.
+        """
+        if not text or len(text) < 50:
+            return "Text is too short to summarize."
+        
+        return summarize(text, num_sentences=num_sentences, ratio=ratio)
+
+# Function to calculate Word Error Rate (WER)
+# def calculate_wer(reference, hypothesis):
+#     """
+#     Calculate the Word Error Rate (WER) between the reference and hypothesis.
+#     :param reference: The ground truth text.
+#     :param hypothesis: The transcribed text.
+#     :return: WER as a percentage.
+#     """
+#     error_rate = wer(reference, hypothesis)
+#     print(f"WER: {error_rate * 100:.2f}%")
+#     return error_rate
+
+if __name__ == "__main__":
+    # Example usage of the SpeechTranslator class
+    translator = SpeechTranslator()
+    result = translator.translate_text("नमस्ते", src="hi", dest="en")
+    print(result)  # Expected output: "Hello"
+
+    reference_text = "This is the correct transcription."
+    transcribed_text = "This is the transcription."
+
+    # Calculate WER
+    # error_rate = calculate_wer(reference_text, transcribed_text)
+    # print(f"Word Error Rate: {error_rate * 100:.2f}%")
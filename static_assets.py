@@ -0,0 +1,158 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Brotli is optional; without it only gzip variants are precomputed
+try:
+    import brotli
+    brotli_available = True
+except ImportError:
+    brotli_available = False
+
+# Files under the repo root that may be served: the front-end's pages, scripts, styles,
+# images and fonts. Everything else (sources, databases, uploads, caches, stray .txt
+# or .json files such as test output) is never put in the manifest
+STATIC_EXTENSIONS = {
+    '.html', '.js', '.mjs', '.css', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico',
+    '.woff', '.woff2', '.ttf'
+}
+SKIP_DIRS = {'__pycache__', 'node_modules', 'frontend', 'benchmarks', 'uploads', 'tts_cache', 'profiles',
+             'venv', 'env', 'virtualenv', 'site-packages'}
+
+
+def is_skipped_dir(directory, name):
+    """True for directories never walked from the repo root: SKIP_DIRS and any virtualenv (it has a pyvenv.cfg)."""
+    return name in SKIP_DIRS or os.path.isfile(os.path.join(directory, name, 'pyvenv.cfg'))
+
+COMPRESSIBLE_TYPES = {'application/javascript', 'text/javascript', 'application/json', 'image/svg+xml'}
+MIN_COMPRESS_BYTES = 1024
+# Larger files are streamed from disk instead of being held in memory
+MAX_INLINE_BYTES = 4 * 1024 * 1024
+
+# Vite bundles carry a content hash in their name (assets/index-B6xL2k9a.js)
+HASHED_ASSET = re.compile(r'(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.\w+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+class StaticAsset:
+    """One servable file: its identity bytes plus precompressed variants and their ETags."""
+
+    def __init__(self, url_path, file_path):
+        self.url_path = url_path
+        self.file_path = file_path
+        stat = os.stat(file_path)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        mimetype, _ = mimetypes.guess_type(file_path)
+        self.mimetype = mimetype or 'application/octet-stream'
+        self.immutable = bool(HASHED_ASSET.search(url_path))
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if self.immutable else REVALIDATE_CACHE_CONTROL
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        self.etag = digest.hexdigest()[:20]
+
+        self.body = None
+        # encoding -> (bytes, etag); each encoding gets its own ETag as the bytes differ
+        self.variants = {}
+        if self.size <= MAX_INLINE_BYTES:
+            with open(file_path, 'rb') as f:
+                self.body = f.read()
+            if self.compressible and self.size >= MIN_COMPRESS_BYTES:
+                self._precompress()
+
+    @property
+    def compressible(self):
+        return self.mimetype.startswith('text/') or self.mimetype in COMPRESSIBLE_TYPES
+
+    def _precompress(self):
+        candidates = {'gzip': gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli_available:
+            candidates['br'] = brotli.compress(self.body, quality=11)
+        for encoding, data in candidates.items():
+            # Only keep a variant if it actually saves bytes
+            if len(data) < self.size * 0.9:
+                self.variants[encoding] = (data, f'{self.etag}-{encoding}')
+
+    def select(self, accept_encodings):
+        """Pick (body, content_encoding, etag) for a request's Accept-Encoding header."""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings[encoding]:
+                data, etag = self.variants[encoding]
+                return data, encoding, etag
+        return self.body, None, self.etag
+
+
+class AssetManifest:
+    """
+    URL path -> StaticAsset for every servable file, built once at startup.
+
+    roots is a list of directories searched in priority order (the first one to
+    provide a path wins). Lookups are dict reads; the disk is only touched again
+    for files too large to hold in memory, or when check_mtime is set (development)
+    and a file has changed since it was indexed.
+    """
+
+    def __init__(self, roots, check_mtime=False):
+        self.roots = roots
+        self.check_mtime = check_mtime
+        self.assets = {}
+
+    def build(self):
+        assets = {}
+        for root in self.roots:
+            if not os.path.isdir(root):
+                continue
+            # frontend/dist is served wholesale; the repo root only for static file types
+            whitelist = os.path.basename(os.path.normpath(root)) != 'dist'
+            for directory, dirs, files in os.walk(root):
+                dirs[:] = sorted(d for d in dirs
+                                 if not d.startswith('.') and not (whitelist and is_skipped_dir(directory, d)))
+                for name in sorted(files):
+                    if name.startswith('.'):
+                        continue
+                    if whitelist and os.path.splitext(name)[1].lower() not in STATIC_EXTENSIONS:
+                        continue
+                    file_path = os.path.join(directory, name)
+                    url_path = os.path.relpath(file_path, root).replace(os.sep, '/')
+                    if url_path not in assets:
+                        assets[url_path] = StaticAsset(url_path, file_path)
+        self.assets = assets
+        compressed = sum(1 for asset in assets.values() if asset.variants)
+        logger.info(f"Static asset manifest: {len(assets)} files, {compressed} precompressed "
+                    f"(brotli {'on' if brotli_available else 'off'})")
+        return self
+
+    def get(self, url_path):
+        asset = self.assets.get(url_path)
+        if asset is not None and self.check_mtime:
+            try:
+                changed = os.stat(asset.file_path).st_mtime != asset.mtime
+            except OSError:
+                self.assets.pop(url_path, None)
+                return None
+            if changed:
+                asset = self.assets[url_path] = StaticAsset(url_path, asset.file_path)
+        return asset
+
+    def stats(self):
+        return {
+            'files': len(self.assets),
+            'immutable': sum(1 for asset in self.assets.values() if asset.immutable),
+            'precompressed': sum(1 for asset in self.assets.values() if asset.variants),
+            'bytes': sum(asset.size for asset in self.assets.values()),
+            'compressed_bytes': {
+                encoding: sum(len(asset.variants[encoding][0]) for asset in self.assets.values()
+                              if encoding in asset.variants)
+                for encoding in ('gzip', 'br')
+            },
+            'brotli': brotli_available
+        }
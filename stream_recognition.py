@@ -0,0 +1,122 @@
+import audioop
+import json
+import logging
+import queue
+import threading
+import time
+
+from audio_pipeline import UtteranceSegmenter, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH
+
+logger = logging.getLogger(__name__)
+
+# Microphone sample rates a client may declare; chunks are resampled to PCM_SAMPLE_RATE
+SUPPORTED_SAMPLE_RATES = (8000, 16000, 22050, 24000, 32000, 44100, 48000)
+
+
+class StreamingRecognitionSession:
+    """
+    One live recognition stream.
+
+    The client sends mono 16-bit little-endian PCM chunks at sample_rate; they are
+    resampled to 16 kHz, cut into utterances by UtteranceSegmenter, and recognized
+    on a single background thread, so receiving never waits on the recognizer.
+    Results are passed to send(message_dict) in order:
+
+        {'type': 'partial', 'utterance': n, 'text': ..., 'start': s}
+        {'type': 'final', 'utterance': n, 'text': ..., 'start': s, 'end': e, 'latency_ms': ms}
+
+    A partial is skipped when newer audio for the recognizer is already queued
+    behind it, so a slow recognizer delays partials rather than piling them up.
+    Finals are never skipped.
+    """
+
+    def __init__(self, recognize, send, language='en-US', sample_rate=PCM_SAMPLE_RATE):
+        if sample_rate not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError(f"Unsupported sample rate: {sample_rate}")
+        self.recognize = recognize
+        self.send = send
+        self.language = language
+        self.sample_rate = sample_rate
+        self.segmenter = UtteranceSegmenter(PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH)
+        self.stats = {'audio_seconds': 0.0, 'utterances': 0, 'partials': 0, 'partials_skipped': 0}
+        self._resample_state = None
+        self._odd_byte = b''
+        self._utterance_index = 0
+        self._closed = False
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='stream-recognizer', daemon=True)
+        self._worker.start()
+
+    def feed(self, chunk):
+        """Add a chunk of client PCM; queues recognition for any utterance events it completes."""
+        chunk = self._odd_byte + chunk
+        # Keep a dangling half sample for the next chunk
+        if len(chunk) % PCM_SAMPLE_WIDTH:
+            chunk, self._odd_byte = chunk[:-1], chunk[-1:]
+        else:
+            self._odd_byte = b''
+        self.stats['audio_seconds'] += len(chunk) / (self.sample_rate * PCM_SAMPLE_WIDTH)
+        if self.sample_rate != PCM_SAMPLE_RATE:
+            chunk, self._resample_state = audioop.ratecv(chunk, PCM_SAMPLE_WIDTH, 1, self.sample_rate,
+                                                         PCM_SAMPLE_RATE, self._resample_state)
+        self._queue_events(self.segmenter.feed(chunk), time.perf_counter())
+
+    def finish(self, timeout=None):
+        """End of audio: recognize the last utterance and wait for every pending result."""
+        self._queue_events(self.segmenter.flush(), time.perf_counter())
+        self._jobs.put(None)
+        self._worker.join(timeout)
+        self.stats['audio_seconds'] = round(self.stats['audio_seconds'], 2)
+        return self.stats
+
+    def close(self):
+        """Stop without flushing (e.g. the client disconnected); queued audio is discarded."""
+        self._closed = True
+        self._jobs.put(None)
+
+    def _queue_events(self, events, received_at):
+        for kind, start, pcm in events:
+            self._jobs.put((kind, self._utterance_index, start, pcm, received_at))
+            if kind == 'final':
+                self._utterance_index += 1
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None or self._closed:
+                return
+            kind, index, start, pcm, received_at = job
+            if kind == 'partial' and not self._jobs.empty():
+                self.stats['partials_skipped'] += 1
+                continue
+            try:
+                text = self.recognize(pcm, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH, self.language) or ''
+            except Exception as e:
+                logger.error(f"Streaming recognition failed: {e}")
+                self._send({'type': 'error', 'utterance': index, 'error': str(e)})
+                continue
+            message = {'type': kind, 'utterance': index, 'text': text, 'start': round(start, 2)}
+            if kind == 'final':
+                self.stats['utterances'] += 1
+                message['end'] = round(start + len(pcm) / (PCM_SAMPLE_RATE * PCM_SAMPLE_WIDTH), 2)
+                message['latency_ms'] = round((time.perf_counter() - received_at) * 1000, 1)
+            else:
+                self.stats['partials'] += 1
+            self._send(message)
+
+    def _send(self, message):
+        try:
+            self.send(message)
+        except Exception as e:
+            # The client is gone; keep draining so finish() returns
+            logger.info(f"Dropping streaming result: {e}")
+
+
+def json_sender(ws):
+    """send() for a websocket: JSON-encode each message, serialized with a lock."""
+    lock = threading.Lock()
+
+    def send(message):
+        with lock:
+            ws.send(json.dumps(message))
+    return send
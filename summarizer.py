@@ -0,0 +1,90 @@
+import re
+
+import numpy as np
+
+# Sentence ends: Latin/Devanagari/CJK terminators, and line breaks between paragraphs
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|(?<=[。！？।॥])\s*|\s*\n+\s*')
+# CJK scripts have no spaces between words, so each character is scored as a term
+_TOKEN = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]|\w+')
+
+STOP_WORDS = frozenset([
+    "the", "a", "an", "and", "or", "but", "is", "are", "was", "were", "in", "on", "at",
+    "to", "for", "with", "by", "about", "like", "from", "of", "that", "this", "there",
+    "it", "as", "be", "been", "have", "has", "had", "do", "does", "did", "so", "we",
+    "you", "they", "he", "she", "i", "my", "our", "your", "their", "its", "not", "no",
+    "will", "would", "can", "could", "should", "just", "then", "than", "also", "which",
+    "what", "when", "where", "who", "how", "all", "any", "some", "into", "out", "up"
+])
+
+DEFAULT_SENTENCES = 3
+
+
+def split_sentences(text):
+    """Split text into sentences on '.', '!', '?', '。', '！', '？', '।', '॥' and line breaks."""
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence and sentence.strip()]
+
+
+def _tokenize(sentence):
+    return [token for token in _TOKEN.findall(sentence.lower())
+            if token not in STOP_WORDS and (len(token) > 2 or not token.isascii())]
+
+
+def score_sentences(sentences):
+    """
+    TF-IDF sentence scores: the summed tf-idf weight of a sentence's terms divided by
+    its term count. Runs in a single pass over the tokens plus vectorized NumPy work.
+    """
+    vocabulary = {}
+    rows, cols, lengths = [], [], np.zeros(len(sentences))
+    for i, sentence in enumerate(sentences):
+        tokens = _tokenize(sentence)
+        lengths[i] = len(tokens)
+        for token in tokens:
+            rows.append(i)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    scores = np.zeros(len(sentences))
+    if not cols:
+        return scores, lengths
+
+    # Sparse sentence x term counts, as (sentence, term) pairs with their multiplicity
+    vocab_size = len(vocabulary)
+    pairs, counts = np.unique(np.asarray(rows, dtype=np.int64) * vocab_size + np.asarray(cols, dtype=np.int64),
+                              return_counts=True)
+    pair_sentences = pairs // vocab_size
+    pair_terms = pairs % vocab_size
+
+    document_frequency = np.bincount(pair_terms, minlength=vocab_size)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+    # Terms frequent across the whole transcript mark its topics, so weight tf by corpus frequency too
+    term_frequency = np.bincount(pair_terms, weights=counts, minlength=vocab_size)
+    weights = counts * idf[pair_terms] * np.log1p(term_frequency[pair_terms])
+
+    scores = np.bincount(pair_sentences, weights=weights, minlength=len(sentences))
+    scores /= np.maximum(lengths, 1)
+    return scores, lengths
+
+
+def summarize(text, num_sentences=None, ratio=None):
+    """
+    Extractive summary of text.
+    Keeps num_sentences sentences (default 3), or ratio (0-1] of them when ratio is given,
+    in their original order.
+    """
+    sentences = split_sentences(text)
+    if ratio is not None:
+        count = max(1, int(round(len(sentences) * ratio)))
+    else:
+        count = num_sentences or DEFAULT_SENTENCES
+    if len(sentences) <= count:
+        return " ".join(sentences)
+
+    scores, lengths = score_sentences(sentences)
+
+    # Give higher weight to first and last sentences, and penalize very short ones
+    scores[0] *= 1.25
+    scores[-1] *= 1.25
+    scores[lengths < 4] *= 0.7
+
+    top = np.argpartition(-scores, count - 1)[:count]
+    return " ".join(sentences[i] for i in np.sort(top))
@@ -0,0 +1,137 @@
+import io
+import time
+import zipfile
+
+import pytest
+
+# app imports the speech, translation and web stacks at module level
+app_module = pytest.importorskip('app')
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        yield client
+
+
+class FakeTranslator:
+    backends = {'google': None}
+    languages = {'en': 'English', 'hi': 'Hindi'}
+
+    def transcribe_audio_bytes(self, data, language, long_audio=None, details=None, backend=None):
+        details['stats'] = {'decode_mode': 'memory', 'bytes_written': 0, 'input_bytes': len(data)}
+        return 'hello world'
+
+    def translate_text(self, text, src='auto', dest='en'):
+        return f'{dest}:{text}'
+
+
+@pytest.fixture
+def results(monkeypatch):
+    results = {}
+    monkeypatch.setattr(app_module, 'recognition_results', results)
+    return results
+
+
+def wait_for_job(client, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f'/api/results/{job_id}').get_json()
+        if body['status'] not in ('queued', 'running'):
+            return body
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def test_async_process_audio_queues_a_job_and_serves_its_result(client, results, monkeypatch):
+    if not app_module.speech_module_available:
+        pytest.skip('speech module not available')
+    monkeypatch.setattr(app_module, 'get_translator', FakeTranslator)
+    monkeypatch.setattr(app_module, 'DECODE_MODE', 'memory')
+    response = client.post('/api/process-audio', data={
+        'audio': (io.BytesIO(b'RIFF audio'), 'talk.wav'), 'language': 'en-US', 'dest_lang': 'hi', 'async': 'true'
+    })
+    assert response.status_code == 202
+    job_id = response.get_json()['session_id']
+    assert response.get_json()['results_url'] == f'/api/results/{job_id}'
+
+    body = wait_for_job(client, job_id)
+    assert body['success'] and body['status'] == 'done'
+    assert (body['original'], body['translated'], body['dest_lang_name']) == ('hello world', 'hi:hello world', 'Hindi')
+    assert client.get('/api/results/unknown').status_code == 404
+
+
+def test_submit_rejects_jobs_beyond_the_pending_limit(results, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_PENDING_JOBS', 2)
+    results.update({'a': {'status': 'queued'}, 'b': {'status': 'running'}, 'c': {'status': 'done'}})
+    assert app_module.submit_recognition_job(b'RIFF', 'talk.wav', 'en-US') is None
+    assert len(results) == 3
+
+
+def test_prune_results_drops_only_expired_finished_jobs(results):
+    old = time.time() - app_module.RESULT_TTL_SECONDS - 1
+    results.update({
+        'old-done': {'status': 'done', 'finished_at': old},
+        'old-error': {'status': 'error', 'finished_at': old},
+        'fresh-done': {'status': 'done', 'finished_at': time.time()},
+        'long-running': {'status': 'running', 'started_at': old},
+    })
+    app_module.prune_results()
+    assert sorted(results) == ['fresh-done', 'long-running']
+
+
+def test_memory_decode_writes_nothing_and_download_all_attaches_upload(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(app_module, 'get_translator', FakeTranslator)
+    details = {}
+    text = app_module.transcribe_upload(b'RIFF audio', 'talk.wav', 'en-US', details=details, decode_mode='memory')
+    assert text == 'hello world'
+    assert details['stats']['bytes_written'] == 0
+    assert not (tmp_path / 'uploads').exists()
+
+    response = client.post('/api/download-all', json={'text': 'hello world', 'audio_file_path': 'talk.wav'})
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as zf:
+        assert zf.read('talk.wav') == b'RIFF audio'
+    response.close()
+
+
+def test_static_etag_matches_weakly(client):
+    response = client.get('/styles.css')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    assert client.get('/styles.css', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/styles.css', headers={'If-None-Match': 'W/' + etag}).status_code == 304
+    assert client.get('/styles.css', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_warmup_requires_the_admin_token(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app_module.components, 'warm_up',
+                        lambda names=None: calls.append(names) or {'components': {}, 'total_load_seconds': 0})
+    monkeypatch.setattr(app_module.request_profiler, 'token', None)
+    assert client.post('/api/warmup').status_code == 404
+
+    monkeypatch.setattr(app_module.request_profiler, 'token', 'secret')
+    assert client.post('/api/warmup').status_code == 403
+    assert client.post('/api/warmup', headers={'X-Audiofy-Profile': 'wrong'}).status_code == 403
+    assert calls == []
+
+    response = client.post('/api/warmup', headers={'X-Audiofy-Profile': 'secret'})
+    assert response.status_code == 200 and response.get_json()['success']
+    assert calls == [None]
+
+
+@pytest.mark.parametrize('field, value', [('sentences', True), ('sentences', 0), ('sentences', 1.5),
+                                          ('ratio', True), ('ratio', 0), ('ratio', 1.5), ('ratio', '0.5')])
+def test_summarize_rejects_invalid_lengths(client, field, value):
+    response = client.post('/api/summarize', json={'text': 'Some text to summarize.', field: value})
+    assert response.status_code == 400
+
+
+def test_summarize_keeps_the_requested_number_of_sentences(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'speech_module_available', False)
+    text = ' '.join(f'Sentence number {i} talks about trams and buses.' for i in range(1, 7))
+    response = client.post('/api/summarize', json={'text': text, 'sentences': 2})
+    assert response.get_json()['success']
+    assert response.get_json()['summary'].count('Sentence number') == 2
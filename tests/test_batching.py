@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from batching import MicroBatcher
+
+
+def test_map_returns_results_in_request_order():
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=50)
+    assert batcher.map(list(range(10)), timeout=5) == [item * 10 for item in range(10)]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert [item for batch in batches for item in batch] == list(range(10))
+
+
+def test_concurrent_callers_share_batches_and_get_their_own_results():
+    release = threading.Event()
+    batch_sizes = []
+
+    def process(items):
+        release.wait(5)
+        batch_sizes.append(len(items))
+        return [f'result {item}' for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=200)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(batcher.map, [caller], 5) for caller in range(8)]
+        release.set()
+        assert [future.result() for future in futures] == [[f'result {caller}'] for caller in range(8)]
+    assert sum(batch_sizes) == 8
+    assert len(batch_sizes) < 8
+    assert batcher.stats()['items'] == 8
+
+
+def test_a_failed_batch_fails_each_of_its_callers():
+    def process(items):
+        if 'bad' in items:
+            raise ValueError('model failed')
+        return items
+
+    # A full batch is processed at once, so the long wait only guarantees both share it
+    batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=1000)
+    futures = [batcher.submit('ok'), batcher.submit('bad')]
+    for future in futures:
+        with pytest.raises(ValueError, match='model failed'):
+            future.result(timeout=5)
+    # The worker keeps serving later batches
+    assert batcher.map(['fine'], timeout=5) == ['fine']
+
+
+def test_wrong_number_of_results_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=2, max_wait_ms=1000)
+    with pytest.raises(RuntimeError, match='expected 2 results, got 1'):
+        batcher.map(['a', 'b'], timeout=5)
@@ -0,0 +1,146 @@
+import os
+
+from caching import DiskLRUCache, LRUCache, TranscriptionCache
+
+
+def _last_used(cache, key, when):
+    with cache._connect() as conn:
+        conn.execute('UPDATE transcripts SET last_used = ? WHERE digest = ? AND locale = ?', (when, *key))
+
+
+def test_transcription_cache_keys_match_for_file_and_bytes(tmp_path):
+    audio = tmp_path / 'clip.wav'
+    audio.write_bytes(b'RIFF audio')
+    cache = TranscriptionCache(str(tmp_path / 'cache.db'))
+    assert cache.key_for_file(str(audio), 'en-US') == cache.key_for_bytes(b'RIFF audio', 'en-US')
+    assert cache.key_for_bytes(b'RIFF audio', 'en-US') != cache.key_for_bytes(b'RIFF audio', 'hi-IN')
+
+
+def test_transcription_cache_round_trips_segments(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache.db'))
+    key = cache.key_for_bytes(b'audio', 'en-US')
+    assert cache.get(key) is None
+    cache.put(key, 'hello world', [{'start': 0.0, 'end': 1.5, 'text': 'hello world'}])
+    assert cache.get(key) == {'text': 'hello world', 'segments': [{'start': 0.0, 'end': 1.5, 'text': 'hello world'}]}
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_transcription_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache.db'), max_entries=2)
+    keys = [cache.key_for_bytes(data, 'en-US') for data in (b'a', b'b', b'c')]
+    cache.put(keys[0], 'first')
+    cache.put(keys[1], 'second')
+    _last_used(cache, keys[0], 2000)
+    _last_used(cache, keys[1], 1000)
+    cache.put(keys[2], 'third')
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0])['text'] == 'first'
+    assert cache.get(keys[2])['text'] == 'third'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_transcription_cache_evicts_to_fit_max_bytes(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache.db'), max_bytes=10)
+    keys = [cache.key_for_bytes(data, 'en-US') for data in (b'a', b'b')]
+    cache.put(keys[0], 'x' * 6)
+    _last_used(cache, keys[0], 1000)
+    cache.put(keys[1], 'y' * 6)
+    assert cache.get(keys[0]) is None
+    assert cache.stats()['bytes'] == 6
+
+
+def test_lru_cache_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_lru_cache_put_replaces_existing_key():
+    cache = LRUCache(max_entries=2, max_bytes=10, sizeof=len)
+    cache.put('a', 'xxxx')
+    cache.put('a', 'yy')
+    assert cache.get('a') == 'yy'
+    assert len(cache) == 1
+    assert cache.stats()['bytes'] == 2
+
+
+def test_lru_cache_evicts_to_fit_max_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'xxxx')
+    cache.put('c', 'xxxx')
+    assert cache.get('a') is None
+    assert cache.get('b') == 'xxxx'
+    assert cache.stats()['bytes'] == 8
+
+
+def test_lru_cache_skips_values_larger_than_max_bytes():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.put('a', 'x')
+    cache.put('big', 'x' * 11)
+    assert cache.get('big') is None
+    assert cache.get('a') == 'x'
+    assert cache.stats()['evictions'] == 0
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache()
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('missing')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (1, 1, 0.5)
+
+
+def _touch(cache, key, mtime):
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+def test_disk_cache_round_trips_blobs(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=100)
+    assert cache.get('a') is None
+    cache.put('a', b'clip')
+    assert cache.get('a') == b'clip'
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_disk_cache_evicts_least_recently_used_files(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=25)
+    cache.put('a', b'x' * 10)
+    cache.put('b', b'x' * 10)
+    _touch(cache, 'a', 1000)
+    _touch(cache, 'b', 2000)
+    cache.put('c', b'x' * 10)
+    assert cache.get('a') is None
+    assert cache.get('b') == b'x' * 10
+    assert cache.get('c') == b'x' * 10
+    assert cache.stats()['bytes'] == 20
+    assert cache.stats()['evictions'] == 1
+
+
+def test_disk_cache_get_marks_file_as_recently_used(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=25)
+    cache.put('a', b'x' * 10)
+    cache.put('b', b'x' * 10)
+    _touch(cache, 'a', 1000)
+    _touch(cache, 'b', 2000)
+    cache.get('a')  # 'b' is now the least recently used
+    cache.put('c', b'x' * 10)
+    assert cache.get('b') is None
+    assert cache.get('a') == b'x' * 10
+
+
+def test_disk_cache_counts_existing_files_and_skips_oversized_blobs(tmp_path):
+    DiskLRUCache(str(tmp_path), max_bytes=100).put('a', b'x' * 30)
+    cache = DiskLRUCache(str(tmp_path), max_bytes=100)
+    assert cache.stats()['bytes'] == 30
+    cache.put('big', b'x' * 101)
+    assert cache.get('big') is None
+    assert cache.get('a') == b'x' * 30
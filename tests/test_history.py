@@ -0,0 +1,109 @@
+import pytest
+
+import database
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = database.connect(str(tmp_path / 'history.db'))
+    database.init_schema(conn)
+    yield conn
+    conn.close()
+
+
+def _user(conn, name):
+    return database.create_user(conn, name, f'{name}@example.com', 'hash')
+
+
+def _pages(fetch, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = fetch(limit=limit, cursor=cursor)
+        assert len(page) <= limit
+        items.extend(page)
+        pages += 1
+        if cursor is None:
+            return items, pages
+
+
+def test_list_history_pages_newest_first(conn):
+    user, other = _user(conn, 'alice'), _user(conn, 'bob')
+    ids = [database.add_history(conn, user, 'translation', transcript=f'item {i}') for i in range(7)]
+    database.add_history(conn, other, 'translation', transcript='not alice')
+    # Give a few items the same timestamp; the id breaks the tie
+    conn.execute('UPDATE history SET created_at = 1000.0 WHERE id IN (?, ?, ?)', ids[2:5])
+    conn.commit()
+
+    items, pages = _pages(lambda **page: database.list_history(conn, user, **page), limit=3)
+    expected = conn.execute('SELECT id FROM history WHERE user_id = ? ORDER BY created_at DESC, id DESC',
+                            (user,)).fetchall()
+    assert [item['id'] for item in items] == [row['id'] for row in expected]
+    assert pages == 3
+
+
+def test_list_history_last_full_page_has_no_cursor(conn):
+    user = _user(conn, 'alice')
+    for i in range(4):
+        database.add_history(conn, user, 'summary', summary=f'summary {i}', stats={'words': i})
+    items, cursor = database.list_history(conn, user, limit=4)
+    assert len(items) == 4 and cursor is None
+    assert items[0]['stats'] == {'words': 3}
+
+
+def test_list_history_rejects_malformed_cursor(conn):
+    user = _user(conn, 'alice')
+    with pytest.raises(ValueError):
+        database.list_history(conn, user, cursor='not-a-cursor')
+
+
+def test_search_history_pages_matches_for_one_user(conn):
+    user, other = _user(conn, 'alice'), _user(conn, 'bob')
+    matching = [database.add_history(conn, user, 'transcription', transcript=f'meeting notes {i}')
+                for i in range(5)]
+    database.add_history(conn, user, 'transcription', transcript='shopping list')
+    database.add_history(conn, other, 'transcription', transcript='meeting elsewhere')
+
+    items, pages = _pages(lambda **page: database.search_history(conn, user, 'meet', **page), limit=2)
+    assert [item['id'] for item in items] == matching[::-1]
+    assert pages == 3
+
+
+def test_deleted_history_leaves_list_and_search(conn):
+    user = _user(conn, 'alice')
+    item_id = database.add_history(conn, user, 'transcription', transcript='meeting notes')
+    assert database.delete_history(conn, user, item_id)
+    assert not database.delete_history(conn, user, item_id)
+    assert database.list_history(conn, user) == ([], None)
+    assert database.search_history(conn, user, 'meeting') == ([], None)
+
+
+def test_search_history_matches_inside_one_users_index(conn):
+    users = [_user(conn, f'user{i}') for i in range(12)]
+    database.add_history(conn, users[0], 'transcription', transcript=f'room {users[10]} meeting')
+    database.add_history(conn, users[10], 'transcription', transcript='meeting')
+    assert database.search_query(users[0], 'meet') == (
+        f'user_id : "{users[0]}" AND {{transcript translation summary}} : ("meet"*)')
+    # The user filter is part of the MATCH, not applied after the join
+    rows = conn.execute('SELECT rowid FROM history_fts WHERE history_fts MATCH ?',
+                        (database.search_query(users[10], 'meet'),)).fetchall()
+    assert [row[0] for row in rows] == [2]
+    assert [item['id'] for item in database.search_history(conn, users[0], 'meeting')[0]] == [1]
+
+
+def test_init_schema_adds_user_id_to_an_older_fts_index(tmp_path):
+    conn = database.connect(str(tmp_path / 'old.db'))
+    old_schema = [statement.replace('user_id, transcript,', 'transcript,').replace('new.user_id, ', '')
+                  .replace('old.user_id, ', '').replace('rowid, user_id,', 'rowid,')
+                  for statement in database.SCHEMA]
+    for statement in old_schema:
+        conn.execute(statement)
+    user = _user(conn, 'alice')
+    item_id = database.add_history(conn, user, 'transcription', transcript='meeting notes')
+    assert 'user_id' not in [row[0] for row in conn.execute(database.SQL_HISTORY_FTS_COLUMNS)]
+
+    database.init_schema(conn)
+    assert 'user_id' in [row[0] for row in conn.execute(database.SQL_HISTORY_FTS_COLUMNS)]
+    assert [item['id'] for item in database.search_history(conn, user, 'meeting')[0]] == [item_id]
+    database.add_history(conn, user, 'transcription', transcript='meeting again')
+    assert len(database.search_history(conn, user, 'meeting')[0]) == 2
+    conn.close()
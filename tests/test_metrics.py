@@ -0,0 +1,60 @@
+import pytest
+
+import metrics
+
+
+class NoSpeech(Exception):
+    pass
+
+
+@pytest.fixture
+def stage_log():
+    log, token = metrics.collect_stages()
+    yield log
+    metrics.stop_collecting(token)
+
+
+def error_count(stage, backend, error):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value('audiofy_stage_errors_total',
+                                     {'stage': stage, 'backend': backend, 'error': error}) or 0
+
+
+def test_stage_records_timing_and_errors(stage_log):
+    with metrics.stage('decode'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.stage('recognize', 'test-backend'):
+            raise ValueError('service failed')
+    assert [(entry['stage'], entry['backend'], entry['error']) for entry in stage_log] == [
+        ('decode', '', None), ('recognize', 'test-backend', 'ValueError')]
+    assert all(entry['seconds'] >= 0 for entry in stage_log)
+
+
+def test_expected_exceptions_are_reraised_without_counting(stage_log):
+    with pytest.raises(NoSpeech):
+        with metrics.stage('recognize', 'test-backend', expected=(NoSpeech,)):
+            raise NoSpeech()
+    with pytest.raises(KeyError):
+        with metrics.stage('recognize', 'test-backend', expected=(NoSpeech,)):
+            raise KeyError('other')
+    assert [entry['error'] for entry in stage_log] == [None, 'KeyError']
+
+
+@pytest.mark.skipif(not metrics.prometheus_available, reason='prometheus_client not installed')
+def test_stage_error_counter_skips_expected_exceptions():
+    before = error_count('expected-test', 'b', 'NoSpeech'), error_count('expected-test', 'b', 'KeyError')
+    for error in (NoSpeech(), KeyError('other')):
+        with pytest.raises(type(error)):
+            with metrics.stage('expected-test', 'b', expected=(NoSpeech,)):
+                raise error
+    after = error_count('expected-test', 'b', 'NoSpeech'), error_count('expected-test', 'b', 'KeyError')
+    assert (after[0] - before[0], after[1] - before[1]) == (0, 1)
+
+
+def test_nothing_is_logged_outside_collection():
+    log, token = metrics.collect_stages()
+    metrics.stop_collecting(token)
+    with metrics.stage('decode'):
+        pass
+    assert log == []
@@ -0,0 +1,89 @@
+import json
+import time
+
+import pytest
+
+from profiling import ProfileStore, RequestProfile, RequestProfiler
+
+TOKEN = 'secret-token'
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def profile(mode='cprofile'):
+    profile = RequestProfile(mode, 'header', 'translate', 'POST', '/api/translate')
+    profile.start()
+    return profile
+
+
+def test_stop_is_idempotent_and_releases_cprofile():
+    first = profile()
+    assert first.mode == 'cprofile'
+    assert first.stop() is True
+    assert first.stop() is False
+    assert first.seconds is not None
+    # The single cProfile slot is free again
+    second = profile()
+    assert second.mode == 'cprofile'
+    second.stop()
+
+
+def test_concurrent_cprofile_request_is_sampled_instead():
+    first = profile()
+    second = profile()
+    try:
+        assert (first.mode, second.mode) == ('cprofile', 'sample')
+    finally:
+        second.stop()
+        first.stop()
+
+
+def test_profiles_are_saved_listed_and_pruned(tmp_path):
+    store = ProfileStore(str(tmp_path), keep=2)
+    saved = []
+    for mode in ('cprofile', 'sample', 'sample'):
+        running = profile(mode)
+        busy(0.05)
+        running.stop()
+        saved.append(store.save(running, 200, [{'stage': 'translate', 'seconds': 0.01}]))
+
+    assert [meta['id'] for meta in store.list()] == [saved[2]['id'], saved[1]['id']]
+    assert store.path(saved[0]['id'], 'pstats') is None
+    path = store.path(saved[2]['id'], 'speedscope')
+    with open(path, encoding='utf-8') as f:
+        speedscope = json.load(f)
+    assert saved[2]['samples'] > 0
+    assert 'busy' in [frame['name'] for frame in speedscope['shared']['frames']]
+    assert store.path('../../etc/passwd', 'pstats') is None
+    assert store.path(saved[2]['id'], 'exe') is None
+
+
+def test_begin_profiles_admin_and_sampled_requests(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    profiler = RequestProfiler(store, token=TOKEN, endpoints=['translate'])
+    assert profiler.begin('translate', 'POST', '/api/translate', {}) is None
+    assert profiler.begin('translate', 'POST', '/api/translate', {'X-Audiofy-Profile': 'wrong'}) is None
+
+    admin = profiler.begin('translate', 'POST', '/api/translate',
+                           {'X-Audiofy-Profile': TOKEN, 'X-Audiofy-Profile-Mode': 'sample'})
+    assert (admin.trigger, admin.mode) == ('header', 'sample')
+    admin.stop()
+
+    profiler.sample_rate = 1.0
+    sampled = profiler.begin('translate', 'POST', '/api/translate', {})
+    assert (sampled.trigger, sampled.mode) == ('sampled', 'sample')
+    sampled.stop()
+    assert profiler.begin('login', 'POST', '/api/login', {}) is None
+
+
+def test_is_admin_requires_a_configured_token():
+    assert not RequestProfiler(ProfileStore('unused')).is_admin({'X-Audiofy-Profile': ''})
+    assert RequestProfiler(ProfileStore('unused'), token=TOKEN).is_admin({'X-Audiofy-Profile': TOKEN})
+    with pytest.raises(ValueError):
+        RequestProfiler(ProfileStore('unused'), default_mode='trace')
@@ -0,0 +1,74 @@
+import io
+import time
+
+import numpy as np
+import pytest
+
+speech_translator = pytest.importorskip('speech_translator')
+sr = pytest.importorskip('speech_recognition')
+from recognition_backends import RecognitionBackend
+
+SAMPLE_RATE = 8000
+# Segment loudness -> what the fake engine answers for it
+ANSWERS = {4000: 'first part', 8000: sr.RequestError('service unavailable'), 12000: 'third part',
+           16000: sr.UnknownValueError()}
+
+
+class ScriptedBackend(RecognitionBackend):
+    """Answers each segment by its loudness; earlier segments take longer, so they finish out of order."""
+
+    name = 'scripted'
+
+    def recognize(self, audio_data, language):
+        peak = np.abs(np.frombuffer(audio_data.frame_data, dtype='<i2').astype(np.int32)).max()
+        amplitude = min(ANSWERS, key=lambda level: abs(level - peak))
+        time.sleep(0.01 * (len(ANSWERS) - list(ANSWERS).index(amplitude)))
+        answer = ANSWERS[amplitude]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def recording():
+    """One 11 s tone per ANSWERS entry, separated by a second of silence."""
+    t = np.arange(11 * SAMPLE_RATE) / SAMPLE_RATE
+    pieces = []
+    for amplitude in ANSWERS:
+        pieces.append((amplitude * np.sin(2 * np.pi * 220 * t)).astype('<i2').tobytes())
+        pieces.append(b'\0' * SAMPLE_RATE)
+    return b''.join(pieces[:-1])
+
+
+def test_segments_are_joined_in_order_with_failures_flagged():
+    translator = speech_translator.SpeechTranslator(backends=[ScriptedBackend()], default_backend='scripted')
+    stream = io.BytesIO(recording())
+    segments = translator._recognize_segments(lambda frames: stream.read(frames * 2), SAMPLE_RATE, 2, 'en-US',
+                                              max_workers=4)
+    assert [segment['index'] for segment in segments] == [0, 1, 2, 3]
+    assert [segment['text'] for segment in segments] == ['first part', '', 'third part', '']
+    assert segments[1]['error'] == 'service unavailable'
+    assert all('error' not in segment for segment in segments if segment['index'] != 1)
+    assert segments[1]['start'] == pytest.approx(11.3, abs=0.05)  # cut after SILENCE_MS of pause
+
+    details = {}
+    assert translator._join_segments(segments, 46.0, details) == 'first part third part'
+    assert details['partial'] is True
+    assert details['failed_segments'] == 1
+    assert details['segments'] is segments
+
+
+def test_join_segments_without_failures_is_not_partial():
+    translator = speech_translator.SpeechTranslator()
+    details = {}
+    segments = [{'index': 0, 'start': 0.0, 'end': 10.0, 'text': 'hello'},
+                {'index': 1, 'start': 10.0, 'end': 20.0, 'text': ''}]
+    assert translator._join_segments(segments, 20.0, details) == 'hello'
+    assert 'partial' not in details and 'failed_segments' not in details
+
+
+def test_join_segments_with_nothing_recognized_returns_none():
+    translator = speech_translator.SpeechTranslator()
+    details = {}
+    segments = [{'index': 0, 'start': 0.0, 'end': 10.0, 'text': '', 'error': 'timeout'}]
+    assert translator._join_segments(segments, 10.0, details) is None
+    assert details['partial'] is True
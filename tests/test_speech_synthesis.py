@@ -0,0 +1,43 @@
+import sys
+import types
+
+import pytest
+
+from caching import DiskLRUCache
+
+speech_translator = pytest.importorskip('speech_translator')
+
+
+class FakeEngine:
+    voices = [types.SimpleNamespace(id='voice-in', name='English (India)', languages=[])]
+
+    def __init__(self):
+        self.properties = {}
+
+    def getProperty(self, name):
+        return self.voices if name == 'voices' else self.properties.get(name)
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+
+@pytest.fixture
+def translator(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyttsx3', types.SimpleNamespace(init=FakeEngine))
+    renders = []
+
+    def render_to_bytes(engine, text, voice_id, rate):
+        renders.append(voice_id)
+        return b'RIFF' + text.encode('utf-8')
+
+    monkeypatch.setattr(speech_translator, 'render_to_bytes', render_to_bytes)
+    translator = speech_translator.SpeechTranslator(tts_cache=DiskLRUCache(str(tmp_path / 'tts')))
+    translator.renders = renders
+    return translator
+
+
+def test_first_english_clip_is_cached_under_the_default_voice(translator):
+    first, _ = translator.synthesize_speech('hello', language='en')
+    second, _ = translator.synthesize_speech('hello', language='en')
+    assert first == second
+    assert translator.renders == ['voice-in']
@@ -0,0 +1,25 @@
+from static_assets import AssetManifest
+
+
+def test_manifest_serves_only_front_end_files(tmp_path):
+    for name in ('index.html', 'script.js', 'styles.css', 'images/background.jpg', 'app.py', 'audiofy.db',
+                 'test_output.txt', 'config.json', 'venv/lib/site.js', 'uploads/talk.wav'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x')
+    (tmp_path / 'env' / 'pyvenv.cfg').parent.mkdir()
+    (tmp_path / 'env' / 'pyvenv.cfg').write_text('home = /usr/bin')
+    (tmp_path / 'env' / 'page.html').write_bytes(b'x')
+
+    manifest = AssetManifest([str(tmp_path)]).build()
+    assert sorted(manifest.assets) == ['images/background.jpg', 'index.html', 'script.js', 'styles.css']
+
+
+def test_dist_root_is_served_wholesale(tmp_path):
+    dist = tmp_path / 'dist'
+    (dist / 'assets').mkdir(parents=True)
+    (dist / 'assets' / 'index-B6xL2k9a.js').write_bytes(b'{}')
+    (dist / 'manifest.json').write_bytes(b'{}')
+    manifest = AssetManifest([str(dist)]).build()
+    assert sorted(manifest.assets) == ['assets/index-B6xL2k9a.js', 'manifest.json']
+    assert manifest.get('assets/index-B6xL2k9a.js').immutable
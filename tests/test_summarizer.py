@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from summarizer import DEFAULT_SENTENCES, score_sentences, split_sentences, summarize
+
+TEXT = (
+    "The city council met on Monday to discuss the new public transport plan. "
+    "Members argued about the cost of extending the tram network to the northern suburbs. "
+    "The weather was pleasant. "
+    "A consultant presented figures showing that tram ridership doubled after the last extension. "
+    "Several residents asked whether bus routes would be cut once the tram network grows. "
+    "Lunch was served at noon. "
+    "The council agreed to fund a study of the tram extension and report back in spring."
+)
+
+
+def in_original_order(summary, text):
+    sentences = split_sentences(text)
+    positions = [sentences.index(sentence) for sentence in split_sentences(summary)]
+    return positions == sorted(positions) and len(set(positions)) == len(positions)
+
+
+def test_summary_is_input_sentences_in_original_order():
+    summary = summarize(TEXT)
+    assert len(split_sentences(summary)) == DEFAULT_SENTENCES
+    assert in_original_order(summary, TEXT)
+    # Off-topic filler does not make the cut
+    assert 'Lunch was served' not in summary and 'weather' not in summary
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_summary_keeps_order_for_shuffled_texts(seed):
+    sentences = split_sentences(TEXT)
+    random.Random(seed).shuffle(sentences)
+    text = ' '.join(sentences)
+    for count in (1, 2, 4):
+        summary = summarize(text, num_sentences=count)
+        assert len(split_sentences(summary)) == count
+        assert in_original_order(summary, text)
+
+
+def test_ratio_sets_the_summary_length():
+    assert len(split_sentences(summarize(TEXT, ratio=0.5))) == 4
+    assert len(split_sentences(summarize(TEXT, ratio=0.01))) == 1
+    assert summarize(TEXT, ratio=1) == ' '.join(split_sentences(TEXT))
+
+
+def test_short_text_is_returned_whole():
+    assert summarize('One sentence. Two sentences.') == 'One sentence. Two sentences.'
+
+
+def test_split_sentences_handles_danda_cjk_and_line_breaks():
+    assert split_sentences('पहला वाक्य। दूसरा वाक्य।') == ['पहला वाक्य।', 'दूसरा वाक्य।']
+    assert split_sentences('今日は晴れです。明日は雨です。') == ['今日は晴れです。', '明日は雨です。']
+    assert split_sentences('First line\nSecond line.  Third!') == ['First line', 'Second line.', 'Third!']
+
+
+def test_sentences_without_terms_score_zero():
+    scores, lengths = score_sentences(['The and of.', 'Trams carry commuters daily.'])
+    assert scores[0] == 0 and lengths[0] == 0
+    assert scores[1] > 0
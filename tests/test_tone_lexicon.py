@@ -0,0 +1,66 @@
+import pytest
+
+import tone_lexicon
+from tone_lexicon import LEXICON
+
+
+def original_detect_tone(text):
+    """The keyword fallback of the original SpeechTranslator.detect_tone: distinct substrings."""
+    text_lower = text.lower()
+    counts = {category: sum(1 for word in words if word in text_lower) for category, words in LEXICON.items()}
+    exclamation_count, question_count = text.count("!"), text.count("?")
+    if exclamation_count > 1:
+        if counts["angry"] > 0:
+            counts["angry"] += exclamation_count
+        else:
+            counts["happy"] += exclamation_count
+    if question_count > 1:
+        counts["confused"] += question_count
+    if "my mother passed away" in text_lower or "my father passed away" in text_lower:
+        counts["sad"] += 5
+    if "congratulations" in text_lower or "well done" in text_lower:
+        counts["happy"] += 3
+    max_count = max(counts.values())
+    if max_count == 0:
+        return "Neutral"
+    for category in ("happy", "sad", "angry", "worried", "confused"):
+        if counts[category] == max_count:
+            if category == "happy":
+                return "Excited" if exclamation_count > 1 else "Happy"
+            return category.capitalize()
+
+
+SAMPLES = [
+    "What a wonderful and beautiful day, I am so happy",
+    "Congratulations on the new job! Well done!!",
+    "My mother passed away last week and I feel so alone",
+    "This is ridiculous, the referee was wrong and unfair!!",
+    "I am anxious and nervous about the exam tomorrow",
+    "I am confused, this is so complicated. Why? How?",
+    "The meeting is scheduled for Thursday afternoon",
+    "Great great great, but I am sad, upset and disappointed",
+    "I feel sad sad sad sad but also glad and pleased and happy",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_labels_match_the_original_detector(text):
+    assert tone_lexicon.detect_tone(text) == original_detect_tone(text)
+
+
+def test_repeating_a_term_does_not_change_the_tone():
+    assert tone_lexicon.detect_tone("happy but sad and upset") == "Sad"
+    assert tone_lexicon.detect_tone("happy happy happy happy but sad and upset") == "Sad"
+
+
+def test_terms_match_whole_words_and_regular_inflections():
+    assert tone_lexicon.detect_tone("She loved the show") == "Happy"
+    assert tone_lexicon.detect_tone("He fears the dark") == "Worried"
+    assert tone_lexicon.detect_tone("Missed the bus again") == "Sad"
+    # The original substring match read "hello" as "hell" and "likely" as "like"
+    assert tone_lexicon.detect_tone("hello there") == "Neutral"
+    assert tone_lexicon.detect_tone("it is likely to rain") == "Neutral"
+
+
+def test_detect_tones_matches_detect_tone():
+    assert tone_lexicon.detect_tones(SAMPLES) == [tone_lexicon.detect_tone(text) for text in SAMPLES]
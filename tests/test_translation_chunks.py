@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+# speech_translator imports the recognition and translation clients at module level
+speech_translator = pytest.importorskip('speech_translator')
+split_for_translation = speech_translator.split_for_translation
+
+
+def _join(chunks):
+    return ''.join(chunk + separator for chunk, separator in chunks)
+
+
+def _random_text(rng):
+    words = ['a', 'word', 'translation', 'x' * rng.randint(10, 40), 'end.', 'why?', 'है।', '終わり。']
+    gaps = [' ', ' ', '  ', '\n', '\n\n', ' \n \n ', '. ']
+    return ''.join(rng.choice(words) + rng.choice(gaps) for _ in range(rng.randint(0, 60)))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_split_round_trips_within_size_bounds(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = _random_text(rng)
+        text = text.strip() if rng.random() < 0.5 else text
+        max_chars = rng.randint(1, 60)
+        chunks = split_for_translation(text, max_chars)
+        assert _join(chunks) == text
+        assert all(len(chunk) <= max_chars for chunk, _ in chunks)
+
+
+def test_split_packs_whole_paragraphs():
+    text = 'First paragraph.\n\nSecond one.\n\nThird.'
+    assert split_for_translation(text, 100) == [(text, '')]
+    assert split_for_translation(text, 30) == [('First paragraph.\n\nSecond one.', '\n\n'), ('Third.', '')]
+
+
+def test_split_long_paragraph_between_sentences():
+    text = 'मेरा नाम राम है। आज मौसम अच्छा है। Where is it? 今日は良い天気です。 Done.'
+    chunks = split_for_translation(text, 20)
+    assert [chunk for chunk, _ in chunks] == ['मेरा नाम राम है।', 'आज मौसम अच्छा है।', 'Where is it?',
+                                              '今日は良い天気です。 Done.']
+    assert _join(chunks) == text
+
+
+def test_split_cuts_long_sentence_at_last_space():
+    chunks = split_for_translation('one two three four five', 10)
+    assert chunks == [('one two', ' '), ('three four', ' '), ('five', '')]
+
+
+def test_split_cuts_unbroken_word_at_max_chars():
+    assert split_for_translation('abcdefghij', 4) == [('abcd', ''), ('efgh', ''), ('ij', '')]
+
+
+def test_split_keeps_whitespace_around_cuts():
+    text = 'longerword  longerword \n\nend.'
+    chunks = split_for_translation(text, 10)
+    assert _join(chunks) == text
+    assert [chunk for chunk, _ in chunks] == ['longerword', 'longerword', 'end.']
+
+
+def test_split_empty_text():
+    assert split_for_translation('', 10) == [('', '')]
+
+
+def test_normalize_paragraphs_keeps_one_blank_line_between_paragraphs():
+    text = '  Hello   world. \n\n\n  Second\tparagraph \n \n\n'
+    assert speech_translator.normalize_paragraphs(text) == 'Hello world.\n\nSecond paragraph'
+
+
+def test_translate_batch_keeps_paragraph_breaks():
+    translator = speech_translator.SpeechTranslator()
+    requests = []
+
+    def upstream(text, src, dest):
+        requests.append(text)
+        return text.upper()
+
+    translator._translate_upstream = upstream
+    texts = ['first', 'one\n\ntwo', 'second']
+    assert translator.translate_batch(texts) == ['FIRST', 'ONE\n\nTWO', 'SECOND']
+    assert sorted(requests) == ['first\nsecond', 'one\n\ntwo']
+    # Cached under the same key translate_text uses
+    assert translator.translate_text('one\n\ntwo') == 'ONE\n\nTWO'
+    assert len(requests) == 2
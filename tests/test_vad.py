@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from vad import VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+
+def noise(seconds, amplitude, rng):
+    return rng.normal(0, amplitude, int(seconds * SAMPLE_RATE))
+
+
+def tone(seconds, amplitude, frequency=220):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def pcm(*pieces):
+    return np.clip(np.concatenate(pieces), -32768, 32767).astype('<i2').tobytes()
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_keeps_speech_with_padding_and_drops_silence_and_clicks(rng):
+    audio = pcm(noise(1, 30, rng), tone(1, 5000), noise(1, 30, rng), tone(0.02, 8000), noise(1, 30, rng))
+    kept, result = VoiceActivityDetector(padding_ms=300).trim(audio, SAMPLE_RATE)
+
+    assert len(result['regions']) == 1
+    start, end = result['regions'][0]
+    assert start == pytest.approx(0.7, abs=0.04)
+    assert end == pytest.approx(2.3, abs=0.04)
+    assert result['input_seconds'] == pytest.approx(4.02)
+    assert result['kept_seconds'] == pytest.approx(end - start, abs=0.01)
+    assert result['bytes_saved'] == len(audio) - len(kept)
+    assert len(kept) % 2 == 0
+
+
+def test_regions_follow_the_speech_without_padding(rng):
+    audio = pcm(noise(0.5, 30, rng), tone(0.6, 4000), noise(0.5, 30, rng), tone(0.6, 4000), noise(0.5, 30, rng))
+    _, result = VoiceActivityDetector(padding_ms=0).trim(audio, SAMPLE_RATE)
+    assert [(pytest.approx(start, abs=0.04), pytest.approx(end, abs=0.04)) for start, end in result['regions']] == [
+        (0.5, 1.1), (1.6, 2.2)]
+
+
+def test_quiet_unvoiced_sounds_are_kept_by_zero_crossing_rate(rng):
+    # Hiss too quiet for the energy threshold alone, but crossing zero on most samples
+    hiss = noise(0.5, 500, rng)
+    audio = pcm(noise(2, 10, rng), hiss, noise(2, 10, rng))
+    detector = VoiceActivityDetector(padding_ms=0, min_energy=800)
+    _, result = detector.trim(audio, SAMPLE_RATE)
+    assert len(result['regions']) == 1
+    _, without_zcr = VoiceActivityDetector(padding_ms=0, min_energy=800, zcr_threshold=1.1).trim(audio, SAMPLE_RATE)
+    assert without_zcr['regions'] == []
+
+
+def test_silence_and_empty_input_keep_nothing(rng):
+    kept, result = VoiceActivityDetector().trim(pcm(noise(1, 20, rng)), SAMPLE_RATE)
+    assert kept == b'' and result['regions'] == []
+    kept, result = VoiceActivityDetector().trim(b'', SAMPLE_RATE)
+    assert kept == b'' and result['kept_ratio'] == 1.0
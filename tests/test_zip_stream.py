@@ -0,0 +1,35 @@
+import io
+import os
+import zipfile
+from concurrent.futures import Future
+
+from zip_stream import stream_zip
+
+
+def test_stream_zip_writes_every_kind_of_member(tmp_path):
+    audio = os.urandom(300 * 1024)
+    path = tmp_path / 'recording.wav'
+    path.write_bytes(audio)
+    rendered = Future()
+    rendered.set_result(b'%PDF rendered document')
+
+    chunks = list(stream_zip([
+        ('recording.wav', str(path), zipfile.ZIP_STORED),
+        ('transcript.txt', 'Hello world'.encode('utf-8'), zipfile.ZIP_DEFLATED),
+        ('transcript.pdf', rendered, zipfile.ZIP_DEFLATED)
+    ], chunk_size=64 * 1024))
+
+    # Files are copied a chunk at a time rather than buffered whole
+    assert len(chunks) > 4
+    assert max(len(chunk) for chunk in chunks) < len(audio)
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ['recording.wav', 'transcript.txt', 'transcript.pdf']
+        assert zf.read('recording.wav') == audio
+        assert zf.read('transcript.txt') == b'Hello world'
+        assert zf.read('transcript.pdf') == b'%PDF rendered document'
+
+
+def test_stream_zip_without_members_is_an_empty_archive():
+    with zipfile.ZipFile(io.BytesIO(b''.join(stream_zip([])))) as zf:
+        assert zf.namelist() == []
@@ -0,0 +1,132 @@
+import re
+
+# Emotion dictionaries used by the keyword tone detector
+LEXICON = {
+    "happy": [
+        "happy", "joy", "joyful", "delighted", "excited", "glad", "pleased",
+        "thrilled", "wonderful", "amazing", "great", "good", "love", "like",
+        "enjoy", "fantastic", "excellent", "awesome", "smile", "laugh", "fun",
+        "celebrate", "congratulations", "perfect", "beautiful", "best"
+    ],
+    "sad": [
+        "sad", "unhappy", "depressed", "depression", "miserable", "heartbroken",
+        "disappointed", "upset", "terrible", "awful", "horrible", "hate", "dislike",
+        "sorry", "regret", "cry", "tears", "grief", "mourn", "miss", "lost", "alone",
+        "lonely", "unfortunate", "tragic", "failed", "failure", "passed away", "died"
+    ],
+    "angry": [
+        "angry", "mad", "furious", "annoyed", "irritated", "frustrated", "rage",
+        "hate", "outraged", "disgusted", "bitter", "hostile", "offended", "resent",
+        "damn", "hell", "stupid", "idiot", "fool", "ridiculous", "unfair", "wrong"
+    ],
+    "worried": [
+        "worry", "worried", "anxious", "anxiety", "nervous", "stress", "stressed",
+        "concern", "concerned", "afraid", "fear", "scared", "frightened", "panic",
+        "uneasy", "tense", "apprehensive", "dread", "doubt", "uncertain"
+    ],
+    "confused": [
+        "confused", "confusing", "confusion", "puzzled", "perplexed", "unsure",
+        "uncertain", "doubt", "wondering", "wonder", "understand", "complicated"
+    ]
+}
+
+# Phrases that strongly indicate an emotion, with the extra weight they add
+PHRASE_BOOSTS = {
+    "my mother passed away": ("sad", 5),
+    "my father passed away": ("sad", 5),
+    "congratulations": ("happy", 3),
+    "well done": ("happy", 3)
+}
+
+CATEGORIES = list(LEXICON)
+
+
+def _inflections(term):
+    """Regex for a term and its regular inflections (-s/-es/-ed/-ing, or -s/-d after an e)."""
+    if " " in term:
+        return re.escape(term)
+    return re.escape(term) + ("(?:s|d)?" if term.endswith("e") else "(?:s|es|ed|ing)?")
+
+
+def _compile(lexicon, boosts):
+    """
+    Build one word-boundary regex with a capturing group per term, the weights each
+    term adds to its categories, and the lexicon terms each boost phrase contains.
+    Longer terms are tried first, so "my mother passed away" is matched as the phrase.
+    """
+    weights = {}
+    for category, terms in lexicon.items():
+        for term in terms:
+            weights.setdefault(term, {}).setdefault(category, 0)
+            weights[term][category] += 1
+    lexicon_terms = list(weights)
+    contained = {}
+    for phrase, (category, boost) in boosts.items():
+        entry = weights.setdefault(phrase, {})
+        entry[category] = entry.get(category, 0) + boost
+        # A matched phrase also counts the lexicon terms it consumes
+        contained[phrase] = [term for term in lexicon_terms
+                             if term != phrase and re.search(r'\b' + re.escape(term) + r'\b', phrase)]
+    terms = sorted(weights, key=len, reverse=True)
+    alternation = "|".join(f"({_inflections(term)})" for term in terms)
+    return re.compile(r'\b(?:' + alternation + r')\b'), terms, weights, contained
+
+
+# Compiled once at import; every call is a single scan over the text
+_PATTERN, _TERMS, _TERM_WEIGHTS, _CONTAINED = _compile(LEXICON, PHRASE_BOOSTS)
+
+
+def score_text(text):
+    """
+    Return (category counts, exclamation count, question count) for one text.
+
+    As in the original keyword detector, each distinct term counts once however often
+    it is repeated. Terms match whole words (so "hello" is not "hell"), in their
+    regular inflections ("loved", "fears").
+    """
+    found = set()
+    for match in _PATTERN.finditer(text.lower()):
+        term = _TERMS[match.lastindex - 1]
+        found.add(term)
+        found.update(_CONTAINED.get(term, ()))
+    counts = dict.fromkeys(CATEGORIES, 0)
+    for term in found:
+        for category, weight in _TERM_WEIGHTS[term].items():
+            counts[category] += weight
+    return counts, text.count("!"), text.count("?")
+
+
+def classify(counts, exclamation_count, question_count):
+    """Pick the dominant tone: Happy, Excited, Sad, Angry, Worried, Confused or Neutral."""
+    counts = dict(counts)
+
+    # Apply weights to different factors
+    if exclamation_count > 1:
+        if counts["angry"] > 0:
+            counts["angry"] += exclamation_count
+        else:
+            counts["happy"] += exclamation_count
+
+    if question_count > 1:
+        counts["confused"] += question_count
+
+    # Determine the dominant emotion (ties resolve in CATEGORIES order)
+    max_count = max(counts.values())
+    if max_count == 0:
+        return "Neutral"
+    dominant = next(category for category in CATEGORIES if counts[category] == max_count)
+    if dominant == "happy":
+        return "Excited" if exclamation_count > 1 else "Happy"
+    return dominant.capitalize()
+
+
+def detect_tone(text):
+    """Keyword-based tone of a single text."""
+    if not text:
+        return "Neutral"
+    return classify(*score_text(text))
+
+
+def detect_tones(texts):
+    """Keyword-based tone of each text in a list."""
+    return [detect_tone(text) for text in texts]
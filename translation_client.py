@@ -0,0 +1,83 @@
+import warnings
+from importlib.metadata import PackageNotFoundError, version
+
+import requests
+from bs4 import BeautifulSoup
+from deep_translator import GoogleTranslator
+from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
+from deep_translator.validate import is_input_valid, request_failed
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections kept open to the translation host
+TRANSLATE_POOL_SIZE = 16
+TRANSLATE_TIMEOUT_SECONDS = 15
+# The provider rejects longer payloads; same limit as GoogleTranslator
+TRANSLATE_MAX_CHARS = 5000
+
+# PooledGoogleTranslator.translate follows GoogleTranslator.translate and its private
+# attributes (_url_params, _element_query, _alt_element_query) as of this release series
+DEEP_TRANSLATOR_SERIES = '1.11'
+try:
+    _installed = version('deep-translator')
+except PackageNotFoundError:
+    _installed = None
+if _installed and not _installed.startswith(DEEP_TRANSLATOR_SERIES + '.'):
+    warnings.warn(f"translation_client was written against deep-translator {DEEP_TRANSLATOR_SERIES}.x, "
+                  f"found {_installed}; check PooledGoogleTranslator.translate against GoogleTranslator's")
+
+
+def build_session(pool_size=TRANSLATE_POOL_SIZE):
+    """A requests.Session whose connection pool holds pool_size keep-alive connections per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class PooledGoogleTranslator(GoogleTranslator):
+    """
+    GoogleTranslator that sends its requests through a shared requests.Session.
+
+    deep_translator opens a new connection (and TLS handshake) for every call; here
+    all clients reuse the session's keep-alive pool. Request parameters are built per
+    call rather than stored on the client, so one client can be used from several
+    threads at once.
+    """
+
+    def __init__(self, source='auto', target='en', session=None, timeout=TRANSLATE_TIMEOUT_SECONDS, **kwargs):
+        super().__init__(source=source, target=target, **kwargs)
+        self.session = session or build_session()
+        self.timeout = timeout
+
+    def translate(self, text, **kwargs):
+        # Raises NotValidPayload / NotValidLength like GoogleTranslator
+        is_input_valid(text, max_chars=TRANSLATE_MAX_CHARS)
+        text = text.strip()
+        if self._same_source_target() or not text:
+            return text
+        params = dict(self._url_params, tl=self._target, sl=self._source)
+        translated = self._request(text, params)
+        if translated == text and 'hl' in params:
+            # Like GoogleTranslator: an echoed (untranslated) result is retried once without
+            # the interface language
+            translated = self._request(text, {key: value for key, value in params.items() if key != 'hl'})
+        return translated
+
+    def _request(self, text, params):
+        params = dict(params)
+        params[self.payload_key] = text
+        response = self.session.get(self._base_url, params=params, proxies=self.proxies, timeout=self.timeout)
+        try:
+            if response.status_code == 429:
+                raise TooManyRequests()
+            if request_failed(status_code=response.status_code):
+                raise RequestError()
+            soup = BeautifulSoup(response.text, 'html.parser')
+        finally:
+            response.close()
+        element = (soup.find(self._element_tag, self._element_query)
+                   or soup.find(self._element_tag, self._alt_element_query))
+        if not element:
+            raise TranslationNotFound(text)
+        return element.get_text(strip=True)
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Name fragments identifying a voice for each supported language. 'default' is the
+# Indian English voice used for English and whenever a language has no voice.
+VOICE_TERMS = {
+    "default": ["indian", "hindi", "india"],
+    "hi": ["hindi", "indian", "india"],
+    "es": ["spanish", "espanol", "español"],
+    "fr": ["french", "français", "francais"],
+    "de": ["german", "deutsch"],
+    "it": ["italian", "italiano"],
+    "ja": ["japanese"],
+    "ko": ["korean"],
+    "zh-CN": ["chinese", "mandarin"],
+    "ru": ["russian"],
+    "ar": ["arabic"]
+}
+
+
+def _voice_language_codes(voice):
+    """Normalized language codes a voice declares, e.g. {'es', 'es-es'}."""
+    codes = set()
+    for language in getattr(voice, "languages", None) or []:
+        if isinstance(language, bytes):
+            # espeak reports entries like b'\x05en-us' (priority byte + code)
+            language = language[1:].decode("ascii", "ignore")
+        code = str(language).lower().replace("_", "-")
+        codes.add(code)
+        codes.add(code.split("-")[0])
+    return codes
+
+
+def build_voice_index(voices):
+    """Map each language in VOICE_TERMS to the id of the first matching voice."""
+    index = {}
+    for language, terms in VOICE_TERMS.items():
+        code = language.lower()
+        for voice in voices:
+            name = (voice.name or "").lower()
+            if any(term in name for term in terms) or (language != "default" and code in _voice_language_codes(voice)):
+                index[language] = voice.id
+                break
+    return index
+
+
+def render_to_bytes(engine, text, voice_id, rate):
+    """Render text with a pyttsx3 engine and return the audio file bytes."""
+    # pyttsx3 can only render to a file, so use a short-lived temp file and read it back
+    fd, path = tempfile.mkstemp(suffix=".wav", prefix="audiofy-tts-")
+    os.close(fd)
+    try:
+        if voice_id:
+            engine.setProperty("voice", voice_id)
+        engine.setProperty("rate", rate)
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Per-process state of a pool worker
+_worker_engine = None
+_worker_voice_index = {}
+
+
+def _init_worker():
+    global _worker_engine, _worker_voice_index
+    import pyttsx3
+    _worker_engine = pyttsx3.init()
+    _worker_engine.setProperty("volume", 0.9)
+    _worker_voice_index = build_voice_index(_worker_engine.getProperty("voices"))
+
+
+def _worker_get_voice_index():
+    return _worker_voice_index
+
+
+def _worker_render(text, language, rate):
+    voice_id = _worker_voice_index.get(language) or _worker_voice_index.get("default")
+    return render_to_bytes(_worker_engine, text, voice_id, rate)
+
+
+class TTSQueueFull(Exception):
+    """Raised when every TTS worker is busy and the waiting queue is full."""
+
+
+class TTSWorkerPool:
+    """
+    Pool of TTS worker processes, each owning its own pyttsx3 engine.
+
+    Requests go to idle workers; at most max_pending requests may wait for one,
+    beyond that render() raises TTSQueueFull after queue_timeout seconds.
+    """
+
+    def __init__(self, workers=2, max_pending=16, queue_timeout=5.0, render_timeout=120.0):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        # Spawned (not forked) so no locks or driver threads leak in from the parent
+        self._executor = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        # All workers see the same installed voices, so one index serves the whole pool
+        self.voice_index = self._executor.submit(_worker_get_voice_index).result(timeout=render_timeout)
+
+    def render(self, text, language="en", rate=150):
+        """Synthesize text on a worker process and return the audio bytes."""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise TTSQueueFull("All text-to-speech workers are busy")
+        try:
+            future = self._executor.submit(_worker_render, text, language, rate)
+            return future.result(timeout=self.render_timeout)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,172 @@
+"""
+Energy / zero-crossing voice activity detection on 16-bit mono PCM.
+
+Used by SpeechTranslator to drop silence and other non-speech stretches before audio
+is sent to the recognizer. Run it directly to tune thresholds on a recording:
+
+    python vad.py recording.wav [--padding-ms 300] [--energy-ratio 3] [--out trimmed.wav] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+import wave
+
+import numpy as np
+
+FRAME_MS = 30
+PADDING_MS = 300
+# A frame is speech when its RMS is energy_ratio x the noise floor (the 10th percentile
+# of frame RMS), and never below MIN_ENERGY (same scale as sr.Recognizer.energy_threshold)
+ENERGY_RATIO = 3.0
+MIN_ENERGY = 200.0
+NOISE_PERCENTILE = 10
+# Quieter frames still count if they cross zero this often (unvoiced consonants: s, f, sh)
+ZCR_THRESHOLD = 0.25
+MIN_SPEECH_MS = 90
+
+
+def _runs(mask):
+    """Start and end indexes (end exclusive) of the True runs in a boolean array."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _dilate(mask, radius):
+    """Mark every frame within radius frames of a True frame."""
+    if radius <= 0:
+        return mask
+    totals = np.concatenate(([0], np.cumsum(mask)))
+    index = np.arange(len(mask))
+    low = np.clip(index - radius, 0, len(mask))
+    high = np.clip(index + radius + 1, 0, len(mask))
+    return totals[high] - totals[low] > 0
+
+
+class VoiceActivityDetector:
+    """
+    Vectorized frame classifier: every FRAME_MS frame gets an RMS energy and a
+    zero-crossing rate in one NumPy pass. Speech runs shorter than min_speech_ms are
+    discarded as clicks, and the rest are widened by padding_ms on each side so word
+    onsets and tails aren't clipped.
+    """
+
+    def __init__(self, frame_ms=FRAME_MS, padding_ms=PADDING_MS, energy_ratio=ENERGY_RATIO,
+                 min_energy=MIN_ENERGY, zcr_threshold=ZCR_THRESHOLD, min_speech_ms=MIN_SPEECH_MS):
+        self.frame_ms = frame_ms
+        self.padding_ms = padding_ms
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.zcr_threshold = zcr_threshold
+        self.min_speech_ms = min_speech_ms
+
+    def frame_features(self, samples, frame_len):
+        """(rms, zcr) arrays for the whole frames of samples."""
+        count = len(samples) // frame_len
+        frames = samples[:count * frame_len].reshape(count, frame_len).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(1, frame_len - 1)
+        return rms, zcr
+
+    def speech_mask(self, samples, sample_rate):
+        """Boolean speech/non-speech decision per frame, after min-length and padding."""
+        frame_len = max(2, int(sample_rate * self.frame_ms / 1000))
+        rms, zcr = self.frame_features(samples, frame_len)
+        if not len(rms):
+            return np.zeros(0, dtype=bool), frame_len
+
+        threshold = max(self.min_energy, np.percentile(rms, NOISE_PERCENTILE) * self.energy_ratio)
+        speech = (rms >= threshold) | ((rms >= threshold / 2) & (zcr >= self.zcr_threshold))
+
+        min_frames = max(1, self.min_speech_ms // self.frame_ms)
+        starts, ends = _runs(speech)
+        short = ends - starts < min_frames
+        delta = np.zeros(len(speech) + 1, dtype=np.int32)
+        np.add.at(delta, starts[short], 1)
+        np.add.at(delta, ends[short], -1)
+        speech &= np.cumsum(delta[:-1]) == 0
+        return _dilate(speech, self.padding_ms // self.frame_ms), frame_len
+
+    def trim(self, pcm, sample_rate):
+        """
+        Drop non-speech from 16-bit mono PCM.
+        Returns (kept_pcm, result) where result has the kept regions in seconds and the
+        kept ratio, bytes saved and seconds spent.
+        """
+        started = time.perf_counter()
+        samples = np.frombuffer(pcm, dtype='<i2', count=len(pcm) // 2)
+        mask, frame_len = self.speech_mask(samples, sample_rate)
+
+        # A trailing partial frame follows the decision of the last whole frame
+        keep = np.repeat(mask, frame_len)
+        tail = len(samples) - len(keep)
+        if tail:
+            keep = np.concatenate((keep, np.full(tail, bool(mask[-1]) if len(mask) else False)))
+        kept = samples[keep].tobytes()
+
+        starts, ends = _runs(mask)
+        frame_seconds = frame_len / sample_rate
+        input_seconds = len(samples) / sample_rate
+        result = {
+            'regions': [(round(start * frame_seconds, 3), round(min(end * frame_seconds, input_seconds), 3))
+                        for start, end in zip(starts, ends)],
+            'input_seconds': round(input_seconds, 3),
+            'kept_seconds': round(len(kept) / 2 / sample_rate, 3),
+            'kept_ratio': round(len(kept) / len(pcm), 4) if pcm else 1.0,
+            'bytes_saved': len(pcm) - len(kept),
+            'vad_seconds': round(time.perf_counter() - started, 4)
+        }
+        return kept, result
+
+
+def read_pcm(path):
+    """16-bit mono PCM and sample rate of a file: 16-bit mono WAV directly, anything else via ffmpeg."""
+    try:
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() == 2 and wav.getnchannels() == 1:
+                return wav.readframes(wav.getnframes()), wav.getframerate()
+    except (wave.Error, EOFError):
+        pass
+    from audio_pipeline import decode_to_pcm, PCM_SAMPLE_RATE
+    with open(path, 'rb') as f:
+        return decode_to_pcm(f.read()), PCM_SAMPLE_RATE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('audio', help='recording to analyze')
+    parser.add_argument('--frame-ms', type=int, default=FRAME_MS)
+    parser.add_argument('--padding-ms', type=int, default=PADDING_MS)
+    parser.add_argument('--energy-ratio', type=float, default=ENERGY_RATIO)
+    parser.add_argument('--min-energy', type=float, default=MIN_ENERGY)
+    parser.add_argument('--zcr-threshold', type=float, default=ZCR_THRESHOLD)
+    parser.add_argument('--min-speech-ms', type=int, default=MIN_SPEECH_MS)
+    parser.add_argument('--out', help='write the kept audio to this WAV file')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    pcm, sample_rate = read_pcm(args.audio)
+    detector = VoiceActivityDetector(args.frame_ms, args.padding_ms, args.energy_ratio,
+                                     args.min_energy, args.zcr_threshold, args.min_speech_ms)
+    kept, result = detector.trim(pcm, sample_rate)
+
+    if args.out:
+        with wave.open(args.out, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(kept)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for start, end in result['regions']:
+            print(f"  speech {start:8.2f}s - {end:8.2f}s")
+        print(f"kept {result['kept_seconds']:.2f}s of {result['input_seconds']:.2f}s "
+              f"({result['kept_ratio']:.1%}), saved {result['bytes_saved']} bytes in {result['vad_seconds'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
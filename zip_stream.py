@@ -0,0 +1,64 @@
+import os
+import time
+import zipfile
+from concurrent.futures import Future
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkSink:
+    """Write-only file object that collects what ZipFile writes until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(members, chunk_size=CHUNK_SIZE):
+    """
+    Generate a ZIP archive chunk by chunk, for streaming to a client.
+
+    members is an iterable of (arcname, source, compress_type) tuples. source is a
+    file path (copied from disk in chunk_size pieces), bytes, or a Future resolving
+    to bytes (e.g. a document rendered on another thread). Bytes are yielded as soon
+    as each piece is written, so only one chunk of a file is in memory at a time.
+    """
+    sink = _ChunkSink()
+    # The sink can't seek, so ZipFile writes data descriptors after each member
+    with zipfile.ZipFile(sink, 'w') as zf:
+        for arcname, source, compress_type in members:
+            if isinstance(source, Future):
+                source = source.result()
+
+            info = zipfile.ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+            info.compress_type = compress_type
+            if isinstance(source, str):
+                info.file_size = os.path.getsize(source)
+                with open(source, 'rb') as src, zf.open(info, 'w') as dest:
+                    for chunk in iter(lambda: src.read(chunk_size), b''):
+                        dest.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            else:
+                info.file_size = len(source)
+                with zf.open(info, 'w') as dest:
+                    dest.write(source)
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data